@@ -0,0 +1,281 @@
+"""
+Benchmark the client against a local stand-in WordPress, without the
+network.
+
+Measures list_posts throughput, the cost of parsing posts, pagination
+strategies, how much the HTTP and term caches save and the peak memory of
+parsing a page whole or streamed, and prints the results as JSON for
+regression tracking. Run it from the repository root:
+
+    $ python -m benchmarks.bench_client --posts 2000 --latency 0.005
+    $ python -m benchmarks.bench_client --output results.json
+"""
+import argparse
+import json
+import platform
+import shutil
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from tests.server import WordPressServer, make_posts, make_terms
+from wordpress import WordPress
+from wordpress.columns import ColumnSet
+from wordpress.models import Post
+from wordpress.stats import RequestRecord
+from wordpress.stream import CHUNK_SIZE, ResultStream
+
+
+class Results(object):
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, name, value, unit, **params):
+        self.results.append(dict(params, name=name, unit=unit,
+                                 value=round(value, 3)))
+
+
+def timed(func):
+    """The result of func and the seconds it took."""
+    start = time.perf_counter()
+    result = func()
+
+    return result, time.perf_counter() - start
+
+
+def requests_made(server, func):
+    """The result of func, the seconds it took and the requests it made."""
+    before = sum(server.hits.values())
+    result, seconds = timed(func)
+
+    return result, seconds, sum(server.hits.values()) - before
+
+
+def client(server, **kwargs):
+    return WordPress(server.url, api_url=server.api_url, pool_maxsize=16,
+                     **kwargs)
+
+
+def bench_parse(server, results, repeat):
+    """Cost of turning a page of JSON posts into models or columns."""
+    wp = client(server)
+    page = server.posts[:100]
+
+    # Resolve the terms once so only parsing is timed.
+    Post.parse_list(wp, page)
+    lazy = client(server, lazy=True)
+    lazy.term_cache = wp.term_cache
+
+    def per_post(func):
+        seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+        return seconds / len(page) * 1e6
+
+    results.add('parse.eager', per_post(lambda: Post.parse_list(wp, page)),
+                'us/post')
+    results.add('parse.lazy', per_post(
+        lambda: [post.id for post in Post.parse_list(lazy, page)]),
+        'us/post')
+
+    def read_all():
+        return [(post.date, post.modified, post.categories, post.tags,
+                 post.status) for post in Post.parse_list(lazy, page)]
+
+    results.add('parse.lazy_read_all', per_post(read_all), 'us/post')
+    results.add('parse.columnar',
+                per_post(lambda: ColumnSet.from_json(page)), 'us/post')
+
+
+def bench_list_posts(server, results, per_page):
+    """Posts per second listed one page after the other."""
+    wp = client(server)
+    wp.fetch_all('categories')
+    wp.fetch_all('tags')
+
+    posts, seconds, count = requests_made(
+        server, lambda: list(wp.iter_posts(pre_page=per_page)))
+
+    results.add('list_posts.throughput', len(posts) / seconds, 'posts/s',
+                per_page=per_page, requests=count)
+
+
+def bench_pagination(server, results, per_page):
+    """Wall time of fetching every post, per pagination strategy."""
+    strategies = [
+        ('iter_posts', {}, lambda wp: list(wp.iter_posts(pre_page=per_page))),
+    ]
+
+    for workers in [1, 4, 8]:
+        strategies.append((
+            'fetch_all', {'workers': workers},
+            lambda wp, workers=workers: wp.fetch_all(
+                'posts', workers=workers, pre_page=per_page)))
+
+    strategies.append((
+        'fetch_all_columnar', {'workers': 8},
+        lambda wp: wp.fetch_all('posts', workers=8, pre_page=per_page,
+                                columnar=True)))
+
+    for name, params, func in strategies:
+        wp = client(server)
+        _, seconds, count = requests_made(server, lambda: func(wp))
+
+        results.add('pagination.' + name, seconds * 1e3, 'ms',
+                    per_page=per_page, requests=count, **params)
+
+
+def bench_caches(server, results, per_page):
+    """What the HTTP cache and the term cache save on a second listing."""
+    directory = tempfile.mkdtemp()
+
+    try:
+        wp = client(server, http_cache=directory)
+
+        def fetch():
+            return list(wp.iter_posts(pre_page=per_page))
+
+        _, cold, cold_count = requests_made(server, fetch)
+        not_modified = server.not_modified
+        _, warm, warm_count = requests_made(server, fetch)
+        revalidated = server.not_modified - not_modified
+
+        results.add('http_cache.cold', cold * 1e3, 'ms', requests=cold_count)
+        results.add('http_cache.warm', warm * 1e3, 'ms', requests=warm_count)
+        results.add('http_cache.revalidated', revalidated / warm_count,
+                    'ratio')
+    finally:
+        shutil.rmtree(directory)
+
+    def term_requests():
+        return sum(server.hits[route] for route in
+                   ['categories', 'tags', 'statuses'])
+
+    wp = client(server)
+    before = term_requests()
+    list(wp.iter_posts(pre_page=per_page))
+    first = term_requests() - before
+    list(wp.iter_posts(pre_page=per_page))
+    second = term_requests() - before - first
+
+    results.add('term_cache.first_listing', first, 'requests')
+    results.add('term_cache.second_listing', second, 'requests')
+
+
+class StreamedBody(object):
+    """
+    A response whose JSON body is encoded a chunk at a time, as it would
+    come off the connection.
+    """
+
+    headers = {}
+    encoding = 'utf-8'
+
+    def __init__(self, items):
+        self.items = items
+
+    def iter_content(self, chunk_size):
+        chunk = []
+        size = 0
+
+        for piece in json.JSONEncoder().iterencode(self.items):
+            chunk.append(piece)
+            size += len(piece)
+
+            if size >= chunk_size:
+                yield ''.join(chunk).encode('utf-8')
+                chunk = []
+                size = 0
+
+        yield ''.join(chunk).encode('utf-8')
+
+    def close(self):
+        pass
+
+
+def peak_memory(func):
+    """The most memory, in bytes, allocated at once while func ran."""
+    tracemalloc.start()
+
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_stream(server, results, per_page, content_size=20000):
+    """
+    Peak memory of parsing a page of content-heavy posts, from the whole
+    body or streamed. Only the client side is measured: the body is made
+    in the benchmark rather than downloaded.
+    """
+    wp = client(server)
+    content = {'rendered': '<p>' + 'x' * content_size + '</p>'}
+    page = [dict(post, content=content) for post in server.posts[:per_page]]
+
+    # Resolve the terms once so only decoding and parsing are measured.
+    Post.parse_list(wp, page)
+
+    def whole():
+        body = json.dumps(page).encode('utf-8')
+        return Post.parse_list(wp, json.loads(body.decode('utf-8')))
+
+    def streamed():
+        for post in ResultStream(wp, StreamedBody(page), Post,
+                                 RequestRecord('GET', 'posts')):
+            post.content
+
+    for name, func in [('whole', whole), ('streamed', streamed)]:
+        results.add('memory.' + name, peak_memory(func) / 1024, 'KiB',
+                    per_page=per_page, content_size=content_size,
+                    chunk_size=CHUNK_SIZE)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--posts', type=int, default=1000,
+                        help='synthetic posts to serve')
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--tags', type=int, default=50)
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0,
+                        help='seconds the server waits before answering')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write the results to this file')
+    args = parser.parse_args(argv)
+
+    server = WordPressServer(
+        posts=make_posts(args.posts, categories=args.categories,
+                         tags=args.tags),
+        categories=make_terms('categories', args.categories),
+        tags=make_terms('tags', args.tags),
+        latency=args.latency)
+    results = Results()
+
+    with server:
+        bench_parse(server, results, args.repeat)
+        bench_list_posts(server, results, args.per_page)
+        bench_pagination(server, results, args.per_page)
+        bench_caches(server, results, args.per_page)
+        bench_stream(server, results, args.per_page)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': vars(args),
+        'results': results.results,
+    }
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as fobj:
+            fobj.write(output + '\n')
+    else:
+        print(output)
+
+    return report
+
+
+if __name__ == '__main__':
+    main()
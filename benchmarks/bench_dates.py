@@ -0,0 +1,64 @@
+"""
+Compare ISO 8601 date parsing against the old strptime path.
+
+    $ python benchmarks/bench_dates.py
+"""
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from wordpress import utils
+from wordpress.utils import (_parse_iso8601, parse_iso8601,
+                             parse_iso8601_columns)
+
+
+def strptime(string):
+    return datetime.strptime(string, '%Y-%m-%dT%H:%M:%S')
+
+
+def dates(count, distinct):
+    start = datetime(2016, 1, 1)
+    return [(start + timedelta(minutes=i % distinct)).isoformat()
+            for i in range(count)]
+
+
+def bench(func, values, number=5):
+    def run():
+        for value in values:
+            func(value)
+
+    return min(timeit.repeat(run, number=number, repeat=3)) / number
+
+
+def main():
+    results = []
+
+    for distinct in [10000, 100]:
+        values = dates(10000, distinct)
+        page = [dict((k, v) for k in ['date', 'date_gmt', 'modified',
+                                      'modified_gmt']) for v in values]
+
+        timings = {
+            'strptime': bench(strptime, values),
+            'parse_iso8601': bench(parse_iso8601, values),
+            'parse_iso8601_uncached': bench(_parse_iso8601, values),
+            'parse_iso8601_columns': min(timeit.repeat(
+                lambda: parse_iso8601_columns(page), number=5,
+                repeat=3)) / 5 / 4,
+        }
+
+        for name, seconds in sorted(timings.items()):
+            results.append({
+                'name': name,
+                'distinct': distinct,
+                'count': len(values),
+                'ns_per_date': round(seconds / len(values) * 1e9, 1),
+            })
+
+        utils._iso8601_cache.clear()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
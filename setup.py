@@ -10,7 +10,12 @@ requirements = [
     'requests'
 ]
 
-test_requirements = []
+extras_requirements = {
+    'async': ['aiohttp'],
+    'columns': ['numpy'],
+}
+
+test_requirements = ['aiohttp']
 
 setup(
     name='python-wp',
@@ -31,6 +36,7 @@ setup(
     ],
     license='MIT license',
     install_requires=requirements,
+    extras_require=extras_requirements,
     zip_safe=False,
     test_suite='tests',
     tests_require=test_requirements
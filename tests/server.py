@@ -0,0 +1,318 @@
+"""
+A stand-in WordPress REST API on localhost.
+
+It serves the fixtures, or synthetic posts, categories and tags, with the
+pagination headers, ETags and filters the client relies on, so tests and
+benchmarks can run without the network.
+"""
+import copy
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os.path import abspath, dirname, join, realpath
+from urllib.parse import parse_qs, urlsplit
+
+fixture_dir = abspath(join(dirname(realpath(__file__)), 'fixtures'))
+
+STATUSES = {
+    'publish': {'name': 'Published', 'slug': 'publish', 'public': True,
+                'queryable': True, 'date_floating': False},
+    'draft': {'name': 'Draft', 'slug': 'draft', 'public': False,
+              'queryable': False, 'date_floating': True},
+}
+
+
+def fixture(name):
+    with open(join(fixture_dir, name), 'r') as fobj:
+        return json.loads(fobj.read())
+
+
+def make_terms(kind, count):
+    """
+    Synthetic categories or tags, with ids from 1 to count.
+    """
+    taxonomy = 'category' if kind == 'categories' else 'post_tag'
+    template = fixture('category-1.json' if kind == 'categories'
+                       else 'tag-3.json')
+    terms = []
+
+    for pk in range(1, count + 1):
+        term = copy.deepcopy(template)
+        term.update({'id': pk, 'name': '{0} {1}'.format(kind, pk),
+                     'slug': '{0}-{1}'.format(kind, pk),
+                     'taxonomy': taxonomy, 'count': 0})
+        terms.append(term)
+
+    return terms
+
+
+def make_posts(count, categories=20, tags=50, authors=10, seed=0):
+    """
+    Synthetic posts shaped like the fixtures, newest first, each in one to
+    three of the first `categories` categories with up to five of the first
+    `tags` tags.
+    """
+    rng = random.Random(seed)
+    template = fixture('post-448.json')
+    start = datetime(2016, 1, 1)
+    posts = []
+
+    for pk in range(count, 0, -1):
+        when = (start + timedelta(hours=pk)).isoformat()
+        post = copy.deepcopy(template)
+        post.update({
+            'id': pk, 'author': rng.randint(1, authors), 'status': 'publish',
+            'date': when, 'date_gmt': when,
+            'modified': when, 'modified_gmt': when,
+            'slug': 'post-{0}'.format(pk),
+            'link': 'http://example.org/post-{0}/'.format(pk),
+            'title': {'rendered': 'Post {0}'.format(pk)},
+            'categories': sorted(rng.sample(
+                range(1, categories + 1), rng.randint(1, min(3, categories)))),
+            'tags': sorted(rng.sample(range(1, tags + 1),
+                                      rng.randint(0, min(5, tags)))),
+        })
+        posts.append(post)
+
+    return posts
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # Many clients connecting at once shouldn't be dropped.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def _ints(value):
+    return [int(i) for i in value.split(',') if i]
+
+
+class WordPressServer(object):
+    """
+    A stand-in WordPress REST API, see the module docstring.
+
+    Arguments
+    ---------
+
+    posts : list
+        Post objects. Defaults to the fixtures.
+    categories : list
+        Category objects. Defaults to the fixtures.
+    tags : list
+        Tag objects. Defaults to the fixtures.
+    latency : float
+        Seconds every request waits before it is answered.
+
+    Attributes
+    ----------
+
+    hits : collections.Counter
+        Requests answered, by route (ex. `posts`, `posts/1`).
+    not_modified : int
+        Requests answered with 304 Not Modified.
+    """
+
+    def __init__(self, posts=None, categories=None, tags=None, latency=0):
+        self.posts = posts if posts is not None else fixture('posts.json')
+        self.categories = (categories if categories is not None
+                           else fixture('categories.json'))
+        self.tags = tags if tags is not None else fixture('tags.json')
+        self.latency = latency
+        self.hits = Counter()
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://{0}:{1}/'.format(*self._httpd.server_address[:2])
+
+    @property
+    def api_url(self):
+        return self.url + 'wp-json/'
+
+    def start(self):
+        self._httpd = _HTTPServer(('127.0.0.1', 0), _handler(self))
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        args=(0.01,), daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def hit(self, route):
+        with self._lock:
+            self.hits[route] += 1
+
+    def route(self, path, query):
+        """
+        The status, headers and JSON body for a GET request.
+        """
+        parts = path.strip('/').split('/')
+
+        if parts[:3] != ['wp-json', 'wp', 'v2'] or len(parts) < 4:
+            return 404, {}, {'code': 'rest_no_route'}
+
+        name = parts[3]
+        collections = {'posts': self.posts, 'categories': self.categories,
+                       'tags': self.tags}
+
+        if name == 'statuses':
+            if len(parts) == 5:
+                self.hit('statuses/' + parts[4])
+
+                if parts[4] not in STATUSES:
+                    return 404, {}, {'code': 'rest_status_invalid'}
+
+                return 200, {}, STATUSES[parts[4]]
+
+            self.hit('statuses')
+            return 200, {}, STATUSES
+
+        if name not in collections:
+            return 404, {}, {'code': 'rest_no_route'}
+
+        items = collections[name]
+
+        if len(parts) == 5:
+            self.hit(name + '/' + parts[4])
+
+            for item in items:
+                if str(item['id']) == parts[4]:
+                    return 200, {}, self._fields(item, query)
+
+            return 404, {}, {'code': 'rest_invalid_id'}
+
+        self.hit(name)
+
+        return self._list(items, query)
+
+    def _list(self, items, query):
+        if 'include' in query:
+            include = _ints(query['include'])
+            by_id = dict((item['id'], item) for item in items)
+            items = [by_id[pk] for pk in include if pk in by_id]
+
+        if 'exclude' in query:
+            exclude = set(_ints(query['exclude']))
+            items = [item for item in items if item['id'] not in exclude]
+
+        for key in ['categories', 'tags']:
+            if key in query:
+                wanted = set(_ints(query[key]))
+                items = [item for item in items
+                         if wanted.intersection(item.get(key, ()))]
+
+        if 'modified_after' in query:
+            after = query['modified_after']
+            items = [item for item in items
+                     if item.get('modified_gmt', '') > after]
+
+        orderby = query.get('orderby')
+
+        if orderby in ['id', 'date', 'modified']:
+            key = {'id': 'id', 'date': 'date_gmt',
+                   'modified': 'modified_gmt'}[orderby]
+            items = sorted(items, key=lambda item: (item.get(key),
+                                                    item['id']),
+                           reverse=query.get('order', 'desc') == 'desc')
+
+        page = int(query.get('page', 1))
+        per_page = int(query.get('per_page', 10))
+        pages = -(-len(items) // per_page)
+
+        if page > max(pages, 1):
+            return 400, {}, {'code': 'rest_post_invalid_page_number'}
+
+        start = (page - 1) * per_page
+        headers = {'X-WP-Total': str(len(items)),
+                   'X-WP-TotalPages': str(pages)}
+        body = [self._fields(item, query)
+                for item in items[start:start + per_page]]
+
+        return 200, headers, body
+
+    def _fields(self, item, query):
+        if '_fields' not in query:
+            return item
+
+        fields = query['_fields'].split(',')
+
+        return dict((k, v) for k, v in item.items() if k in fields)
+
+
+def _handler(server):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body are written separately, don't wait for ACKs.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def send(self, status, headers, body=b''):
+            self.send_response(status)
+
+            for key, value in headers.items():
+                self.send_header(key, value)
+
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def do_HEAD(self):
+            if server.latency:
+                time.sleep(server.latency)
+
+            server.hit('index')
+            self.send(200, {'Link': '<{0}>; rel="https://api.w.org/"'.format(
+                server.api_url)})
+
+        def do_GET(self):
+            if server.latency:
+                time.sleep(server.latency)
+
+            split = urlsplit(self.path)
+
+            if split.path == '/':
+                return self.do_HEAD()
+
+            query = dict((k, v[-1]) for k, v in parse_qs(split.query).items())
+            status, headers, data = server.route(split.path, query)
+            body = json.dumps(data).encode('utf-8')
+            headers['Content-Type'] = 'application/json; charset=UTF-8'
+
+            if status == 200:
+                etag = '"{0}"'.format(hashlib.md5(body).hexdigest())
+                headers['ETag'] = etag
+
+                if self.headers.get('If-None-Match') == etag:
+                    with server._lock:
+                        server.not_modified += 1
+
+                    return self.send(304, {'ETag': etag})
+
+            self.send(status, headers, body)
+
+    return Handler
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime
+from os.path import abspath, dirname, join, realpath
+
+from wordpress import AsyncWordPress
+from wordpress.exceptions import NotFound
+from wordpress.models import Post, ResultSet
+from wordpress.throttle import Throttle
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:  # pragma: no cover
+    web = None
+
+fixture_dir = abspath(join(dirname(realpath(__file__)), 'fixtures'))
+
+
+def fixture(name):
+    with open(join(fixture_dir, name), 'r') as fobj:
+        return json.loads(fobj.read())
+
+
+def paginate(request, items):
+    page = int(request.query.get('page', 1))
+    per_page = int(request.query.get('per_page', 10))
+    start = (page - 1) * per_page
+    pages = -(-len(items) // per_page)
+
+    if 'include' in request.query:
+        include = set(int(i) for i in request.query['include'].split(','))
+        items = [item for item in items if item['id'] in include]
+
+    headers = {'X-WP-Total': str(len(items)),
+               'X-WP-TotalPages': str(pages)}
+
+    return web.json_response(items[start:start + per_page], headers=headers)
+
+
+@unittest.skipIf(web is None, 'aiohttp is not installed')
+class TestAsyncWordPress(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.hits = []
+        self.queries = []
+        self.heads = 0
+        self.running = 0
+        self.peak = []
+        posts = fixture('posts.json')
+        categories = fixture('categories.json')
+
+        async def index(request):
+            self.heads += 1
+            await asyncio.sleep(0.005)
+            return web.Response(headers={
+                'Link': '<{0}>; rel="https://api.w.org/"'.format(
+                    self.server.make_url('/wp-json/'))
+            })
+
+        async def list_posts(request):
+            self.hits.append('posts')
+            self.queries.append(dict(request.query))
+            return paginate(request, posts)
+
+        async def get_post(request):
+            self.hits.append('post')
+            return web.json_response(fixture('post-448.json'))
+
+        async def list_categories(request):
+            self.hits.append('categories')
+            return paginate(request, categories)
+
+        async def get_tag(request):
+            self.running += 1
+            self.peak.append(self.running)
+            await asyncio.sleep(0.005)
+            self.running -= 1
+            return web.json_response({'id': 2})
+
+        async def not_found(request):
+            return web.json_response({}, status=404)
+
+        app = web.Application()
+        app.router.add_route('HEAD', '/', index)
+        app.router.add_get('/wp-json/wp/v2/posts', list_posts)
+        app.router.add_get('/wp-json/wp/v2/posts/{pk}', get_post)
+        app.router.add_get('/wp-json/wp/v2/categories', list_categories)
+        app.router.add_get('/wp-json/wp/v2/tags/2', get_tag)
+        app.router.add_get('/wp-json/wp/v2/tags/{pk}', not_found)
+
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.wp = AsyncWordPress(str(self.server.make_url('/')))
+
+    async def asyncTearDown(self):
+        await self.wp.close()
+        await self.server.close()
+
+    async def test_list_posts(self):
+        posts = await self.wp.list_posts()
+        self.assertEqual(type(posts), ResultSet)
+        self.assertEqual(posts.total, 10)
+        self.assertEqual(posts[0].categories[0].id, 1)
+        self.assertEqual(self.hits, ['posts', 'categories'])
+
+    async def test_list_posts_modified(self):
+        await self.wp.list_posts(modified_after=datetime(2016, 7, 1, 10),
+                                 modified_before=datetime(2016, 8, 1),
+                                 orderby='modified', order='asc')
+
+        query = self.queries[0]
+        self.assertEqual(query['modified_after'], '2016-07-01T10:00:00')
+        self.assertEqual(query['modified_before'], '2016-08-01T00:00:00')
+        self.assertEqual(query['orderby'], 'modified')
+
+        with self.assertRaises(ValueError):
+            await self.wp.list_posts(orderby='test')
+
+    async def test_get_post(self):
+        post = await self.wp.get_post(448)
+        self.assertIsInstance(post, Post)
+        self.assertIs(post.categories[0], await self.wp.get_category(1))
+
+    async def test_concurrent_discovery(self):
+        wp = AsyncWordPress(str(self.server.make_url('/')), coalesce=False)
+        self.addAsyncCleanup(wp.close)
+
+        tags = await asyncio.gather(*[wp.get_tag(2) for _ in range(20)])
+
+        self.assertTrue(all(tag.id == 2 for tag in tags))
+        self.assertEqual(self.heads, 1)
+
+    async def test_iter_posts(self):
+        ids = [post.id async for post in self.wp.iter_posts(pre_page=3)]
+        self.assertEqual(len(ids), 10)
+        self.assertEqual(self.hits.count('posts'), 4)
+
+    async def test_iter_posts_from_page(self):
+        ids = [post.id async for post in self.wp.iter_posts(page=3,
+                                                            pre_page=3)]
+        self.assertEqual(ids, [p['id'] for p in fixture('posts.json')][6:])
+        self.assertEqual(self.hits.count('posts'), 2)
+
+    async def test_fetch_all(self):
+        posts = await self.wp.fetch_all('posts', pre_page=3)
+        self.assertEqual(posts.ids(), [p['id'] for p in fixture('posts.json')])
+
+    async def test_error(self):
+        with self.assertRaises(NotFound):
+            await self.wp.get_tag(1)
+
+    async def test_throttle(self):
+        async with AsyncWordPress(str(self.server.make_url('/')),
+                                  term_cache_size=0, coalesce=False,
+                                  throttle=Throttle(max_in_flight=2)) as wp:
+            await asyncio.gather(*[wp.get_tag(2) for _ in range(8)])
+
+        self.assertEqual(len(self.peak), 8)
+        self.assertLessEqual(max(self.peak), 2)
+
+    async def test_coalesces_identical_requests(self):
+        tags = await asyncio.gather(*[self.wp.get_tag(2) for _ in range(8)])
+
+        self.assertEqual(len(self.peak), 1)
+        self.assertTrue(all(tag.id == 2 for tag in tags))
+
+    async def test_context_manager(self):
+        async with AsyncWordPress(str(self.server.make_url('/'))) as wp:
+            await wp.list_categories()
+
+        self.assertTrue(wp.session.closed)
@@ -0,0 +1,179 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from wordpress import WordPress
+from wordpress.exceptions import BatchError
+from wordpress.models import Post
+from wordpress.throttle import Throttle
+
+from .test_wordpress import FakeResponse, FakeSession
+
+
+class BatchSession(FakeSession):
+    """
+    A FakeSession with a batch endpoint that allows max_items requests.
+    """
+
+    def __init__(self, max_items=25, advertised=None, batch=True):
+        super(BatchSession, self).__init__()
+        self.max_items = max_items
+        self.advertised = advertised or max_items
+        self.batch = batch
+        self.batches = []
+
+    def respond(self, method, path, body):
+        if path.startswith('/wp/v2/posts/404'):
+            return 404, {'code': 'rest_post_invalid_id',
+                         'message': 'Invalid post ID.'}
+
+        if method == 'DELETE':
+            return 200, {'deleted': True}
+
+        pk = int(path.rsplit('/', 1)[-1]) if path[-1].isdigit() else 100
+        return 200, dict(body or {}, id=pk)
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        endpoint = url[len(self.api_url):]
+
+        if endpoint == 'batch/v1' and not self.batch:
+            return FakeResponse(404)
+
+        if endpoint == 'batch/v1' and method == 'OPTIONS':
+            return FakeResponse(data={'endpoints': [{'args': {'requests': {
+                'maxItems': self.advertised}}}]})
+
+        if endpoint == 'batch/v1':
+            requests = kwargs['json']['requests']
+
+            if len(requests) > self.max_items:
+                return FakeResponse(400, data={
+                    'code': 'rest_invalid_param',
+                    'data': {'params': {'requests': 'Too many.'}}})
+
+            self.batches.append(len(requests))
+            responses = []
+
+            for request in requests:
+                status, body = self.respond(request['method'],
+                                            request['path'],
+                                            request.get('body'))
+                responses.append({'status': status, 'body': body})
+
+            return FakeResponse(207, data={'responses': responses})
+
+        status, body = self.respond(method, '/' + endpoint,
+                                    kwargs.get('json'))
+        return FakeResponse(status, data=body)
+
+
+class TestBatch(unittest.TestCase):
+
+    def client(self, hooks=None, throttle=None, **kwargs):
+        self.session = BatchSession(**kwargs)
+        return WordPress('http://example.org/', session=self.session,
+                         api_url=FakeSession.api_url, hooks=hooks,
+                         throttle=throttle)
+
+    def test_results_map_to_operations(self):
+        wp = self.client()
+
+        with wp.batch() as batch:
+            created = batch.create_post(title='Hello',
+                                        date=datetime(2016, 7, 1))
+            updated = batch.update_post(2, title='Updated')
+            deleted = batch.delete_post(3, force=True)
+            missing = batch.update_post(404, title='Gone')
+
+        self.assertEqual(self.session.batches, [4])
+        self.assertIsInstance(created.result, Post)
+        self.assertEqual(created.result.date, datetime(2016, 7, 1))
+        self.assertEqual(updated.result.id, 2)
+        self.assertIs(deleted.result, True)
+        self.assertEqual(deleted.path, '/wp/v2/posts/3?force=true')
+
+        self.assertEqual(missing.status, 404)
+        with self.assertRaises(BatchError) as context:
+            missing.result
+        self.assertEqual(str(context.exception), 'Invalid post ID.')
+
+    def test_packs_up_to_the_server_limit(self):
+        wp = self.client(max_items=3)
+
+        with wp.batch() as batch:
+            for pk in range(1, 8):
+                batch.delete_post(pk)
+
+        self.assertEqual(self.session.batches, [3, 3, 1])
+        self.assertEqual(wp.batch_max_size, 3)
+
+    def test_splits_oversized_batches(self):
+        wp = self.client(max_items=2, advertised=4)
+
+        with wp.batch() as batch:
+            for pk in range(1, 9):
+                batch.delete_post(pk)
+
+        self.assertEqual(self.session.batches, [2, 2, 2, 2])
+        self.assertTrue(all(op.result for op in batch.operations))
+        self.assertEqual(wp.batch_max_size, 2)
+
+    def test_without_batch_endpoint(self):
+        wp = self.client(batch=False)
+
+        with wp.batch() as batch:
+            op = batch.update_post(2, title='Updated')
+
+        self.assertEqual(op.result.id, 2)
+        self.assertEqual(self.session.requests[-1][0], 'POST')
+
+    def test_not_sent_on_error(self):
+        wp = self.client()
+
+        with self.assertRaises(RuntimeError):
+            with wp.batch() as batch:
+                op = batch.delete_post(1)
+                raise RuntimeError()
+
+        self.assertFalse(op.done)
+        self.assertEqual(self.session.batches, [])
+
+    def test_checks_arguments(self):
+        batch = self.client().batch()
+
+        with self.assertRaises(TypeError):
+            batch.create_post(titel='Typo')
+
+        with self.assertRaises(ValueError):
+            batch.add('GET', 'posts')
+
+    def test_sent_through_the_client(self):
+        records = []
+        throttle = Throttle(rate=1000, burst=10)
+        throttle.acquire = mock.Mock(wraps=throttle.acquire)
+        wp = self.client(hooks=[records.append], throttle=throttle,
+                         batch=False)
+
+        with wp.batch() as batch:
+            batch.update_post(2, title='Updated')
+            missing = batch.delete_post(404)
+
+        self.assertEqual([(r.method, r.route) for r in records],
+                         [('OPTIONS', 'batch/v1'),
+                          ('POST', 'wp/v2/posts/{id}'),
+                          ('DELETE', 'wp/v2/posts/{id}')])
+        self.assertEqual(throttle.acquire.call_count, 3)
+        self.assertEqual(missing.status, 404)
+
+    def test_batch_post_is_not_retried(self):
+        wp = self.client()
+        wp.batch_max_size = 25
+        self.session.request = lambda method, url, **kwargs: (
+            self.session.requests.append(method) or FakeResponse(502))
+
+        with wp.batch() as batch:
+            op = batch.delete_post(1)
+
+        self.assertEqual(self.session.requests, ['POST'])
+        self.assertEqual(op.error.status, 502)
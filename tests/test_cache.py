@@ -0,0 +1,79 @@
+import unittest
+
+from wordpress.cache import LRUCache, TermCache
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = LRUCache(maxsize=2, ttl=10, clock=self.clock)
+
+    def test_get_set(self):
+        self.cache.set('a', 1)
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.info(), (1, 1, 2, 1))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+
+    def test_ttl(self):
+        self.cache.set('a', 1)
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_setdefault(self):
+        self.assertEqual(self.cache.setdefault('a', 1), 1)
+        self.assertEqual(self.cache.setdefault('a', 2), 1)
+
+        self.clock.now = 10
+        self.assertEqual(self.cache.setdefault('a', 3), 3)
+        self.assertEqual(self.cache.get('a'), 3)
+
+    def test_disabled(self):
+        cache = LRUCache(maxsize=0)
+        cache.set('a', 1)
+        self.assertEqual(len(cache), 0)
+
+
+class TestTermCache(unittest.TestCase):
+
+    def test_per_type_ttl(self):
+        cache = TermCache(ttl={'category': 5})
+        self.assertEqual(cache.caches['category'].ttl, 5)
+        self.assertIsNone(cache.caches['tag'].ttl)
+
+    def test_get_many(self):
+        cache = TermCache()
+        term = object()
+        cache.set('tag', 1, term)
+        found, missing = cache.get_many('tag', [1, 2])
+        self.assertIs(found[1], term)
+        self.assertEqual(missing, [2])
+
+    def test_invalidate(self):
+        cache = TermCache()
+        cache.set('tag', 1, object())
+        cache.set('category', 1, object())
+        cache.invalidate('tag', 1)
+        self.assertIsNone(cache.get('tag', 1))
+        self.assertIsNotNone(cache.get('category', 1))
+        cache.invalidate()
+        self.assertIsNone(cache.get('category', 1))
+        self.assertEqual(cache.stats()['category'].currsize, 0)
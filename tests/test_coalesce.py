@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from wordpress import WordPress
+from wordpress.coalesce import AsyncSingleFlight, SingleFlight, request_key
+
+from .test_wordpress import FakeResponse, FakeSession
+
+
+def together(count, func):
+    """Call func from count threads at once."""
+    barrier = threading.Barrier(count)
+
+    def run(_):
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(count) as pool:
+        return list(pool.map(run, range(count)))
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.calls = []
+
+    def slow(self, result=None, error=None):
+        def func():
+            self.calls.append(1)
+            time.sleep(0.05)
+
+            if error is not None:
+                raise error
+
+            return result if result is not None else object()
+
+        return func
+
+    def test_runs_once(self):
+        results = together(8, lambda: self.flight.do('key', self.slow()))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(len(self.flight), 0)
+
+    def test_shares_errors(self):
+        error = ValueError()
+
+        def call():
+            try:
+                self.flight.do('key', self.slow(error=error))
+            except ValueError as e:
+                return e
+
+        self.assertEqual(together(4, call), [error] * 4)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_keys(self):
+        together(4, lambda: self.flight.do(None, self.slow()))
+        self.assertEqual(len(self.calls), 4)
+
+        self.flight.do('key', self.slow())
+        self.flight.do('key', self.slow())
+        self.assertEqual(len(self.calls), 6)
+
+    def test_request_key(self):
+        self.assertEqual(request_key('tags', {'b': 1, 'a': 'x'}),
+                         request_key('tags', {'a': 'x', 'b': 1}))
+        self.assertIsNone(request_key('tags', {'a': []}))
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_runs_once(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return object()
+
+        results = await asyncio.gather(*[flight.do('key', func)
+                                         for _ in range(5)])
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(len(flight), 0)
+
+    async def test_cancelled_waiter(self):
+        flight = AsyncSingleFlight()
+
+        async def func():
+            await asyncio.sleep(0.01)
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('key', func))
+        second = asyncio.ensure_future(flight.do('key', func))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, 'done')
+
+    async def test_not_shared_once_finished(self):
+        flight = AsyncSingleFlight()
+        finishing = asyncio.Event()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            finishing.set()
+            return len(calls)
+
+        async def later():
+            # Wakes up as the first call returns, before its task's
+            # callbacks run.
+            await finishing.wait()
+            return await flight.do('key', func)
+
+        task = asyncio.ensure_future(later())
+
+        self.assertEqual(await flight.do('key', func), 1)
+        self.assertEqual(await task, 2)
+
+
+class TestCoalescedClient(unittest.TestCase):
+
+    def client(self, **kwargs):
+        def respond(params):
+            time.sleep(0.05)
+            return FakeResponse(data={'id': 5, 'name': 'News'})
+
+        self.session = FakeSession({('GET', 'wp/v2/categories/5'): respond})
+        return WordPress('http://example.org/', session=self.session,
+                         api_url=FakeSession.api_url, **kwargs)
+
+    def test_thundering_herd(self):
+        wp = self.client()
+
+        categories = together(16, lambda: wp.get_category(5))
+
+        self.assertEqual(len(self.session.requests), 1)
+        self.assertTrue(all(category.name == 'News'
+                            for category in categories))
+
+    def test_disabled(self):
+        wp = self.client(coalesce=False, term_cache_size=0)
+
+        together(4, lambda: wp.get_category(5))
+
+        self.assertEqual(len(self.session.requests), 4)
@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime
+
+from wordpress import columns
+from wordpress.columns import ColumnSet
+from wordpress.models import Post, ResultSet
+
+
+def make_posts():
+    return [
+        {'id': 1, 'author': 2, 'date': '2016-07-01T10:00:00',
+         'modified': '2016-07-02T10:00:00', 'status': 'publish',
+         'type': 'post', 'categories': [1, 2], 'tags': []},
+        {'id': 2, 'author': 3, 'date': '2016-07-03T10:00:00',
+         'modified': None, 'status': 'draft', 'type': 'post',
+         'categories': [2], 'tags': [7]},
+        {'id': 3, 'author': 2, 'date': '2016-07-02T10:00:00',
+         'modified': '2016-07-04T10:00:00', 'status': 'publish',
+         'type': 'post', 'categories': [], 'tags': [7, 8]},
+    ]
+
+
+class TestColumnSet(unittest.TestCase):
+
+    def setUp(self):
+        self.columns = ColumnSet.from_json(make_posts())
+
+    def test_from_json(self):
+        self.assertEqual(len(self.columns), 3)
+        self.assertEqual(self.columns.ids(), [1, 2, 3])
+        self.assertEqual(self.columns.values('status'),
+                         ['publish', 'draft', 'publish'])
+        self.assertEqual(self.columns.values('tags'), [[], [7], [7, 8]])
+        self.assertEqual(self.columns.values('modified')[:2],
+                         [datetime(2016, 7, 2, 10), None])
+
+    def test_where(self):
+        self.assertEqual(self.columns.where(author=2).ids(), [1, 3])
+        self.assertEqual(self.columns.where(status='draft').ids(), [2])
+        self.assertEqual(self.columns.where(categories=2).ids(), [1, 2])
+        self.assertEqual(self.columns.where(tags=[8, 9]).ids(), [3])
+        self.assertEqual(self.columns.where(author=2, tags=7).ids(), [3])
+        self.assertEqual(self.columns.where(status='future').ids(), [])
+
+    def test_where_dates(self):
+        after = datetime(2016, 7, 1, 12)
+        self.assertEqual(self.columns.where(after=after).ids(), [2, 3])
+        self.assertEqual(
+            self.columns.where(date_field='modified', before=after).ids(),
+            [])
+
+    def test_where_keeps_terms(self):
+        self.assertEqual(self.columns.where(author=2).values('categories'),
+                         [[1, 2], []])
+
+    def test_sort(self):
+        self.assertEqual(self.columns.sort('date').ids(), [1, 3, 2])
+        self.assertEqual(self.columns.sort('author', reverse=True).ids(),
+                         [2, 1, 3])
+        self.assertEqual(self.columns.sort('status').ids(), [2, 1, 3])
+
+        with self.assertRaises(ValueError):
+            self.columns.sort('tags')
+
+    def test_count_by(self):
+        self.assertEqual(self.columns.count_by('author'), {2: 2, 3: 1})
+        self.assertEqual(self.columns.count_by('status'),
+                         {'draft': 1, 'publish': 2})
+        self.assertEqual(self.columns.count_by('categories'), {1: 1, 2: 2})
+
+    def test_column(self):
+        self.assertIs(self.columns.column('id'), self.columns.data['id'])
+        offsets, ids = self.columns.column('tags')
+        self.assertEqual(list(ids[offsets[2]:offsets[3]]), [7, 8])
+
+    def test_concat(self):
+        more = ColumnSet.from_json([dict(make_posts()[0], id=4,
+                                         status='future')])
+        joined = ColumnSet.concat([self.columns, more])
+
+        self.assertEqual(joined.ids(), [1, 2, 3, 4])
+        self.assertEqual(joined.values('status')[-2:], ['publish', 'future'])
+        self.assertEqual(joined.values('categories')[-1], [1, 2])
+
+    def test_from_models(self):
+        posts = ResultSet(Post(fields=['id', 'author', 'date']) for _ in
+                          range(2))
+
+        for pk, post in enumerate(posts, 1):
+            post.id = pk
+            post.author = 2
+            post.date = datetime(2016, 7, pk)
+
+        columns = posts.to_columns()
+        self.assertEqual(columns.ids(), [1, 2])
+        self.assertEqual(columns.values('date')[1], datetime(2016, 7, 2))
+        self.assertEqual(columns.values('tags'), [[], []])
+
+
+@unittest.skipIf(columns.numpy is None, 'NumPy is not installed')
+class TestColumnSetNumPy(TestColumnSet):
+
+    def test_column(self):
+        super(TestColumnSetNumPy, self).test_column()
+        self.assertEqual(str(self.columns.column('date').dtype),
+                         'datetime64[us]')
+
+
+class TestColumnSetWithoutNumPy(TestColumnSet):
+
+    def setUp(self):
+        self.numpy = columns.numpy
+        columns.numpy = None
+        super(TestColumnSetWithoutNumPy, self).setUp()
+
+    def tearDown(self):
+        columns.numpy = self.numpy
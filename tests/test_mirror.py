@@ -0,0 +1,235 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+from wordpress import WordPress
+from wordpress.mirror import Mirror
+from wordpress.models import Category, Post
+from wordpress.sync import SyncState
+
+from .test_wordpress import FakeResponse, FakeSession, paginated
+
+
+def make_post(pk, author=1, day=1, categories=(), tags=(), status='publish',
+              title='Post'):
+    return {
+        'id': pk, 'author': author, 'status': status, 'slug': 'post-%d' % pk,
+        'date': '2016-07-%02dT10:00:00' % day,
+        'modified': '2016-07-%02dT10:00:00' % day,
+        'modified_gmt': '2016-07-%02dT10:00:00' % day,
+        'title': {'rendered': '%s %d' % (title, pk)},
+        'content': {'rendered': '<p>Hello</p>'},
+        'categories': list(categories), 'tags': list(tags),
+    }
+
+
+class TestMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.posts = [
+            make_post(1, author=1, day=1, categories=[1], tags=[5]),
+            make_post(2, author=2, day=3, categories=[1, 2]),
+            make_post(3, author=1, day=2, tags=[5, 6], title='Liveblog'),
+            make_post(4, author=2, day=4, status='draft'),
+        ]
+        self.session = FakeSession({
+            ('GET', 'wp/v2/posts'): paginated(self.posts),
+            ('GET', 'wp/v2/categories'): paginated([
+                {'id': 1, 'name': 'News', 'taxonomy': 'category'},
+                {'id': 2, 'name': 'Sports', 'taxonomy': 'category'},
+            ]),
+            ('GET', 'wp/v2/tags'): paginated([
+                {'id': 5, 'name': 'Toronto', 'taxonomy': 'post_tag'},
+            ]),
+            ('GET', 'wp/v2/statuses'): FakeResponse(data={
+                'publish': {'slug': 'publish', 'name': 'Published'},
+                'draft': {'slug': 'draft', 'name': 'Draft'},
+            }),
+        })
+        self.wp = WordPress('http://example.org/', session=self.session,
+                            api_url=FakeSession.api_url)
+        self.mirror = Mirror(self.wp)
+        self.mirror.load(status='publish,draft')
+        self.requests = len(self.session.requests)
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def ids(self, **filters):
+        return self.mirror.list_posts(**filters).ids()
+
+    def test_list_posts(self):
+        posts = self.mirror.list_posts()
+
+        self.assertEqual(posts.ids(), [2, 3, 1])
+        self.assertEqual(posts.total, 3)
+        self.assertIsInstance(posts[0], Post)
+        self.assertEqual(posts[0].categories[1].name, 'Sports')
+        self.assertEqual(posts[0].status.name, 'Published')
+        self.assertEqual(posts[0].date, datetime(2016, 7, 3, 10))
+        self.assertEqual(len(self.session.requests), self.requests)
+
+    def test_filters(self):
+        self.assertEqual(self.ids(author=1), [3, 1])
+        self.assertEqual(self.ids(author_exclude=1), [2])
+        self.assertEqual(self.ids(categories=1), [2, 1])
+        self.assertEqual(self.ids(categories_exclude=[2]), [3, 1])
+        self.assertEqual(self.ids(tags='5,6'), [3, 1])
+        self.assertEqual(self.ids(tags_exclude=6), [2, 1])
+        self.assertEqual(self.ids(after=datetime(2016, 7, 1, 12)), [2, 3])
+        self.assertEqual(self.ids(before=datetime(2016, 7, 3)), [3, 1])
+        self.assertEqual(self.ids(search='liveblog'), [3])
+        self.assertEqual(self.ids(status='draft'), [4])
+        self.assertEqual(self.ids(include=[1, 4]), [1])
+
+    def test_search_is_literal(self):
+        self.mirror.save_posts([make_post(5, title='Up 100%'),
+                                make_post(6, title='Up 1000'),
+                                make_post(7, title='snake_case'),
+                                make_post(8, title='snakeXcase'),
+                                make_post(9, title='C:\\temp')])
+
+        self.assertEqual(self.ids(search='100%'), [5])
+        self.assertEqual(self.ids(search='e_c'), [7])
+        self.assertEqual(self.ids(search='C:\\t'), [9])
+
+    def test_ordering_and_paging(self):
+        self.assertEqual(self.ids(order='asc'), [1, 3, 2])
+        self.assertEqual(self.ids(orderby='id'), [3, 2, 1])
+        self.assertEqual(self.ids(orderby='include', include=[3, 1, 2]),
+                         [3, 1, 2])
+
+        page = self.mirror.list_posts(page=2, pre_page=2)
+        self.assertEqual(page.ids(), [1])
+        self.assertEqual(page.total_pages, 2)
+
+        with self.assertRaises(ValueError):
+            self.mirror.list_posts(orderby='test')
+
+    def test_missing_terms_are_partial(self):
+        tag = self.mirror.get_post(3).tags[1]
+
+        self.assertEqual(tag.id, 6)
+        self.assertTrue(tag.is_partial)
+
+    def test_many_terms(self):
+        if hasattr(self.mirror.db, 'setlimit'):
+            # Like SQLite builds before 3.32.
+            self.mirror.db.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+
+        self.mirror.save_terms('post_tag', [{'id': pk, 'name': 'Tag'}
+                                            for pk in range(1, 2501)])
+        self.mirror.save_posts([make_post(10, tags=range(1, 2501))])
+
+        tags = self.mirror.get_post(10).tags
+        self.assertEqual(len(tags), 2500)
+        self.assertFalse(any(tag.is_partial for tag in tags))
+
+    def test_get_post(self):
+        self.assertEqual(self.mirror.get_post(2).title['rendered'], 'Post 2')
+        self.assertIsNone(self.mirror.get_post(99))
+
+    def test_terms(self):
+        self.assertIsInstance(self.mirror.get_category(1), Category)
+        self.assertEqual(self.mirror.list_tags().ids(), [5])
+        self.assertEqual(len(self.mirror.list_post_statuses()), 2)
+
+    def test_save_and_delete(self):
+        self.mirror.save_posts([make_post(1, categories=[2])])
+        self.assertEqual(self.ids(categories=1), [2])
+
+        self.mirror.delete_posts([2])
+        self.assertEqual(self.ids(), [3, 1])
+
+    def test_revisions(self):
+        self.mirror.save_revisions([{'id': 10, 'parent': 1},
+                                    {'id': 11, 'parent': 1}])
+        revisions = self.mirror.list_post_revisions(self.mirror.get_post(1))
+        self.assertEqual(revisions.ids(), [11, 10])
+
+    def test_load_is_recorded(self):
+        records = []
+        wp = WordPress('http://example.org/', session=self.session,
+                       api_url=FakeSession.api_url, hooks=[records.append])
+
+        with Mirror(wp) as mirror:
+            mirror.load()
+
+        self.assertEqual([r.endpoint for r in records],
+                         ['categories', 'tags', 'statuses', 'posts'])
+        self.assertTrue(all(r.status == 200 and r.decode_time > 0
+                            for r in records))
+
+    def test_sync(self):
+        posts = [make_post(1, day=1)]
+        session = FakeSession({
+            ('GET', 'wp/v2/posts'): paginated(posts),
+            ('GET', 'wp/v2/statuses'): FakeResponse(data={
+                'publish': {'slug': 'publish', 'name': 'Published'},
+            }),
+        })
+        wp = WordPress('http://example.org/', session=session,
+                       api_url=FakeSession.api_url, keep_raw=True)
+        mirror = Mirror(wp)
+        state = SyncState()
+
+        mirror.sync(state)
+        posts.append(make_post(2, day=2))
+        del posts[0]
+        changes = mirror.sync(state)
+
+        self.assertEqual(changes.created.ids(), [2])
+        self.assertEqual(changes.deleted, [1])
+        self.assertEqual(mirror.list_posts().ids(), [2])
+
+    def test_sync_fetches_missing_terms(self):
+        posts = [make_post(1, categories=[1], tags=[5, 6], status='draft')]
+        tags = []
+
+        def list_tags(params):
+            tags.append(params['include'])
+            return FakeResponse(data=[
+                {'id': int(pk), 'name': 'Tag %s' % pk}
+                for pk in params['include'].split(',')])
+
+        self.session.routes.update({
+            ('GET', 'wp/v2/posts'): paginated(posts),
+            ('GET', 'wp/v2/tags'): list_tags,
+        })
+        self.wp.keep_raw = True
+
+        self.mirror.sync(SyncState(), detect_deletions=False)
+
+        post = self.mirror.get_post(1)
+        self.assertEqual(post.tags[1].name, 'Tag 6')
+        self.assertFalse(post.tags[1].is_partial)
+        self.assertEqual(post.status.name, 'Draft')
+        # The terms fetched while the posts were parsed are reused.
+        self.assertEqual(tags, ['5,6'])
+
+    def test_cateogries_exclude(self):
+        self.assertEqual(self.ids(cateogries_exclude=[2]), [3, 1])
+
+
+class TestMirrorFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'mirror.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_persists(self):
+        with Mirror(None, self.path) as mirror:
+            mirror.save_posts([make_post(1)])
+
+        with Mirror(None, self.path) as mirror:
+            self.assertEqual(mirror.list_posts().ids(), [1])
+
+    def test_sync_needs_raw_json(self):
+        with self.assertRaises(ValueError):
+            Mirror(WordPress('http://example.org/')).sync(None)
@@ -1,15 +1,29 @@
 import json
+import pickle
 import unittest
 from datetime import datetime
 from os.path import abspath, dirname, join, realpath
+from unittest import mock
 
-from wordpress.models import Category, Post, ResultSet, Tag
+from wordpress.api import WordPress
+from wordpress.cache import TermCache
+from wordpress.exceptions import MissingFieldError
+from wordpress.models import (Category, Media, Post, PostStatus, ResultSet,
+                              Tag, User)
 
 fixture_dir = abspath(join(dirname(realpath(__file__)), 'fixtures'))
 
 
 class MockAPI(object):
 
+    lookup_categories = WordPress.lookup_categories
+    lookup_tags = WordPress.lookup_tags
+    lookup_post_statuses = WordPress.lookup_post_statuses
+    _lookup_terms = WordPress._lookup_terms
+
+    def __init__(self):
+        self.term_cache = TermCache()
+
     def list_posts(self, **kwargs):
         with open(join(fixture_dir, 'posts.json'), 'r') as fobj:
             return Post.parse_list(self, json.loads(fobj.read()))
@@ -35,6 +49,37 @@ class MockAPI(object):
             return Tag.parse(self, json.loads(fobj.read()))
 
 
+class CountingMockAPI(MockAPI):
+
+    def __init__(self):
+        super(CountingMockAPI, self).__init__()
+        self.calls = []
+
+    def list_categories(self, **kwargs):
+        self.calls.append('list_categories')
+        return super(CountingMockAPI, self).list_categories(**kwargs)
+
+    def get_category(self, pk, **kwargs):
+        self.calls.append('get_category')
+        return super(CountingMockAPI, self).get_category(pk, **kwargs)
+
+    def list_tags(self, **kwargs):
+        self.calls.append('list_tags')
+        return super(CountingMockAPI, self).list_tags(**kwargs)
+
+    def get_tag(self, pk, **kwargs):
+        self.calls.append('get_tag')
+        return super(CountingMockAPI, self).get_tag(pk, **kwargs)
+
+    def list_post_statuses(self, **kwargs):
+        self.calls.append('list_post_statuses')
+        return PostStatus.parse_list(self, [{'slug': 'publish'}])
+
+    def get_post_status(self, slug, **kwargs):
+        self.calls.append('get_post_status')
+        return PostStatus.parse(self, {'slug': slug})
+
+
 class TestPost(unittest.TestCase):
 
     def setUp(self):
@@ -51,6 +96,35 @@ class TestPost(unittest.TestCase):
     def test_eq(self):
         self.assertEqual(self.post, self.post)
 
+    def test_parse_list_batches_lookups(self):
+        api = CountingMockAPI()
+
+        with open(join(fixture_dir, 'posts.json'), 'r') as fobj:
+            json_list = json.loads(fobj.read())
+
+        for obj in json_list:
+            obj['status'] = 'publish'
+
+        posts = Post.parse_list(api, json_list)
+
+        self.assertEqual(sorted(api.calls), ['list_categories',
+                                             'list_post_statuses'])
+        self.assertIs(posts[0].categories[0], posts[-1].categories[0])
+        self.assertIs(posts[0].status, posts[-1].status)
+
+    def test_parse_list_uses_term_cache(self):
+        api = CountingMockAPI()
+        posts = api.list_posts()
+        again = api.list_posts()
+
+        self.assertEqual(api.calls, ['list_categories'])
+        self.assertIs(posts[0].categories[0], again[0].categories[0])
+
+    def test_parse_falls_back_to_single_lookups(self):
+        api = CountingMockAPI()
+        Post.parse(api, {'id': 1, 'categories': [1], 'status': 'draft'})
+        self.assertEqual(api.calls, ['get_category', 'get_post_status'])
+
 
 class TestCategory(unittest.TestCase):
 
@@ -84,3 +158,194 @@ class TestTag(unittest.TestCase):
 
     def test_eq(self):
         self.assertEqual(self.tag, self.tag)
+
+
+class TestPartialModels(unittest.TestCase):
+
+    def setUp(self):
+        self.api = MockAPI()
+
+    def test_missing_field(self):
+        post = Post.parse(self.api, {'id': 448, 'slug': 'a'},
+                          fields=['id', 'slug'])
+        self.assertTrue(post.is_partial)
+        self.assertEqual(post.slug, 'a')
+
+        with self.assertRaises(MissingFieldError):
+            post.content
+
+        self.assertFalse(hasattr(post, 'content'))
+
+    def test_nested_fields(self):
+        post = Post.parse(self.api, {'id': 448, 'title': {}},
+                          fields='id,title.rendered')
+        self.assertEqual(post._fields, frozenset(['id', 'title']))
+
+    def test_complete_model(self):
+        category = self.api.get_category(1)
+        self.assertFalse(category.is_partial)
+
+        with self.assertRaises(AttributeError):
+            category.missing
+
+    def test_fetch_missing_fields(self):
+        self.api.fetch_missing_fields = True
+        post = Post.parse(self.api, {'id': 448}, fields=['id'])
+        self.assertEqual(type(post.date), datetime)
+        self.assertFalse(post.is_partial)
+
+    def test_fetch_without_key(self):
+        self.api.fetch_missing_fields = True
+        post = Post.parse(self.api, {'slug': 'a'}, fields=['slug'])
+
+        with self.assertRaises(MissingFieldError):
+            post.content
+
+        with self.assertRaises(MissingFieldError):
+            post == post
+
+        status = PostStatus.parse(self.api, {'name': 'Published'},
+                                  fields=['name'])
+
+        with self.assertRaises(MissingFieldError):
+            status.public
+
+    def test_parse_list(self):
+        tags = Tag.parse_list(self.api, [{'id': 1}, {'id': 2}],
+                              fields=['id'])
+        self.assertTrue(all(tag.is_partial for tag in tags))
+
+    def test_pickle(self):
+        post = Post.parse(self.api, {'id': 448}, fields=['id'])
+        clone = pickle.loads(pickle.dumps(post))
+        self.assertEqual(clone.id, 448)
+
+    def test_inspecting_does_not_fetch(self):
+        self.api.fetch_missing_fields = True
+        self.api.get_post = mock.Mock(side_effect=AssertionError('fetched'))
+        posts = ResultSet([Post.parse(self.api, {'id': pk, 'slug': 'a'},
+                                      fields=['id', 'slug'])
+                           for pk in [1, 2]])
+
+        self.assertEqual(repr(posts[0]), "Post(id=1, slug='a')")
+        self.assertEqual(pickle.loads(pickle.dumps(posts[0])).slug, 'a')
+        self.assertEqual(posts.to_columns().ids(), [1, 2])
+        self.assertTrue(posts[0].is_partial)
+
+
+class TestEmbed(unittest.TestCase):
+
+    def setUp(self):
+        self.api = CountingMockAPI()
+
+        with open(join(fixture_dir, 'post-448.json'), 'r') as fobj:
+            self.json = json.loads(fobj.read())
+
+        self.json['tags'] = [3]
+        self.json['featured_media'] = 9
+        self.json['_embedded'] = {
+            'author': [{'id': 135, 'name': 'Jane', 'slug': 'jane'}],
+            'wp:featuredmedia': [{'id': 9, 'source_url': 'http://a/b.png'}],
+            'wp:term': [
+                [{'id': 1, 'name': 'Uncategorized', 'taxonomy': 'category'}],
+                [{'id': 3, 'name': 'Tagged', 'taxonomy': 'post_tag'}],
+            ],
+        }
+
+    def test_parse(self):
+        post = Post.parse(self.api, self.json)
+
+        self.assertEqual(self.api.calls, [])
+        self.assertEqual(post.categories[0].name, 'Uncategorized')
+        self.assertEqual(type(post.tags[0]), Tag)
+        self.assertEqual(type(post.author), User)
+        self.assertEqual(post.author.name, 'Jane')
+        self.assertEqual(type(post.featured_media), Media)
+        self.assertFalse(hasattr(post, '_embedded'))
+
+    def test_embedded_terms_are_partial(self):
+        post = Post.parse(self.api, self.json)
+        self.assertTrue(post.categories[0].is_partial)
+
+    def test_parse_list(self):
+        Post.parse_list(self.api, [self.json])
+        self.assertEqual(self.api.calls, [])
+
+    def test_forbidden_embed(self):
+        self.json['_embedded']['author'] = [{'code': 'rest_user_invalid_id'}]
+        post = Post.parse(self.api, self.json)
+        self.assertEqual(post.author, 1)
+
+
+class TestSlots(unittest.TestCase):
+
+    def setUp(self):
+        self.api = MockAPI()
+        self.post = self.api.get_post(448)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.post, '__dict__'))
+        self.assertFalse(hasattr(self.api.get_category(1), '__dict__'))
+
+    def test_raw_json_is_opt_in(self):
+        self.assertIsNone(self.post._json)
+        self.api.keep_raw = True
+        self.assertEqual(self.api.get_post(448)._json['id'], 448)
+
+    def test_extra_fields(self):
+        tag = Tag.parse(self.api, {'id': 3, 'plugin_field': 'x'})
+        self.assertEqual(tag.plugin_field, 'x')
+        self.assertIn("plugin_field='x'", repr(tag))
+
+        with self.assertRaises(AttributeError):
+            tag.missing
+
+    def test_repr(self):
+        self.assertTrue(repr(self.post).startswith('Post(date=datetime'))
+
+    def test_pickle(self):
+        clone = pickle.loads(pickle.dumps(self.post))
+        self.assertEqual(clone, self.post)
+        self.assertEqual(clone.date, self.post.date)
+        self.assertEqual(clone._links, self.post._links)
+        self.assertEqual(clone.categories[0].id, 1)
+        self.assertIsNone(clone._api)
+
+
+class TestLazyModels(unittest.TestCase):
+
+    def setUp(self):
+        self.api = CountingMockAPI()
+        self.api.lazy = True
+
+        with open(join(fixture_dir, 'posts.json'), 'r') as fobj:
+            self.json_list = json.loads(fobj.read())
+
+    def test_parse_defers_conversion(self):
+        posts = Post.parse_list(self.api, self.json_list)
+
+        self.assertEqual(posts.ids(), [obj['id'] for obj in self.json_list])
+        self.assertEqual(self.api.calls, [])
+        self.assertEqual(type(posts[0].date), datetime)
+
+    def test_terms_resolve_once_per_page(self):
+        posts = Post.parse_list(self.api, self.json_list)
+        first = posts[0].categories[0]
+
+        self.assertIs(posts[-1].categories[0], first)
+        self.assertEqual(self.api.calls, ['list_categories'])
+
+    def test_repr_and_pickle(self):
+        post = Post.parse_list(self.api, self.json_list)[0]
+        self.assertTrue(repr(post).startswith('Post(date=datetime'))
+        self.assertIsNone(post._json)
+
+        clone = pickle.loads(pickle.dumps(post))
+        self.assertEqual(clone.categories[0].id, post.categories[0].id)
+
+    def test_partial(self):
+        post = Post.parse(self.api, {'id': 1}, fields=['id'])
+        self.assertEqual(post.id, 1)
+
+        with self.assertRaises(MissingFieldError):
+            post.title
@@ -0,0 +1,260 @@
+import unittest
+from unittest import mock
+
+import requests
+
+from wordpress import WordPress
+from wordpress.exceptions import (CircuitOpenError, ClientError, NotFound,
+                                  RateLimited, ServerError)
+from wordpress.retry import (CircuitBreaker, RetryPolicy, http_error,
+                             parse_retry_after)
+
+from .test_cache import FakeClock
+from .test_wordpress import FakeResponse, FakeSession
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(retries=3, backoff=1, max_backoff=5,
+                                  random=lambda: 1.0)
+
+    def test_delay(self):
+        self.assertEqual([self.policy.delay(n) for n in range(5)],
+                         [1, 2, 4, 5, 5])
+
+    def test_jitter(self):
+        policy = RetryPolicy(backoff=1, random=lambda: 0.25)
+        self.assertEqual(policy.delay(2), 1)
+
+    def test_retry_after(self):
+        error = http_error(429, headers={'Retry-After': '7'})
+        self.assertEqual(self.policy.delay(0, error), 7)
+
+        error = http_error(429, headers={'Retry-After': '3600'})
+        self.assertFalse(self.policy.should_retry('GET', 0, error))
+
+        error = http_error(503, headers={'Retry-After': '60'})
+        self.assertEqual(self.policy.delay(0, error), 60)
+
+        error = http_error(503, headers={'Retry-After': '3600'})
+        self.assertFalse(self.policy.should_retry('GET', 0, error))
+
+    def test_should_retry(self):
+        self.assertTrue(self.policy.should_retry('GET', 0, http_error(502)))
+        self.assertTrue(self.policy.should_retry(
+            'GET', 2, requests.ConnectionError()))
+        self.assertTrue(self.policy.should_retry(
+            'GET', 0, requests.ReadTimeout()))
+        self.assertFalse(self.policy.should_retry(
+            'GET', 0, requests.exceptions.InvalidURL()))
+        self.assertFalse(self.policy.should_retry(
+            'GET', 0, requests.TooManyRedirects()))
+        self.assertFalse(self.policy.should_retry('GET', 3, http_error(502)))
+        self.assertFalse(self.policy.should_retry('GET', 0, http_error(404)))
+        self.assertFalse(self.policy.should_retry('POST', 0, http_error(502)))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('5'), 5)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(parse_retry_after('Thu, 01 Jan 1970 00:01:00 GMT',
+                                           now=0), 60)
+
+
+class TestHTTPError(unittest.TestCase):
+
+    def test_types(self):
+        self.assertIsInstance(http_error(404), NotFound)
+        self.assertIsInstance(http_error(403), ClientError)
+        self.assertIsInstance(http_error(503), ServerError)
+        self.assertIsNone(http_error(502, headers={'Retry-After': '2'})
+                          .retry_after)
+
+        error = http_error(429, headers={'Retry-After': '2'})
+        self.assertIsInstance(error, RateLimited)
+        self.assertEqual(error.retry_after, 2)
+
+    def test_body(self):
+        error = http_error(404, {'code': 'rest_post_invalid_id',
+                                 'message': 'Invalid post ID.'})
+
+        self.assertEqual(error.status, 404)
+        self.assertEqual(error.code, 'rest_post_invalid_id')
+        self.assertIn('Invalid post ID.', str(error))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(threshold=2, reset_timeout=10,
+                                      clock=self.clock)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.failure('a')
+        self.breaker.success('a')
+        self.breaker.failure('a')
+        self.breaker.before('a')
+
+        self.breaker.failure('a')
+
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before('a')
+
+        self.breaker.before('b')
+
+    def test_half_open(self):
+        self.breaker.failure('a')
+        self.breaker.failure('a')
+        self.clock.now = 10
+
+        self.breaker.before('a')
+
+        # Only one trial request at a time.
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before('a')
+
+        self.breaker.success('a')
+        self.breaker.before('a')
+        self.assertFalse(self.breaker.is_open('a'))
+
+    def test_release(self):
+        self.breaker.failure('a')
+        self.breaker.failure('a')
+        self.clock.now = 10
+        self.breaker.before('a')
+        self.breaker.release('a')
+
+        self.breaker.before('a')
+        self.assertTrue(self.breaker.is_open('a'))
+
+    def test_failed_trial_reopens(self):
+        self.breaker.failure('a')
+        self.breaker.failure('a')
+        self.clock.now = 10
+        self.breaker.before('a')
+        self.breaker.failure('a')
+
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before('a')
+
+
+class TestClientRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.statuses = []
+        self.sleeps = []
+        self.session = FakeSession({
+            ('GET', 'wp/v2/tags/1'): self.respond,
+            ('POST', 'wp/v2/posts'): self.respond,
+        })
+        self.breaker = CircuitBreaker(threshold=3)
+        self.wp = WordPress(
+            'http://example.org/', session=self.session,
+            api_url=FakeSession.api_url, circuit_breaker=self.breaker,
+            retry_policy=RetryPolicy(sleep=self.sleeps.append,
+                                     random=lambda: 1.0))
+
+    def respond(self, params):
+        if self.statuses:
+            status, headers = self.statuses.pop(0)
+            return FakeResponse(status, data={'code': 'error'},
+                                headers=headers)
+
+        return FakeResponse(data={'id': 1})
+
+    def test_retries_transient_errors(self):
+        self.statuses = [(502, {}), (429, {'Retry-After': '3'})]
+
+        self.assertEqual(self.wp.get_tag(1).id, 1)
+        self.assertEqual(self.sleeps, [0.5, 3])
+
+    def test_waits_out_unavailable(self):
+        self.statuses = [(503, {'Retry-After': '20'})]
+
+        self.assertEqual(self.wp.get_tag(1).id, 1)
+        self.assertEqual(self.sleeps, [20])
+
+    def test_gives_up(self):
+        self.statuses = [(503, {})] * 2
+        wp = WordPress('http://example.org/', session=self.session,
+                       api_url=FakeSession.api_url,
+                       retry_policy=RetryPolicy(retries=1, sleep=lambda s: 0))
+
+        with self.assertRaises(ServerError) as context:
+            wp.get_tag(1)
+
+        self.assertEqual(context.exception.body, {'code': 'error'})
+
+    def test_post_is_not_retried(self):
+        self.statuses = [(502, {})]
+
+        with self.assertRaises(ServerError):
+            self.wp.create_post(title='Hello')
+
+        self.assertEqual(self.sleeps, [])
+
+    def test_not_found(self):
+        self.statuses = [(404, {})]
+
+        with self.assertRaises(NotFound):
+            self.wp.get_tag(1)
+
+        self.assertEqual(len(self.session.requests), 1)
+
+    def test_circuit_breaker(self):
+        self.statuses = [(502, {})] * 4
+
+        with self.assertRaises(CircuitOpenError):
+            self.wp.get_tag(1)
+
+        self.assertEqual(len(self.session.requests), 3)
+        self.assertTrue(self.breaker.is_open('example.org'))
+
+    def test_permanent_request_errors(self):
+        def invalid(params):
+            raise requests.exceptions.InvalidURL()
+
+        self.session.routes[('GET', 'wp/v2/tags/1')] = invalid
+
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.InvalidURL):
+                self.wp.get_tag(1)
+
+        self.assertEqual(len(self.session.requests), 3)
+        self.assertEqual(self.sleeps, [])
+        self.assertFalse(self.breaker.is_open('example.org'))
+
+    def test_permanent_error_releases_trial(self):
+        def invalid(params):
+            raise requests.exceptions.InvalidURL()
+
+        clock = FakeClock()
+        breaker = CircuitBreaker(threshold=1, reset_timeout=5, clock=clock)
+        breaker.failure('example.org')
+        clock.now = 10
+        self.session.routes[('GET', 'wp/v2/tags/1')] = invalid
+        wp = WordPress('http://example.org/', session=self.session,
+                       api_url=FakeSession.api_url, circuit_breaker=breaker)
+
+        with self.assertRaises(requests.exceptions.InvalidURL):
+            wp.get_tag(1)
+
+        breaker.before('example.org')
+
+    def test_throttle_error_leaves_circuit_alone(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(threshold=1, reset_timeout=5, clock=clock)
+        breaker.failure('example.org')
+        clock.now = 10
+        throttle = mock.Mock()
+        throttle.acquire.side_effect = KeyboardInterrupt
+        wp = WordPress('http://example.org/', session=self.session,
+                       api_url=FakeSession.api_url, circuit_breaker=breaker,
+                       throttle=throttle)
+
+        with self.assertRaises(KeyboardInterrupt):
+            wp.get_tag(1)
+
+        # The trial request wasn't taken by the request that never went.
+        breaker.before('example.org')
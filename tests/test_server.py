@@ -0,0 +1,63 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks import bench_client
+from wordpress import WordPress
+
+from .server import WordPressServer, make_posts, make_terms
+
+
+class TestWordPressServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = WordPressServer(
+            posts=make_posts(25, categories=3, tags=4),
+            categories=make_terms('categories', 3),
+            tags=make_terms('tags', 4)).start()
+        self.wp = WordPress(self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_discovery_and_pagination(self):
+        posts = self.wp.list_posts(pre_page=10, page=3)
+
+        self.assertEqual(self.wp.url, self.server.api_url)
+        self.assertEqual(posts.ids(), [5, 4, 3, 2, 1])
+        self.assertEqual(posts.total, 25)
+        self.assertEqual(posts.total_pages, 3)
+        self.assertTrue(posts[0].categories[0].name.startswith('categories'))
+
+    def test_not_modified(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wp = WordPress(self.server.url, http_cache=directory)
+
+        first = wp.get_post(7)
+        second = wp.get_post(7)
+
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual(first.title, second.title)
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_emits_json(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'results.json')
+
+        bench_client.main(['--posts', '30', '--per-page', '10',
+                           '--repeat', '1', '--output', path])
+
+        with open(path) as fobj:
+            report = json.load(fobj)
+
+        names = set(result['name'] for result in report['results'])
+        self.assertIn('list_posts.throughput', names)
+        self.assertIn('memory.streamed', names)
+        self.assertIn('http_cache.revalidated', names)
+        self.assertEqual(report['params']['posts'], 30)
@@ -0,0 +1,159 @@
+import shutil
+import tempfile
+import time
+import unittest
+
+from wordpress import WordPress
+from wordpress.exceptions import NotFound
+from wordpress.retry import RetryPolicy
+from wordpress.stats import Histogram, RequestRecord, Stats, route
+
+from .server import WordPressServer
+from .test_coalesce import together
+from .test_wordpress import FakeResponse, FakeSession
+
+
+class TestStats(unittest.TestCase):
+
+    def test_route(self):
+        self.assertEqual(route('posts/448/revisions/3'),
+                         'posts/{id}/revisions/{id}')
+        self.assertEqual(route('statuses/publish'), 'statuses/publish')
+        self.assertEqual(route('posts'), 'posts')
+
+    def test_histogram(self):
+        histogram = Histogram(buckets=(0.1, 1))
+
+        for value in [0.05, 0.05, 0.5, 3]:
+            histogram.observe(value)
+
+        summary = histogram.to_dict()
+        self.assertEqual(summary['buckets'], {'0.1': 2, '1': 1, '+Inf': 1})
+        self.assertEqual(summary['p50'], 0.1)
+        self.assertEqual(summary['p99'], 3)
+        self.assertEqual(summary['max'], 3)
+        self.assertIsNone(Histogram().quantile(0.5))
+
+    def test_aggregates_by_route(self):
+        stats = Stats()
+
+        for pk, status in [(1, 200), (2, 200), (3, 404)]:
+            record = RequestRecord('GET', 'posts/{0}'.format(pk))
+            record.status = status
+            record.attempts = 2 if pk == 2 else 1
+            record.latency = 0.02
+            record.bytes = 100
+            record.error = NotFound(404) if status == 404 else None
+            stats(record)
+
+        snapshot = stats.snapshot()['GET posts/{id}']
+        self.assertEqual(snapshot['requests'], 3)
+        self.assertEqual(snapshot['errors'], 1)
+        self.assertEqual(snapshot['statuses'], {200: 2, 404: 1})
+        self.assertEqual(snapshot['retries'], 1)
+        self.assertEqual(snapshot['bytes'], 300)
+        self.assertEqual(snapshot['latency']['count'], 3)
+
+        stats.reset()
+        self.assertEqual(stats.snapshot(), {})
+
+
+class TestInstrumentedClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = WordPressServer().start()
+        self.records = []
+        self.wp = WordPress(self.server.url, api_url=self.server.api_url,
+                            hooks=[self.records.append])
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_records(self):
+        post = self.wp.get_post(448)
+
+        record = self.records[-1]
+        self.assertEqual((record.method, record.endpoint, record.route),
+                         ('GET', 'posts/448', 'posts/{id}'))
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.attempts, 1)
+        self.assertGreater(record.bytes, 1000)
+        self.assertGreater(record.latency, 0)
+        self.assertGreater(record.decode_time, 0)
+        self.assertGreater(record.parse_time, 0)
+        self.assertIsNone(record.error)
+
+        # The post's category was looked up while it was parsed, its
+        # record comes first.
+        self.assertEqual(post.categories[0].id, 1)
+        self.assertEqual([r.endpoint for r in self.records],
+                         ['categories/1', 'posts/448'])
+
+    def test_stats(self):
+        self.wp.list_posts()
+        self.wp.get_category(1)
+        self.wp.get_category(1)
+
+        stats = self.wp.stats(reset=True)
+
+        self.assertEqual(stats['GET posts']['requests'], 1)
+        self.assertEqual(stats['GET posts']['statuses'], {200: 1})
+        self.assertGreater(stats['GET posts']['parse_time'], 0)
+        self.assertEqual(stats['GET posts']['latency']['count'], 1)
+        # The second lookup came from the term cache.
+        self.assertNotIn('GET categories/{id}', stats)
+        self.assertEqual(self.wp.stats(), {})
+
+    def test_errors(self):
+        with self.assertRaises(NotFound):
+            self.wp.get_post(1)
+
+        record = self.records[-1]
+        self.assertEqual(record.status, 404)
+        self.assertIsInstance(record.error, NotFound)
+        self.assertEqual(self.wp.stats()['GET posts/{id}']['errors'], 1)
+
+    def test_cached(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wp = WordPress(self.server.url, api_url=self.server.api_url,
+                       http_cache=directory, hooks=[self.records.append])
+
+        wp.list_categories()
+        wp.list_categories()
+
+        self.assertEqual([r.cached for r in self.records], [False, True])
+        self.assertEqual(self.records[-1].bytes, 0)
+
+
+class TestRecordedRetries(unittest.TestCase):
+
+    def test_attempts(self):
+        responses = [FakeResponse(502), FakeResponse(data={'id': 1})]
+        session = FakeSession({('GET', 'wp/v2/tags/1'):
+                               lambda params: responses.pop(0)})
+        records = []
+        wp = WordPress('http://example.org/', session=session,
+                       api_url=FakeSession.api_url, hooks=[records.append],
+                       retry_policy=RetryPolicy(sleep=lambda s: None))
+
+        wp.get_tag(1)
+
+        self.assertEqual(records[0].attempts, 2)
+        self.assertEqual(records[0].status, 200)
+
+    def test_coalesced(self):
+        def respond(params):
+            time.sleep(0.05)
+            return FakeResponse(data={'id': 1})
+
+        session = FakeSession({('GET', 'wp/v2/tags/1'): respond})
+        records = []
+        wp = WordPress('http://example.org/', session=session,
+                       api_url=FakeSession.api_url, hooks=[records.append])
+
+        together(4, lambda: wp.get_tag(1))
+
+        self.assertEqual(sorted(r.coalesced for r in records),
+                         [False, True, True, True])
+        self.assertTrue(all(r.status == 200 for r in records))
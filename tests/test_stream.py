@@ -0,0 +1,126 @@
+import json
+import shutil
+import tempfile
+import unittest
+
+from wordpress import WordPress
+from wordpress.stream import JSONArrayDecoder, ResultStream, iter_json_array
+
+from .server import WordPressServer, make_posts, make_terms
+
+ITEMS = [
+    {'id': 1, 'title': {'rendered': 'Caf\u00e9 [draft], "quoted" \\o/'}},
+    {'id': 2, 'tags': [], 'nested': {'a': [1, 2.5, {'b': None}]}},
+    12345,
+    'snow \u2603',
+    [],
+    True,
+]
+
+
+class TestJSONArrayDecoder(unittest.TestCase):
+
+    def test_any_split(self):
+        body = json.dumps(ITEMS, ensure_ascii=False).encode('utf-8')
+
+        for size in [1, 2, 3, 7, 64, len(body)]:
+            chunks = [body[i:i + size] for i in range(0, len(body), size)]
+            self.assertEqual(list(iter_json_array(chunks)), ITEMS, size)
+
+    def test_incremental(self):
+        decoder = JSONArrayDecoder()
+
+        self.assertEqual(decoder.feed(b' [ {"id": 1'), [])
+        self.assertEqual(decoder.feed(b'}, {"id": 2}'), [{'id': 1}])
+        self.assertEqual(decoder.feed(b', 1'), [{'id': 2}])
+        # The number may go on in the next piece.
+        self.assertEqual(decoder.feed(b'0'), [])
+        self.assertEqual(decoder.feed(b']'), [10])
+        self.assertEqual(decoder.close(), [])
+
+    def test_large_item(self):
+        item = {'content': 'x' * 100000}
+        body = json.dumps([item, item]).encode('utf-8')
+        decoder = JSONArrayDecoder()
+        items = []
+
+        for i in range(0, len(body), 100):
+            items.extend(decoder.feed(body[i:i + 100]))
+
+        items.extend(decoder.close())
+        self.assertEqual(items, [item, item])
+
+    def test_empty(self):
+        self.assertEqual(list(iter_json_array([b'[', b' ]\n'])), [])
+
+    def test_errors(self):
+        for body in [b'{"id": 1}', b'[1, 2', b'[1 2]', b'[1] 2', b'[1,]',
+                     b'']:
+            with self.assertRaises(ValueError):
+                list(iter_json_array([body]))
+
+
+class TestStreamedClient(unittest.TestCase):
+
+    def setUp(self):
+        self.posts = make_posts(45, categories=5, tags=10)
+        self.server = WordPressServer(
+            posts=self.posts, categories=make_terms('categories', 5),
+            tags=make_terms('tags', 10)).start()
+        self.records = []
+        self.wp = WordPress(self.server.url, api_url=self.server.api_url,
+                            hooks=[self.records.append])
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_list_posts(self):
+        posts = self.wp.list_posts(pre_page=20, stream=True)
+
+        self.assertIsInstance(posts, ResultStream)
+        self.assertEqual((posts.total, posts.total_pages), (45, 3))
+        # Nothing is recorded until the body has been read.
+        self.assertEqual(self.records, [])
+
+        streamed = [(post.id, [c.id for c in post.categories],
+                     post.status.slug) for post in posts]
+        expected = [(post['id'], post['categories'], 'publish')
+                    for post in self.posts[:20]]
+        self.assertEqual(streamed, expected)
+
+        record, = [r for r in self.records if r.endpoint == 'posts']
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.bytes, 20000)
+        self.assertGreater(record.decode_time, 0)
+        self.assertGreater(record.parse_time, 0)
+        self.assertEqual(list(posts), [])
+
+    def test_early_close(self):
+        with self.wp.list_categories(stream=True) as categories:
+            self.assertEqual(next(categories).id, 1)
+
+        self.assertEqual([r.endpoint for r in self.records], ['categories'])
+        self.assertEqual(list(categories), [])
+
+    def test_iter_posts(self):
+        ids = [post.id for post in self.wp.iter_posts(pre_page=20,
+                                                      stream=True)]
+
+        self.assertEqual(ids, [post['id'] for post in self.posts])
+        self.assertEqual(self.server.hits['posts'], 3)
+
+    def test_not_cached(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wp = WordPress(self.server.url, api_url=self.server.api_url,
+                       http_cache=directory)
+
+        for _ in range(2):
+            self.assertEqual(len(list(wp.list_tags(stream=True))), 10)
+
+        self.assertEqual(self.server.not_modified, 0)
+        self.assertEqual(wp.http_cache.misses, 0)
+
+    def test_columnar(self):
+        with self.assertRaises(ValueError):
+            self.wp.list_posts(columnar=True, stream=True)
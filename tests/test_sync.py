@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from wordpress import WordPress
+from wordpress.sync import SyncState
+
+from .test_wordpress import FakeResponse, FakeSession
+
+
+class FakeSite(object):
+    """
+    A posts collection that honours modified_after and orderby=modified.
+    """
+
+    def __init__(self):
+        self.posts = {}
+        self.now = datetime(2016, 7, 1)
+
+    def save(self, pk, seconds=1):
+        self.now += timedelta(seconds=seconds)
+        stamp = self.now.isoformat()
+        self.posts[pk] = {'id': pk, 'modified': stamp, 'modified_gmt': stamp}
+
+    def __call__(self, params):
+        posts = sorted(self.posts.values(),
+                       key=lambda post: (post['modified'], post['id']))
+
+        if 'modified_after' in params:
+            posts = [post for post in posts
+                     if post['modified'] > params['modified_after']]
+
+        if params.get('_fields') == 'id':
+            posts = [{'id': post['id']} for post in posts]
+
+        per_page = params['per_page']
+        start = (params.get('page', 1) - 1) * per_page
+        pages = max(1, -(-len(posts) // per_page))
+
+        return FakeResponse(data=posts[start:start + per_page], headers={
+            'X-WP-Total': str(len(posts)), 'X-WP-TotalPages': str(pages)})
+
+
+class TestSync(unittest.TestCase):
+
+    def setUp(self):
+        self.site = FakeSite()
+        self.session = FakeSession({('GET', 'wp/v2/posts'): self.site})
+        self.wp = WordPress('http://example.org/', session=self.session,
+                            api_url=FakeSession.api_url)
+        self.state = SyncState()
+
+        for pk in range(1, 8):
+            self.site.save(pk)
+
+    def sync(self, **kwargs):
+        return self.wp.sync_posts(self.state, pre_page=3, **kwargs)
+
+    def test_first_sync(self):
+        changes = self.sync()
+
+        self.assertEqual(changes.created.ids(), list(range(1, 8)))
+        self.assertEqual(changes.updated, [])
+        self.assertEqual(changes.watermark, self.site.now)
+
+    def test_incremental(self):
+        self.sync()
+        self.site.save(3)
+        self.site.save(8)
+        del self.site.posts[5]
+
+        changes = self.sync()
+
+        self.assertEqual(changes.created.ids(), [8])
+        self.assertEqual(changes.updated.ids(), [3])
+        self.assertEqual(changes.deleted, [5])
+
+        params = [r[2]['params'] for r in self.session.api_requests
+                  if r[2]['params'].get('_fields') != 'id'][-1]
+        self.assertEqual(params['orderby'], 'modified')
+        self.assertIn('modified_after', params)
+
+    def test_nothing_changed(self):
+        self.sync()
+        changes = self.sync(detect_deletions=False)
+
+        self.assertFalse(changes)
+        self.assertEqual(self.session.api_requests[-1][2]['params'].get(
+            'modified_after'), '2016-07-01T00:00:06')
+
+    def test_same_second(self):
+        # More posts than a page modified in the same second.
+        self.sync()
+
+        for pk in range(10, 17):
+            self.site.save(pk, seconds=0)
+
+        changes = self.sync(detect_deletions=False)
+        self.assertEqual(changes.created.ids(), list(range(10, 17)))
+
+    def test_fields(self):
+        self.sync(fields=['title'])
+        params = self.session.api_requests[0][2]['params']
+        self.assertEqual(params['_fields'], 'title,id,modified,modified_gmt')
+
+    def test_rejects_paging(self):
+        with self.assertRaises(ValueError):
+            self.sync(orderby='date')
+
+
+class TestSyncState(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'sync.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_persists(self):
+        stamp = datetime(2016, 7, 1)
+        SyncState(self.path).set('http://example.org/', stamp, stamp, {2, 1})
+
+        watermark, cursor, ids = SyncState(self.path).get(
+            'http://example.org/')
+
+        self.assertEqual(watermark, stamp)
+        self.assertEqual(ids, {1, 2})
+        self.assertEqual(SyncState(self.path).get('http://other.org/'),
+                         (None, None, set()))
@@ -0,0 +1,120 @@
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from wordpress import WordPress
+from wordpress.cache import DiscoveryCache
+
+from .server import WordPressServer, make_posts, make_terms
+
+WORKERS = 64
+
+
+class TestSharedClient(unittest.TestCase):
+    """
+    One client serving a 64 thread worker pool against the stand-in server.
+    """
+
+    def setUp(self):
+        self.posts = make_posts(300, categories=15, tags=30)
+        self.server = WordPressServer(
+            posts=self.posts, categories=make_terms('categories', 15),
+            tags=make_terms('tags', 30)).start()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def client(self, **kwargs):
+        return WordPress(self.server.url, pool_maxsize=WORKERS,
+                         discovery_cache=DiscoveryCache(), **kwargs)
+
+    def run_workers(self, func, tasks):
+        barrier = threading.Barrier(WORKERS)
+
+        def start(_):
+            barrier.wait()
+
+        with ThreadPoolExecutor(WORKERS) as pool:
+            # Every worker is started before the first task runs.
+            list(pool.map(start, range(WORKERS)))
+            return list(pool.map(func, tasks))
+
+    def test_mixed_workload(self):
+        wp = self.client(http_cache=self.directory)
+        by_id = dict((post['id'], post) for post in self.posts)
+        rng = random.Random(0)
+
+        def work(task):
+            kind, arg = task
+
+            if kind == 'page':
+                posts = wp.list_posts(page=arg, pre_page=20)
+                return [(post.id, [c.id for c in post.categories],
+                         post.status.slug) for post in posts]
+
+            if kind == 'post':
+                post = wp.get_post(arg)
+                return [(post.id, [c.id for c in post.categories],
+                         post.status.slug)]
+
+            return [(wp.get_category(arg).id, None, None)]
+
+        tasks = ([('page', page) for page in range(1, 16)] * 4 +
+                 [('post', rng.randint(1, 300)) for _ in range(200)] +
+                 [('category', rng.randint(1, 15)) for _ in range(200)])
+        rng.shuffle(tasks)
+
+        for (kind, arg), results in zip(tasks, self.run_workers(work, tasks)):
+            for pk, categories, status in results:
+                if kind == 'category':
+                    self.assertEqual(pk, arg)
+                    continue
+
+                self.assertEqual(categories, by_id[pk]['categories'])
+                self.assertEqual(status, 'publish')
+
+        self.assertEqual(self.server.hits['index'], 1)
+        cache = wp.http_cache
+        self.assertEqual(cache.hits, self.server.not_modified)
+        self.assertEqual(cache.hits + cache.misses,
+                         sum(self.server.hits.values()) - 1)
+
+    def test_term_identity(self):
+        wp = self.client()
+
+        categories = self.run_workers(lambda _: wp.get_category(3),
+                                      range(WORKERS * 2))
+
+        self.assertTrue(all(c is categories[0] for c in categories))
+        self.assertLessEqual(self.server.hits['categories/3'], 2)
+
+    def test_shared_lazy_page(self):
+        wp = self.client(lazy=True)
+        posts = wp.list_posts(pre_page=50)
+        dates = dict((post['id'], post['date']) for post in self.posts)
+
+        def read(post):
+            return [c.name for c in post.categories], post.date
+
+        results = self.run_workers(read, list(posts) * 4)
+
+        for post, (names, date) in zip(list(posts) * 4, results):
+            self.assertEqual(len(names), len(post.categories))
+            self.assertEqual(date.isoformat(), dates[post.id])
+
+        # The page's terms were looked up once, in bulk.
+        self.assertEqual(self.server.hits['categories'], 1)
+
+    def test_fetch_all(self):
+        wp = self.client()
+
+        results = self.run_workers(
+            lambda _: wp.fetch_all('posts', workers=4).ids(), range(8))
+
+        expected = [post['id'] for post in self.posts]
+        self.assertTrue(all(ids == expected for ids in results))
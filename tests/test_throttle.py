@@ -0,0 +1,146 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from wordpress import WordPress
+from wordpress.exceptions import ServerError
+from wordpress.retry import RetryPolicy
+from wordpress.throttle import Throttle
+
+from .test_cache import FakeClock
+from .test_wordpress import FakeResponse, FakeSession
+
+
+class TestThrottle(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.throttle = Throttle(rate=2, clock=self.clock)
+
+    def test_spaces_requests(self):
+        waits = [self.throttle.reserve() for _ in range(3)]
+        self.assertEqual(waits, [0, 0.5, 1.0])
+
+        self.clock.now = 10
+        self.assertEqual(self.throttle.reserve(), 0)
+
+    def test_burst(self):
+        throttle = Throttle(rate=1, burst=3, clock=self.clock)
+        self.clock.now = 10
+
+        self.assertEqual([throttle.reserve() for _ in range(4)],
+                         [0, 0, 0, 1])
+
+    def test_unlimited(self):
+        throttle = Throttle(clock=self.clock)
+        self.assertEqual([throttle.reserve() for _ in range(3)], [0, 0, 0])
+
+    def test_retry_after_pauses(self):
+        self.throttle.observe(0, 429, {'Retry-After': '5'})
+        self.clock.now = 2
+
+        self.assertEqual(self.throttle.reserve(), 3)
+
+    def test_slows_down_once_per_window(self):
+        self.clock.now = 1
+        self.throttle.observe(0, 429)
+        self.throttle.observe(0, 429)
+        self.assertEqual(self.throttle.rate, 1)
+
+        self.throttle.observe(1, 503)
+        self.assertEqual(self.throttle.rate, 0.5)
+
+        for _ in range(100):
+            self.throttle.observe(1, 200)
+
+        self.assertEqual(self.throttle.rate, 2)
+
+    def test_min_rate(self):
+        for now in range(10):
+            self.clock.now = now
+            self.throttle.observe(now, 429)
+
+        self.assertEqual(self.throttle.rate, 0.2)
+
+    def test_target_latency(self):
+        throttle = Throttle(rate=2, target_latency=1, clock=self.clock)
+        self.clock.now = 2
+
+        throttle.observe(1.5, 200)
+        self.assertEqual(throttle.rate, 2)
+
+        throttle.observe(0, 200)
+        self.assertEqual(throttle.rate, 1)
+
+    def test_not_adaptive(self):
+        throttle = Throttle(rate=2, adaptive=False, clock=self.clock)
+        throttle.observe(0, 429)
+
+        self.assertEqual(throttle.rate, 2)
+
+    def test_checks_arguments(self):
+        with self.assertRaises(ValueError):
+            Throttle(rate=0)
+
+        with self.assertRaises(ValueError):
+            Throttle(max_in_flight=0)
+
+
+class TestThrottledClient(unittest.TestCase):
+
+    def test_rate(self):
+        sleeps = []
+        session = FakeSession({('GET', 'wp/v2/tags/1'):
+                               FakeResponse(data={'id': 1})})
+        wp = WordPress('http://example.org/', session=session,
+                       api_url=FakeSession.api_url, term_cache_size=0,
+                       throttle=Throttle(rate=4, clock=FakeClock(),
+                                         sleep=sleeps.append))
+
+        for _ in range(3):
+            wp.get_tag(1)
+
+        self.assertEqual(sleeps, [0.25, 0.5])
+
+    def test_max_in_flight(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def respond(params):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+
+            time.sleep(0.005)
+
+            with lock:
+                running.pop()
+
+            return FakeResponse(data={'id': 1})
+
+        session = FakeSession({('GET', 'wp/v2/tags/1'): respond})
+        wp = WordPress('http://example.org/', session=session,
+                       api_url=FakeSession.api_url, term_cache_size=0,
+                       coalesce=False, throttle=Throttle(max_in_flight=2))
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: wp.get_tag(1), range(16)))
+
+        self.assertEqual(len(peak), 16)
+        self.assertLessEqual(max(peak), 2)
+
+    def test_slot_freed_on_error(self):
+        throttle = Throttle(max_in_flight=1)
+        session = FakeSession({('GET', 'wp/v2/tags/1'): FakeResponse(500)})
+        wp = WordPress('http://example.org/', session=session,
+                       api_url=FakeSession.api_url, throttle=throttle,
+                       retry_policy=RetryPolicy(retries=0),
+                       circuit_breaker=False)
+
+        for _ in range(2):
+            with self.assertRaises(ServerError):
+                wp.get_tag(1)
+
+        self.assertTrue(throttle._slots.acquire(blocking=False))
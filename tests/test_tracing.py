@@ -0,0 +1,168 @@
+import unittest
+
+from wordpress import WordPress
+from wordpress.cache import DISCOVERY_CACHE
+from wordpress.exceptions import NotFound
+from wordpress.retry import RetryPolicy
+from wordpress.tracing import (NoopTracer, SpanRecorder, Tracer,
+                               get_current_span)
+
+from .server import WordPressServer
+from .test_wordpress import FakeResponse, FakeSession
+
+
+def tree(spans):
+    """The spans as (name, children) pairs, ordered by start time."""
+    spans = sorted(spans, key=lambda span: span.start_time)
+
+    def children(parent_id):
+        return [(span.name, children(span.span_id)) for span in spans
+                if span.parent_id == parent_id]
+
+    return children(None)
+
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = SpanRecorder()
+        self.tracer = Tracer(exporters=[self.recorder])
+
+    def test_nesting(self):
+        with self.tracer.start_as_current_span('outer') as outer:
+            with self.tracer.start_as_current_span('inner',
+                                                   attributes={'a': 1}):
+                self.assertEqual(get_current_span().name, 'inner')
+
+            self.assertIs(get_current_span(), outer)
+
+        self.assertIsNone(get_current_span())
+
+        inner, outer = self.recorder.spans
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(inner.trace_id, outer.trace_id)
+        self.assertEqual(inner.attributes, {'a': 1})
+        self.assertGreaterEqual(outer.duration, inner.duration)
+        self.assertEqual(self.recorder.format().splitlines()[1][:8],
+                         '  inner ')
+
+    def test_exception(self):
+        with self.assertRaises(ValueError):
+            with self.tracer.start_as_current_span('failing'):
+                raise ValueError('bad')
+
+        span = self.recorder.spans[0]
+        self.assertEqual(span.status, 'ERROR')
+        self.assertEqual(span.to_dict()['events'][0]['attributes'],
+                         {'exception.type': 'ValueError',
+                          'exception.message': 'bad'})
+
+    def test_recorder_maxlen(self):
+        recorder = SpanRecorder(maxlen=2)
+        tracer = Tracer(exporters=[recorder])
+
+        for name in 'abc':
+            with tracer.start_as_current_span(name):
+                pass
+
+        self.assertEqual([span.name for span in recorder.spans], ['b', 'c'])
+
+        recorder.clear()
+        self.assertEqual(recorder.spans, [])
+
+
+class TestTracedClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = WordPressServer().start()
+        self.recorder = SpanRecorder()
+        self.wp = WordPress(self.server.url, api_url=self.server.api_url,
+                            tracer=Tracer(exporters=[self.recorder]))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_nested_lookups(self):
+        post = self.wp.get_post(448)
+        self.assertEqual(len(post.categories), 1)
+
+        lookup = ('GET categories/{id}', [('HTTP GET', []),
+                                          ('wordpress.decode', []),
+                                          ('wordpress.parse', [])])
+
+        self.assertEqual(tree(self.recorder.spans), [
+            ('GET posts/{id}', [
+                ('HTTP GET', []),
+                ('wordpress.decode', []),
+                ('wordpress.parse', [lookup]),
+            ]),
+        ])
+
+        root = max(self.recorder.spans, key=lambda span: span.duration)
+        self.assertEqual(root.attributes['wordpress.endpoint'], 'posts/448')
+        self.assertEqual(root.attributes['http.status_code'], 200)
+        self.assertEqual(root.attributes['wordpress.attempts'], 1)
+
+    def test_list(self):
+        self.wp.list_posts()
+
+        root, = [span for span in self.recorder.spans
+                 if span.name == 'GET posts']
+        parse, = [span for span in self.recorder.spans
+                  if span.name == 'wordpress.parse' and
+                  span.parent_id == root.span_id]
+
+        self.assertEqual(parse.attributes, {'wordpress.model': 'Post',
+                                            'wordpress.count': 10})
+        # The page's terms are looked up in bulk while it is parsed.
+        self.assertTrue(any(span.name == 'GET categories' and
+                            span.parent_id == parse.span_id
+                            for span in self.recorder.spans))
+
+    def test_error(self):
+        with self.assertRaises(NotFound):
+            self.wp.get_post(1)
+
+        http, root = self.recorder.spans
+        self.assertEqual(http.attributes['http.status_code'], 404)
+        self.assertEqual(root.status, 'ERROR')
+        self.assertEqual(root.events[0][0], 'exception')
+
+
+class TestTracedDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        DISCOVERY_CACHE.clear()
+        self.recorder = SpanRecorder()
+
+    def tearDown(self):
+        DISCOVERY_CACHE.clear()
+
+    def test_discovery(self):
+        responses = [FakeResponse(503), FakeResponse(data={'id': 1})]
+        session = FakeSession({('GET', 'wp/v2/tags/1'):
+                               lambda params: responses.pop(0)})
+        wp = WordPress('http://example.org/', session=session,
+                       tracer=Tracer(exporters=[self.recorder]),
+                       retry_policy=RetryPolicy(sleep=lambda s: None))
+
+        wp.get_tag(1)
+
+        self.assertEqual(tree(self.recorder.spans), [
+            ('GET tags/{id}', [
+                ('wordpress.discover', [('HTTP HEAD', [])]),
+                ('HTTP GET', []),
+                ('HTTP GET', []),
+                ('wordpress.decode', []),
+                ('wordpress.parse', []),
+            ]),
+        ])
+
+        spans = dict((span.name, span) for span in self.recorder.spans)
+        discover = spans['wordpress.discover']
+        self.assertFalse(discover.attributes['wordpress.discovery.cached'])
+        self.assertEqual(spans['HTTP GET'].attributes['http.resend_count'], 1)
+
+    def test_untraced(self):
+        wp = WordPress('http://example.org/', session=FakeSession())
+        self.assertIsInstance(wp.tracer, NoopTracer)
@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from wordpress import utils
+from wordpress.utils import parse_iso8601, parse_iso8601_columns
+
+
+class TestParseISO8601(unittest.TestCase):
+
+    def test_wordpress_format(self):
+        self.assertEqual(parse_iso8601('2016-07-15T19:37:41'),
+                         datetime(2016, 7, 15, 19, 37, 41))
+
+    def test_unset(self):
+        self.assertIsNone(parse_iso8601(None))
+
+    def test_fractional_seconds(self):
+        self.assertEqual(parse_iso8601('2016-07-15T19:37:41.5'),
+                         datetime(2016, 7, 15, 19, 37, 41, 500000))
+        self.assertEqual(parse_iso8601('2016-07-15T19:37:41.123456789'),
+                         datetime(2016, 7, 15, 19, 37, 41, 123456))
+
+    def test_offsets(self):
+        self.assertEqual(parse_iso8601('2016-07-15T19:37:41Z'),
+                         datetime(2016, 7, 15, 19, 37, 41,
+                                  tzinfo=timezone.utc))
+        self.assertEqual(
+            parse_iso8601('2016-07-15T19:37:41-0430').utcoffset(),
+            -timedelta(hours=4, minutes=30))
+        self.assertEqual(
+            parse_iso8601('2016-07-15T19:37:41+02:00').utcoffset(),
+            timedelta(hours=2))
+
+    def test_space_separator(self):
+        self.assertEqual(parse_iso8601('2016-07-15 19:37:41'),
+                         datetime(2016, 7, 15, 19, 37, 41))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_iso8601('15/07/2016')
+
+    def test_without_fromisoformat(self):
+        # Python 3.5 and 3.6 have no datetime.fromisoformat.
+        with mock.patch.object(utils, '_fromisoformat', None):
+            self.assertEqual(utils._parse_iso8601('2016-07-15T19:37:41'),
+                             datetime(2016, 7, 15, 19, 37, 41))
+            self.assertEqual(
+                utils._parse_iso8601('2016-07-15T19:37:41+02:00').utcoffset(),
+                timedelta(hours=2))
+
+            with self.assertRaises(ValueError):
+                utils._parse_iso8601('15/07/2016')
+
+    def test_memoized(self):
+        self.assertIs(parse_iso8601('2016-07-15T19:37:42'),
+                      parse_iso8601('2016-07-15T19:37:42'))
+
+
+class TestParseISO8601Columns(unittest.TestCase):
+
+    def test_columns(self):
+        columns = parse_iso8601_columns([
+            {'date': '2016-07-15T19:37:41', 'date_gmt': None},
+            {'date': '2016-07-16T19:37:41'},
+        ], fields=['date', 'date_gmt'])
+
+        self.assertEqual(columns['date'], [datetime(2016, 7, 15, 19, 37, 41),
+                                           datetime(2016, 7, 16, 19, 37, 41)])
+        self.assertEqual(columns['date_gmt'], [None, None])
@@ -1,7 +1,18 @@
 import datetime
+import json
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 from wordpress import WordPress
+from wordpress.api import clean_params
+from wordpress.cache import DISCOVERY_CACHE
+from wordpress.columns import ColumnSet
+from wordpress.exceptions import DiscoveryError, NotFound, ServerError
+from wordpress.models import Category
+from wordpress.retry import RetryPolicy
 
 
 class TestWordPress(unittest.TestCase):
@@ -53,3 +64,455 @@ class TestWordPress(unittest.TestCase):
     def test_list_categories(self):
         categories = self.wp.list_categories()
         self.assertTrue(categories)
+
+
+class FakeResponse(object):
+
+    def __init__(self, status_code=200, data=None, headers=None, links=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.links = links or {}
+        self._data = data
+        self.text = json.dumps(data)
+        self.content = self.text.encode('utf-8')
+
+    def json(self):
+        return self._data
+
+
+class FakeSession(object):
+    """
+    A stand-in for requests.Session that answers from a dict of routes.
+    """
+
+    api_url = 'http://example.org/wp-json/'
+
+    def __init__(self, routes=None):
+        self.routes = routes or {}
+        self.requests = []
+        self.closed = False
+
+    @property
+    def api_requests(self):
+        return [r for r in self.requests if r[0] != 'HEAD']
+
+    def head(self, url, **kwargs):
+        self.requests.append(('HEAD', url, kwargs))
+        return FakeResponse(links={
+            'https://api.w.org/': {'url': self.api_url}
+        })
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        endpoint = url[len(self.api_url):]
+        route = self.routes.get((method, endpoint), FakeResponse(404))
+
+        if callable(route):
+            return route(kwargs.get('params', {}))
+
+        return route
+
+    def close(self):
+        self.closed = True
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        DISCOVERY_CACHE.clear()
+        self.session = FakeSession({
+            ('GET', 'wp/v2/posts/1'): FakeResponse(data={'id': 1}),
+            ('POST', 'wp/v2/settings'): FakeResponse(data={'title': 'A'}),
+        })
+        self.wp = WordPress('http://example.org/', verify_ssl=False,
+                            session=self.session)
+
+    def test_requests_share_session(self):
+        self.wp._get('posts/1')
+        self.wp._post('settings')
+        methods = [method for method, url, kwargs in self.session.requests]
+        self.assertEqual(methods, ['HEAD', 'GET', 'POST'])
+
+    def test_verify_ssl(self):
+        self.wp._get('posts/1')
+        for method, url, kwargs in self.session.requests:
+            self.assertFalse(kwargs['verify'])
+
+    def test_error_status(self):
+        with self.assertRaises(Exception):
+            self.wp._delete('posts/1')
+
+    def test_borrowed_session_not_closed(self):
+        with self.wp:
+            pass
+        self.assertFalse(self.session.closed)
+
+    def test_owned_session_closed(self):
+        self.wp._owns_session = True
+        with self.wp:
+            pass
+        self.assertTrue(self.session.closed)
+
+    def test_pool_adapter(self):
+        with mock.patch.object(WordPress, '_get_wp_api_url'):
+            wp = WordPress('http://example.org/', pool_connections=4,
+                           pool_maxsize=32)
+
+        adapter = wp.session.get_adapter('https://example.org/')
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertTrue(wp._owns_session)
+
+
+class TestCleanParams(unittest.TestCase):
+
+    def test_drops_unset(self):
+        params = clean_params({'self': object(), 'search': None,
+                               'include': [], 'page': 1})
+        self.assertEqual(params, {'page': 1})
+
+    def test_aliases(self):
+        self.assertEqual(clean_params({'pre_page': 5}), {'per_page': 5})
+
+    def test_models_and_lists(self):
+        category = Category.parse(None, {'id': 7})
+        params = clean_params({'parent': category, 'include': [1, 2]})
+        self.assertEqual(params, {'parent': 7, 'include': '1,2'})
+
+
+class TestTermCacheLookups(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession({
+            ('GET', 'wp/v2/categories/1'): FakeResponse(data={'id': 1}),
+            ('GET', 'wp/v2/tags'): FakeResponse(data=[{'id': 2}, {'id': 3}]),
+        })
+        self.wp = WordPress('http://example.org/', session=self.session)
+
+    def test_get_category_identity(self):
+        category = self.wp.get_category(1)
+        self.assertIs(self.wp.get_category(1), category)
+        self.assertEqual(len(self.session.api_requests), 1)
+        self.assertEqual(self.wp.term_cache.stats()['category'].hits, 1)
+
+    def test_lookup_tags_fetches_misses_once(self):
+        tags = self.wp.lookup_tags([2, 3])
+        self.assertEqual(sorted(tags), [2, 3])
+        self.assertIs(self.wp.get_tag(3), tags[3])
+
+        method, url, kwargs = self.session.requests[-1]
+        self.assertEqual(kwargs['params']['include'], '2,3')
+        self.assertEqual(kwargs['params']['per_page'], 2)
+
+    def test_invalidate(self):
+        self.wp.get_category(1)
+        self.wp.term_cache.invalidate('category', 1)
+        self.wp.get_category(1)
+        self.assertEqual(len(self.session.api_requests), 2)
+
+
+def paginated(items, headers=True):
+    """
+    Build a route that serves items one page at a time.
+    """
+    def route(params):
+        page = params.get('page', 1)
+        per_page = params.get('per_page', 10)
+        start = (page - 1) * per_page
+        pages = -(-len(items) // per_page)
+        extra = {}
+
+        if headers:
+            extra = {'X-WP-Total': str(len(items)),
+                     'X-WP-TotalPages': str(pages)}
+
+        if page > max(pages, 1):
+            return FakeResponse(400)
+
+        return FakeResponse(data=items[start:start + per_page], headers=extra)
+
+    return route
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.tags = [{'id': i} for i in range(1, 26)]
+        self.session = FakeSession({
+            ('GET', 'wp/v2/tags'): paginated(self.tags),
+        })
+        self.wp = WordPress('http://example.org/', session=self.session)
+
+    def test_list_headers(self):
+        tags = self.wp.list_tags(pre_page=10)
+        self.assertEqual(tags.total, 25)
+        self.assertEqual(tags.total_pages, 3)
+
+    def test_iter_tags(self):
+        ids = [tag.id for tag in self.wp.iter_tags(pre_page=10)]
+        self.assertEqual(ids, list(range(1, 26)))
+        self.assertEqual(len(self.session.api_requests), 3)
+
+    def test_iter_default_page_size(self):
+        list(self.wp.iter_tags())
+        method, url, kwargs = self.session.requests[-1]
+        self.assertEqual(kwargs['params']['per_page'], 100)
+
+    def test_iter_without_headers(self):
+        self.session.routes[('GET', 'wp/v2/tags')] = paginated(
+            self.tags, headers=False)
+        ids = [tag.id for tag in self.wp.iter_tags(pre_page=10)]
+        self.assertEqual(len(ids), 25)
+
+    def test_iter_empty(self):
+        self.session.routes[('GET', 'wp/v2/tags')] = paginated([])
+        self.assertEqual(list(self.wp.iter_tags()), [])
+
+
+class TestFetchAll(unittest.TestCase):
+
+    def setUp(self):
+        self.tags = [{'id': i} for i in range(1, 96)]
+        self.session = FakeSession({
+            ('GET', 'wp/v2/tags'): paginated(self.tags),
+        })
+        # Page retries are tested here, not the client's.
+        self.wp = WordPress('http://example.org/', session=self.session,
+                            retry_policy=RetryPolicy(retries=0),
+                            circuit_breaker=False)
+
+    def test_order(self):
+        tags = self.wp.fetch_all('tags', workers=4, pre_page=10)
+        self.assertEqual(tags.ids(), list(range(1, 96)))
+        self.assertEqual(tags.total, 95)
+
+    def test_columnar(self):
+        posts = [{'id': i, 'status': 'publish'} for i in range(1, 26)]
+        self.session.routes[('GET', 'wp/v2/posts')] = paginated(posts)
+
+        columns = self.wp.fetch_all('posts', pre_page=10, columnar=True)
+        method, url, kwargs = self.session.requests[-1]
+
+        self.assertIsInstance(columns, ColumnSet)
+        self.assertEqual(columns.ids(), list(range(1, 26)))
+        self.assertEqual(columns.total, 25)
+        self.assertEqual(columns.count_by('status'), {'publish': 25})
+        self.assertIn('modified_gmt', kwargs['params']['_fields'])
+        self.assertNotIn('columnar', kwargs['params'])
+
+    def test_retries_failed_pages(self):
+        route = paginated(self.tags)
+        failures = {3: 2}
+
+        def flaky(params):
+            page = params.get('page', 1)
+
+            if failures.get(page):
+                failures[page] -= 1
+                return FakeResponse(502)
+
+            return route(params)
+
+        self.session.routes[('GET', 'wp/v2/tags')] = flaky
+        tags = self.wp.fetch_all('tags', workers=3, pre_page=10, retries=2,
+                                 backoff=0)
+        self.assertEqual(tags.ids(), list(range(1, 96)))
+
+    def test_defers_to_retry_policy(self):
+        route = paginated(self.tags)
+
+        def broken(params):
+            if params.get('page', 1) == 2:
+                return FakeResponse(502)
+
+            return route(params)
+
+        self.session.routes[('GET', 'wp/v2/tags')] = broken
+        wp = WordPress('http://example.org/', session=self.session,
+                       retry_policy=RetryPolicy(retries=3,
+                                                sleep=lambda s: None),
+                       circuit_breaker=False)
+
+        with self.assertRaises(ServerError):
+            wp.fetch_all('tags', pre_page=10, workers=1)
+
+        pages = [kwargs['params'].get('page')
+                 for method, url, kwargs in self.session.api_requests]
+        self.assertEqual(pages.count(2), 4)
+
+    def test_gives_up(self):
+        route = paginated(self.tags)
+
+        def broken(params):
+            if params.get('page', 1) == 2:
+                return FakeResponse(502)
+
+            return route(params)
+
+        self.session.routes[('GET', 'wp/v2/tags')] = broken
+
+        with self.assertRaises(ServerError):
+            self.wp.fetch_all('tags', pre_page=10, retries=1, backoff=0)
+
+    def test_permanent_errors(self):
+        route = paginated(self.tags)
+
+        def missing(params):
+            if params.get('page', 1) == 2:
+                return FakeResponse(404)
+
+            return route(params)
+
+        self.session.routes[('GET', 'wp/v2/tags')] = missing
+
+        with self.assertRaises(NotFound):
+            self.wp.fetch_all('tags', pre_page=10, workers=1, backoff=10)
+
+        pages = [kwargs['params'].get('page')
+                 for method, url, kwargs in self.session.api_requests]
+        self.assertEqual(pages.count(2), 1)
+
+        with self.assertRaises(ValueError):
+            self.wp.fetch_all('posts', orderby='bogus', backoff=10)
+
+    def test_unknown_endpoint(self):
+        with self.assertRaises(ValueError):
+            self.wp.fetch_all('users')
+
+
+class TestHTTPCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.session = FakeSession({
+            ('GET', 'wp/v2/tags'): self.conditional,
+        })
+        self.wp = WordPress('http://example.org/', session=self.session,
+                            http_cache=self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def conditional(self, params):
+        method, url, kwargs = self.session.requests[-1]
+
+        if kwargs['headers'].get('If-None-Match') == '"v1"':
+            return FakeResponse(304)
+
+        return FakeResponse(data=[{'id': 1}], headers={
+            'ETag': '"v1"', 'X-WP-Total': '1', 'X-WP-TotalPages': '1'})
+
+    def test_revalidates(self):
+        self.wp.list_tags()
+        tags = self.wp.list_tags()
+
+        self.assertEqual(tags.ids(), [1])
+        self.assertEqual(tags.total, 1)
+        self.assertEqual(self.wp.http_cache.hits, 1)
+        self.assertEqual(self.wp.http_cache.misses, 1)
+
+    def test_survives_new_client(self):
+        self.wp.list_tags()
+        wp = WordPress('http://example.org/', session=self.session,
+                       http_cache=self.directory)
+        self.assertEqual(wp.list_tags().ids(), [1])
+        self.assertEqual(wp.http_cache.hits, 1)
+
+    def test_params_are_part_of_the_key(self):
+        self.wp.list_tags()
+        self.wp.list_tags(page=2)
+        self.assertEqual(self.wp.http_cache.hits, 0)
+
+    def test_no_validator(self):
+        self.session.routes[('GET', 'wp/v2/tags')] = FakeResponse(data=[])
+        self.wp.list_tags()
+        self.assertEqual(len(os.listdir(self.directory)), 0)
+
+
+class TestDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        DISCOVERY_CACHE.clear()
+        self.session = FakeSession({
+            ('GET', 'wp/v2/posts/1'): FakeResponse(data={'id': 1}),
+        })
+
+    def heads(self):
+        return [r for r in self.session.requests if r[0] == 'HEAD']
+
+    def test_lazy(self):
+        wp = WordPress('http://example.org/', session=self.session)
+        self.assertEqual(self.session.requests, [])
+        self.assertEqual(wp.url, FakeSession.api_url)
+        self.assertEqual(len(self.heads()), 1)
+
+    def test_api_url(self):
+        wp = WordPress('http://example.org/', session=self.session,
+                       api_url=FakeSession.api_url)
+        wp._get('posts/1')
+        self.assertEqual(self.heads(), [])
+
+    def test_memoized_per_process(self):
+        for i in range(3):
+            WordPress('http://example.org/', session=self.session)._get(
+                'posts/1')
+
+        self.assertEqual(len(self.heads()), 1)
+
+    def test_on_disk(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'roots.json')
+
+        try:
+            wp = WordPress('http://example.org/', session=self.session,
+                           discovery_cache=path)
+            wp.url
+            DISCOVERY_CACHE.clear()
+
+            wp = WordPress('http://example.org/', session=self.session,
+                           discovery_cache=path)
+            self.assertEqual(wp.url, FakeSession.api_url)
+            self.assertEqual(len(self.heads()), 1)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_missing_link(self):
+        self.session.head = lambda url, **kwargs: FakeResponse()
+        wp = WordPress('http://example.org/', session=self.session)
+
+        with self.assertRaises(DiscoveryError):
+            wp.url
+
+
+class TestFields(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession({
+            ('GET', 'wp/v2/posts'): FakeResponse(data=[{'id': 1}]),
+            ('GET', 'wp/v2/tags/2'): FakeResponse(data={'id': 2}),
+        })
+        self.wp = WordPress('http://example.org/', session=self.session,
+                            api_url=FakeSession.api_url)
+
+    def test_list_posts_fields(self):
+        posts = self.wp.list_posts(fields=['id', 'modified'])
+        method, url, kwargs = self.session.requests[-1]
+
+        self.assertEqual(kwargs['params']['_fields'], 'id,modified')
+        self.assertNotIn('fields', kwargs['params'])
+        self.assertTrue(posts[0].is_partial)
+        self.assertEqual(len(self.session.requests), 1)
+
+    def test_partial_terms_are_not_cached(self):
+        self.wp.get_tag(2, fields=['id'])
+        self.assertTrue(self.wp.get_tag(2).is_partial is False)
+        self.assertEqual(len(self.session.requests), 2)
+
+    def test_embed(self):
+        self.wp.list_posts(embed=True)
+        method, url, kwargs = self.session.requests[-1]
+        self.assertEqual(kwargs['params']['_embed'], 1)
+
+        self.wp.list_posts()
+        method, url, kwargs = self.session.requests[-1]
+        self.assertNotIn('_embed', kwargs['params'])
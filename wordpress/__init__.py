@@ -1,8 +1,9 @@
 import logging
 from logging import NullHandler
 
+from .aio import AsyncWordPress  # NOQA F401
 from .api import WordPress  # NOQA F401
 
-__all__ = ['WordPress']
+__all__ = ['AsyncWordPress', 'WordPress']
 
 logging.getLogger(__name__).addHandler(NullHandler())
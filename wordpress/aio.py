@@ -0,0 +1,901 @@
+import asyncio
+import json
+from posixpath import join as urljoin
+from urllib.parse import urlsplit
+
+from ._meta import __project_link__, __project_name__, __version__
+from .api import MAX_PER_PAGE, _int_header, clean_params
+from .cache import DISCOVERY_CACHE, DiscoveryCache, TermCache
+from .coalesce import AsyncSingleFlight, request_key
+from .exceptions import DiscoveryError, RateLimited, ServerError
+from .models import (Category, Page, Post, PostRevision, PostStatus,
+                     ResultSet, Tag)
+from .retry import CircuitBreaker, RetryPolicy, http_error
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+def _query(params):
+    """
+    aiohttp only takes str, int and float query values.
+    """
+    return dict(
+        (k, ('true' if v else 'false') if isinstance(v, bool) else v)
+        for k, v in clean_params(params).items()
+    )
+
+
+class _PageIterator(object):
+    """
+    Iterates asynchronously over every item of a collection, one page at a
+    time. A class, as Python 3.5 has no async generators.
+    """
+
+    def __init__(self, list_method, filters):
+        self.list_method = list_method
+        self.filters = filters
+        self.page = filters.pop('page', 1)
+        filters.setdefault('pre_page', MAX_PER_PAGE)
+        self._items = iter(())
+        self._last = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            try:
+                return next(self._items)
+            except StopIteration:
+                pass
+
+            if self._last:
+                raise StopAsyncIteration
+
+            results = await self.list_method(page=self.page, **self.filters)
+            self._items = iter(results)
+
+            if results.total_pages is None:
+                # Without the pagination headers a short page is the last.
+                self._last = len(results) < self.filters['pre_page']
+            else:
+                self._last = self.page >= results.total_pages
+
+            self.page += 1
+
+
+class AsyncWordPress(object):
+
+    def __init__(self, url, verify_ssl=True, limit=100, limit_per_host=0,
+                 keep_alive=True, session=None, term_cache_size=1024,
+                 term_cache_ttl=None, api_url=None, discovery_cache=None,
+                 keep_raw=False, retry_policy=None, circuit_breaker=None,
+                 throttle=None, coalesce=True):
+        """
+        asyncio WordPress Library.
+
+        Every method is a coroutine counterpart of the same method on
+        wordpress.WordPress and returns the same models. Requires aiohttp.
+        Partial models can't await the rest of their fields, so reading a
+        field they weren't fetched with always raises MissingFieldError.
+
+        Arguments
+        ---------
+
+        url : str
+            The WordPress URL (ex https://example.org/).
+        verify_ssl : bool
+            Should we verify that the WordPress site is using a good SSL cert.
+        limit : int
+            Maximum number of open connections. Zero means no limit.
+        limit_per_host : int
+            Maximum number of open connections to a single host. Zero means
+            no limit.
+        keep_alive : bool
+            Should connections be reused between requests.
+        session : aiohttp.ClientSession
+            An existing session to send requests through. The client will not
+            close a session it did not create.
+        term_cache_size : int
+            Maximum number of categories, tags and post statuses each to keep
+            in memory. Zero disables the term cache.
+        term_cache_ttl : int/dict
+            Seconds a cached term stays fresh, either for every type or keyed
+            by `category`, `tag` and `status`.
+        api_url : str
+            The WP-API root (ex https://example.org/wp-json/), if known. When
+            it isn't given it is discovered on the first request.
+        discovery_cache : str/wordpress.cache.DiscoveryCache
+            A JSON file (or cache) to keep discovered API roots in between
+            processes. Roots are always remembered for the current process.
+        keep_raw : bool
+            Should models keep the raw JSON object they were parsed from, as
+            `_json`.
+        retry_policy : wordpress.retry.RetryPolicy
+            When to repeat failed requests. Its delays are awaited, its
+            `sleep` isn't used.
+        circuit_breaker : wordpress.retry.CircuitBreaker
+            Holds requests back after too many failures in a row. Pass False
+            to turn it off.
+        throttle : wordpress.throttle.Throttle
+            Limits the requests per second and the requests running at once,
+            across every task using the client. Its waits are awaited.
+        coalesce : bool
+            Should identical GET requests made at the same time by several
+            tasks be sent once, every task getting the same decoded result.
+        """
+        if session is None and aiohttp is None:
+            raise ImportError('AsyncWordPress requires aiohttp, install it '
+                              'with `pip install python-wp[async]`.')
+
+        self.site_url = url
+        self.url = api_url
+        self.verify_ssl = verify_ssl
+        self.version = 'v2'
+
+        self.headers = {
+            'User-Agent': '{0}/{1} +{2}'.format(
+                __project_name__,
+                __version__,
+                __project_link__
+            )
+        }
+
+        self._connector_options = {
+            'limit': limit,
+            'limit_per_host': limit_per_host,
+            'force_close': not keep_alive,
+        }
+
+        self._owns_session = session is None
+        self.session = session
+        self.keep_raw = keep_raw
+
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker()
+
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker or None
+        self.throttle = throttle
+        self._slots = None
+        self._discovery_lock = None
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+
+        self.term_cache = TermCache(maxsize=term_cache_size,
+                                    ttl=term_cache_ttl)
+
+        if (discovery_cache is not None and
+                not isinstance(discovery_cache, DiscoveryCache)):
+            discovery_cache = DiscoveryCache(discovery_cache)
+
+        self.discovery_cache = discovery_cache
+
+    async def close(self):
+        """
+        Close the connection pool.
+        """
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    # Private Methods
+
+    def _get_session(self):
+        """
+        Private function for creating the session inside the running loop.
+        """
+        if self.session is None:
+            connector = aiohttp.TCPConnector(**self._connector_options)
+            self.session = aiohttp.ClientSession(connector=connector)
+
+        return self.session
+
+    def _get_slots(self):
+        """
+        Private function for creating the semaphore capping the requests in
+        flight inside the running loop.
+        """
+        if self._slots is None and self.throttle is not None and \
+                self.throttle.max_in_flight is not None:
+            self._slots = asyncio.Semaphore(self.throttle.max_in_flight)
+
+        return self._slots
+
+    async def _throttled(self, method, url, **kwargs):
+        """
+        Private function for sending one request through the throttle.
+
+        Returns
+        -------
+
+        tuple
+            The status, the headers and the body (decoded data for a
+            success, the JSON or text of an error).
+        """
+        throttle = self.throttle
+        slots = self._get_slots()
+        status = headers = started = None
+
+        if slots is not None:
+            await slots.acquire()
+
+        try:
+            if throttle is not None:
+                wait = throttle.reserve()
+
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                started = throttle.clock()
+
+            async with self._get_session().request(
+                    method, url, headers=self.headers, ssl=self._ssl(),
+                    **kwargs) as resp:
+                status, headers = resp.status, resp.headers
+
+                if resp.status < 400:
+                    return status, headers, await resp.json()
+
+                text = await resp.text()
+
+                try:
+                    return status, headers, json.loads(text)
+                except ValueError:
+                    return status, headers, text
+        finally:
+            if slots is not None:
+                slots.release()
+
+            if throttle is not None and started is not None:
+                throttle.observe(started, status, headers)
+
+    def _get_discovery_lock(self):
+        """
+        Private function for creating the discovery lock inside the running
+        loop.
+        """
+        if self._discovery_lock is None:
+            self._discovery_lock = asyncio.Lock()
+
+        return self._discovery_lock
+
+    def _ssl(self):
+        # None keeps aiohttp's default certificate verification.
+        return None if self.verify_ssl else False
+
+    async def _discover(self):
+        """
+        Private function for finding the WP-API URL through the discovery
+        caches, only asking the site when no cache knows it.
+        """
+        api_url = DISCOVERY_CACHE.get(self.site_url)
+
+        if api_url is None and self.discovery_cache is not None:
+            api_url = self.discovery_cache.get(self.site_url)
+
+        if api_url is None:
+            api_url = await self._get_wp_api_url(self.site_url)
+
+            if self.discovery_cache is not None:
+                self.discovery_cache.set(self.site_url, api_url)
+
+        DISCOVERY_CACHE.set(self.site_url, api_url)
+
+        return api_url
+
+    async def _get_wp_api_url(self, url):
+        """
+        Private function for finding the WP-API URL.
+
+        Arguments
+        ---------
+
+        url : str
+            WordPress instance URL.
+        """
+        session = self._get_session()
+
+        async with session.head(url, headers=self.headers,
+                                ssl=self._ssl()) as resp:
+            # Search the Links for rel="https://api.w.org/".
+            wp_api_rel = resp.links.get('https://api.w.org/')
+
+        if wp_api_rel:
+            return str(wp_api_rel['url'])
+        else:
+            raise DiscoveryError(url)
+
+    async def _request(self, method, endpoint, **kwargs):
+        """
+        Private function for sending a request through the connection pool.
+
+        Arguments
+        ---------
+
+        method : str
+            HTTP method.
+        endpoint : str
+            WordPress endpoint.
+
+        Returns
+        -------
+
+        tuple
+            The decoded data and the response headers.
+        """
+        if self.url is None:
+            # Tasks asking at the same time wait for one discovery.
+            async with self._get_discovery_lock():
+                if self.url is None:
+                    self.url = await self._discover()
+
+        url = urljoin(self.url, 'wp', self.version, endpoint)
+        breaker = self.circuit_breaker
+        host = urlsplit(url).netloc
+        attempt = 0
+
+        while True:
+            if breaker is not None:
+                breaker.before(host)
+
+            try:
+                status, headers, body = await self._throttled(method, url,
+                                                              **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+                unhealthy = True
+            except (aiohttp.ClientError, asyncio.CancelledError):
+                # Says nothing about the host, ex. an invalid URL or a
+                # cancelled task: raised without a retry or a failure.
+                if breaker is not None:
+                    breaker.release(host)
+
+                raise
+            else:
+                if status < 400:
+                    if breaker is not None:
+                        breaker.success(host)
+
+                    return body, headers
+
+                error = http_error(status, body, url=url, headers=headers)
+                unhealthy = status >= 500
+
+            if breaker is not None:
+                if unhealthy:
+                    breaker.failure(host)
+                else:
+                    breaker.success(host)
+
+            if not self.retry_policy.should_retry(method, attempt, error):
+                raise error
+
+            await asyncio.sleep(self.retry_policy.delay(attempt, error))
+            attempt += 1
+
+    async def _get(self, endpoint, params={}):
+        data, headers = await self._get_json(endpoint, params)
+        return data
+
+    async def _get_json(self, endpoint, params):
+        """
+        Private function for making GET requests, sending identical requests
+        made at the same time once.
+
+        Returns
+        -------
+
+        tuple
+            The decoded data and the response headers, shared between the
+            callers of a coalesced request, so don't change them.
+        """
+        params = _query(params)
+
+        def fetch():
+            return self._request('GET', endpoint, params=params)
+
+        if self.single_flight is None:
+            return await fetch()
+
+        return await self.single_flight.do(request_key(endpoint, params),
+                                           fetch)
+
+    async def _post(self, endpoint, data={}, params={}):
+        data, headers = await self._request('POST', endpoint,
+                                            data=clean_params(data),
+                                            params=_query(params))
+        return data
+
+    async def _delete(self, endpoint, params={}):
+        data, headers = await self._request('DELETE', endpoint,
+                                            params=_query(params))
+        return data
+
+    async def _parse_posts(self, json_list, fields=None):
+        """
+        Private function for parsing posts after resolving their terms.
+
+        Post.parse can't await, so every category, tag and status is
+        resolved before it runs.
+        """
+        category_ids, tag_ids, status_slugs = Post.term_ids(json_list)
+
+        categories, tags, statuses = await asyncio.gather(
+            self.lookup_categories(category_ids),
+            self.lookup_tags(tag_ids),
+            self.lookup_post_statuses(status_slugs),
+        )
+
+        for lookup, ids, get in [(categories, category_ids, self.get_category),
+                                 (tags, tag_ids, self.get_tag),
+                                 (statuses, status_slugs,
+                                  self.get_post_status)]:
+            missing = [pk for pk in ids if pk not in lookup]
+            found = await asyncio.gather(*[get(pk) for pk in missing])
+            lookup.update(zip(missing, found))
+
+        return Post.parse_list(self, json_list, categories=categories,
+                               tags=tags, statuses=statuses, fields=fields)
+
+    async def _list(self, endpoint, model, params):
+        """
+        Private function for fetching one page of a collection.
+        """
+        data, headers = await self._get_json(endpoint, params)
+
+        fields = params.get('fields')
+
+        if model is Post:
+            results = await self._parse_posts(data, fields=fields)
+        else:
+            results = model.parse_list(self, data, fields=fields)
+
+        results.total = _int_header(headers, 'X-WP-Total')
+        results.total_pages = _int_header(headers, 'X-WP-TotalPages')
+
+        return results
+
+    def _iter_pages(self, list_method, filters):
+        """
+        Private function for walking every page of a collection.
+        """
+        return _PageIterator(list_method, filters)
+
+    async def _lookup_terms(self, kind, list_method, ids):
+        """
+        Private function for resolving term ids through the term cache,
+        fetching the misses with as few `include` requests as possible.
+        """
+        terms, missing = self.term_cache.get_many(kind, ids)
+        missing = sorted(missing)
+
+        chunks = [missing[i:i + MAX_PER_PAGE]
+                  for i in range(0, len(missing), MAX_PER_PAGE)]
+
+        pages = await asyncio.gather(*[
+            list_method(include=chunk, pre_page=len(chunk))
+            for chunk in chunks
+        ])
+
+        for page in pages:
+            for term in page:
+                terms[term.id] = self.term_cache.setdefault(kind, term.id,
+                                                            term)
+
+        return terms
+
+    async def fetch_all(self, endpoint, workers=4, retries=0, backoff=0.5,
+                        **filters):
+        """
+        Fetch every page of a collection concurrently.
+
+        See wordpress.WordPress.fetch_all.
+        """
+        list_methods = {
+            'posts': self.list_posts,
+            'categories': self.list_categories,
+            'tags': self.list_tags,
+        }
+
+        if endpoint not in list_methods:
+            raise ValueError("You can't fetch all {0}.".format(endpoint))
+
+        list_method = list_methods[endpoint]
+        semaphore = asyncio.Semaphore(workers)
+
+        filters.pop('page', None)
+        filters.setdefault('pre_page', MAX_PER_PAGE)
+
+        async def fetch(page):
+            attempt = 0
+
+            while True:
+                try:
+                    async with semaphore:
+                        return await list_method(page=page, **filters)
+                except (ServerError, RateLimited,
+                        aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if attempt >= retries:
+                        raise
+
+                    await asyncio.sleep(backoff * (2 ** attempt))
+                    attempt += 1
+
+        first = await fetch(1)
+
+        results = ResultSet()
+        results.extend(first)
+        results.total = first.total
+        results.total_pages = first.total_pages
+
+        if not first.total_pages or first.total_pages <= 1:
+            return results
+
+        pages = await asyncio.gather(*[
+            fetch(page) for page in range(2, first.total_pages + 1)
+        ])
+
+        for page in pages:
+            results.extend(page)
+
+        return results
+
+    # Post Methods
+
+    async def list_posts(self, context='view', page=1, pre_page=10,
+                         search=None, after=None, author=None,
+                         author_exclude=None, before=None, exclude=None,
+                         include=None, offset=None, order='desc',
+                         orderby='date', slug=None, status='publish',
+                         categories=None, cateogries_exclude=None, tags=None,
+                         tags_exclude=None, sticky=None, fields=None,
+                         embed=False, modified_after=None,
+                         modified_before=None):
+        """
+        Get a list of posts.
+
+        See wordpress.WordPress.list_posts.
+        """
+        if context not in ['view', 'embed', 'edit']:
+            raise ValueError('The context {0} is not allowed.'.format(context))
+
+        if after:
+            after = after.isoformat()
+
+        if before:
+            before = before.isoformat()
+
+        if modified_after:
+            modified_after = modified_after.isoformat()
+
+        if modified_before:
+            modified_before = modified_before.isoformat()
+
+        if order not in ['asc', 'desc']:
+            raise ValueError("You can't order {0}.".format(order))
+
+        if orderby not in ['date', 'relevance', 'id', 'include', 'title',
+                           'slug', 'modified']:
+            raise ValueError("You can't order by {0}.".format(orderby))
+
+        embed = 1 if embed else None
+
+        return await self._list('posts', Post, locals())
+
+    def iter_posts(self, **filters):
+        """
+        Asynchronously iterate over every post, one page at a time.
+
+        See wordpress.WordPress.iter_posts.
+        """
+        return self._iter_pages(self.list_posts, filters)
+
+    async def get_post(self, pk, context='view', password=None,
+                       fields=None, embed=False):
+        """
+        Retrieve a Post.
+
+        See wordpress.WordPress.get_post.
+        """
+        embed = 1 if embed else None
+
+        post = await self._get('posts/{0}'.format(pk), params=locals())
+
+        return (await self._parse_posts([post], fields=fields))[0]
+
+    async def create_post(self, **data):
+        """
+        Create a Post.
+
+        Takes the same arguments as wordpress.WordPress.create_post.
+        """
+        post = await self._post('posts', data=data)
+
+        return (await self._parse_posts([post]))[0]
+
+    async def update_post(self, pk, **data):
+        """
+        Update a Post.
+
+        Takes the same arguments as wordpress.WordPress.update_post.
+        """
+        post = await self._post('posts/{0}'.format(pk), data=data)
+
+        return (await self._parse_posts([post]))[0]
+
+    async def delete_post(self, pk, force=False):
+        """
+        Delete a Post.
+
+        See wordpress.WordPress.delete_post.
+        """
+        await self._delete('posts/{0}'.format(pk), params=locals())
+
+        return True
+
+    # Post Reivion Methods
+
+    async def list_post_revisions(self, parent, context='view',
+                                  fields=None):
+        """
+        List Post Revisions.
+
+        See wordpress.WordPress.list_post_revisions.
+        """
+        if isinstance(parent, Page) or isinstance(parent, Post):
+            parent = parent.id
+
+        resp = await self._get('posts/{0}/revisions'.format(parent),
+                               params={'context': context, 'fields': fields})
+
+        return PostRevision.parse_list(self, resp, fields=fields)
+
+    async def get_post_revision(self, parent, pk, context='view',
+                                fields=None):
+        """
+        Get a Post Revision.
+
+        See wordpress.WordPress.get_post_revision.
+        """
+        if isinstance(parent, Page) or isinstance(parent, Post):
+            parent = parent.id
+
+        resp = await self._get('posts/{0}/revisions/{1}'.format(parent, pk),
+                               params={'context': context, 'fields': fields})
+
+        return PostRevision.parse(self, resp, fields=fields)
+
+    async def delete_post_revision(self, parent, pk):
+        """
+        Delete Post Revision.
+
+        See wordpress.WordPress.delete_post_revision.
+        """
+        if isinstance(parent, Page) or isinstance(parent, Post):
+            parent = parent.id
+
+        resp = await self._delete('posts/{0}/revisions/{1}'.format(parent,
+                                                                   pk))
+
+        return PostRevision.parse(self, resp)
+
+    # Category Methods
+
+    async def list_categories(self, context='view', page=1, pre_page=10,
+                              search=None, exclude=None, include=None,
+                              order='asc', orderby='name', hide_empty=False,
+                              parent=None, post=None, slug=None,
+                              fields=None):
+        """
+        Get a list of categories.
+
+        See wordpress.WordPress.list_categories.
+        """
+        if context not in ['view', 'embed', 'edit']:
+            raise ValueError('The context {0} is not allowed.'.format(context))
+
+        if order not in ['asc', 'desc']:
+            raise ValueError('The order {0} is not allowed.'.format(order))
+
+        if orderby not in ['id', 'include', 'name', 'slug', 'term_group',
+                           'description', 'count']:
+            raise ValueError('The order by {0} is not '
+                             'allowed.'.format(orderby))
+
+        return await self._list('categories', Category, locals())
+
+    def iter_categories(self, **filters):
+        """
+        Asynchronously iterate over every category, one page at a time.
+
+        See wordpress.WordPress.iter_categories.
+        """
+        return self._iter_pages(self.list_categories, filters)
+
+    async def get_category(self, pk, context='view', fields=None):
+        """
+        Retrieve a Category.
+
+        See wordpress.WordPress.get_category.
+        """
+        if context not in ['view', 'embed', 'edit']:
+            raise ValueError('The context {0} is not allowed.'.format(context))
+
+        if context == 'view' and fields is None:
+            category = self.term_cache.get('category', pk)
+
+            if category is not None:
+                return category
+
+        category = Category.parse(
+            self, await self._get('categories/{0}'.format(pk),
+                                  params={'context': context,
+                                          'fields': fields}),
+            fields=fields)
+
+        if context == 'view' and fields is None:
+            category = self.term_cache.setdefault('category', pk, category)
+
+        return category
+
+    async def lookup_categories(self, ids):
+        """
+        Resolve category ids, fetching the ones not cached in bulk.
+
+        See wordpress.WordPress.lookup_categories.
+        """
+        return await self._lookup_terms('category', self.list_categories,
+                                        ids)
+
+    # Tag Methods
+
+    async def list_tags(self, context='view', page=1, pre_page=10,
+                        search=None, include=[], offset=0, order='asc',
+                        orderby='name', hide_empty=False, post=None,
+                        slug=None, fields=None):
+        """
+        Get a list of tags.
+
+        See wordpress.WordPress.list_tags.
+        """
+        if context not in ['view', 'embed', 'edit']:
+            raise ValueError('The context {0} is not allowed.'.format(context))
+
+        if order not in ['asc', 'desc']:
+            raise ValueError("You can't order {0}.".format(order))
+
+        if orderby not in ['id', 'include', 'name', 'slug', 'term_group',
+                           'description', 'count']:
+            raise ValueError("You can't order by {0}.".format(orderby))
+
+        return await self._list('tags', Tag, locals())
+
+    def iter_tags(self, **filters):
+        """
+        Asynchronously iterate over every tag, one page at a time.
+
+        See wordpress.WordPress.iter_tags.
+        """
+        return self._iter_pages(self.list_tags, filters)
+
+    async def get_tag(self, pk, context='view', fields=None):
+        """
+        Retrieve a Tag.
+
+        See wordpress.WordPress.get_tag.
+        """
+        if context not in ['view', 'embed', 'edit']:
+            raise ValueError('The context {0} is not allowed.'.format(context))
+
+        if context == 'view' and fields is None:
+            tag = self.term_cache.get('tag', pk)
+
+            if tag is not None:
+                return tag
+
+        tag = Tag.parse(self, await self._get('tags/{0}'.format(pk),
+                                              params={'context': context,
+                                                      'fields': fields}),
+                        fields=fields)
+
+        if context == 'view' and fields is None:
+            tag = self.term_cache.setdefault('tag', pk, tag)
+
+        return tag
+
+    async def lookup_tags(self, ids):
+        """
+        Resolve tag ids, fetching the ones not cached in bulk.
+
+        See wordpress.WordPress.lookup_tags.
+        """
+        return await self._lookup_terms('tag', self.list_tags, ids)
+
+    # Post Status Methods
+
+    async def list_post_statuses(self, context='view', fields=None):
+        """
+        Get a list of post statuses.
+
+        See wordpress.WordPress.list_post_statuses.
+        """
+        if context not in ['view', 'embed', 'edit']:
+            raise ValueError('The context {0} is not allowed.'.format(context))
+
+        post_status_list = await self._get('statuses',
+                                           params={'context': context,
+                                                   'fields': fields})
+
+        # The statuses endpoint returns an object keyed by the status slug.
+        if isinstance(post_status_list, dict):
+            post_status_list = list(post_status_list.values())
+
+        return PostStatus.parse_list(self, post_status_list, fields=fields)
+
+    async def get_post_status(self, slug, context='view', fields=None):
+        """
+        Retrieve a Post statuses
+
+        See wordpress.WordPress.get_post_status.
+        """
+        if context not in ['view', 'embed', 'edit']:
+            raise ValueError('The context {0} is not allowed.'.format(context))
+
+        if context == 'view' and fields is None:
+            post_status = self.term_cache.get('status', slug)
+
+            if post_status is not None:
+                return post_status
+
+        post_status = PostStatus.parse(
+            self, await self._get('statuses/{0}'.format(slug),
+                                  params={'context': context,
+                                          'fields': fields}),
+            fields=fields)
+
+        if context == 'view' and fields is None:
+            post_status = self.term_cache.setdefault('status', slug,
+                                                     post_status)
+
+        return post_status
+
+    async def lookup_post_statuses(self, slugs):
+        """
+        Resolve post status slugs, fetching every status if any is missing.
+
+        See wordpress.WordPress.lookup_post_statuses.
+        """
+        statuses, missing = self.term_cache.get_many('status', slugs)
+
+        if missing:
+            missing = set(missing)
+
+            for post_status in await self.list_post_statuses():
+                post_status = self.term_cache.setdefault(
+                    'status', post_status.slug, post_status)
+
+                if post_status.slug in missing:
+                    statuses[post_status.slug] = post_status
+
+        return statuses
+
+    # Setting Methods
+
+    async def update_setting(self, **settings):
+        """
+        Update WordPress settings.
+
+        Takes the same arguments as wordpress.WordPress.update_setting.
+        """
+        return await self._post('settings', params=settings)
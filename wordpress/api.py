@@ -1,17 +1,115 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from posixpath import join as urljoin
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ._meta import __project_link__, __project_name__, __version__
-from .models import Category, Page, Post, PostRevision, PostStatus, Tag
+from .cache import DISCOVERY_CACHE, DiscoveryCache, HTTPCache, TermCache
+from .coalesce import SingleFlight, request_key
+from .columns import ColumnSet
+from .exceptions import DiscoveryError, RateLimited, ServerError
+from .models import (Category, Model, Page, Post, PostRevision, PostStatus,
+                     ResultSet, Tag)
+from .retry import CircuitBreaker, RetryPolicy, http_error
+from .stats import RequestRecord, Stats
+from .stream import ResultStream
+from .sync import sync_posts
+from .tracing import NoopTracer
+
+# The WP REST API caps per_page at 100.
+MAX_PER_PAGE = 100
+
+# Failures worth fetching a page again for; anything else, ex. a 404 or a
+# bad argument, fails the same way every time.
+TRANSIENT_ERRORS = (ServerError, RateLimited, requests.ConnectionError,
+                    requests.Timeout)
+
+# Python argument names that differ from the WP REST API parameter names.
+PARAM_ALIASES = {
+    'pre_page': 'per_page',
+    'cateogries_exclude': 'categories_exclude',
+    'fields': '_fields',
+    'embed': '_embed',
+}
+
+
+def clean_params(params):
+    """
+    Turn the arguments of an endpoint method into WP REST API parameters.
+
+    Drops `self` and unset arguments, renames aliased arguments, replaces
+    models with their ids, and joins lists into comma separated strings.
+
+    Arguments
+    ---------
+
+    params : dict
+        The arguments, usually the `locals()` of the endpoint method.
+
+    Returns
+    -------
+
+    dict
+    """
+    cleaned = {}
+
+    for key, value in params.items():
+        if key == 'self' or value is None:
+            continue
+
+        if isinstance(value, Model):
+            value = value.id
+        elif isinstance(value, (list, tuple, set)):
+            if not value:
+                continue
+
+            value = ','.join(str(getattr(v, 'id', v)) for v in value)
+
+        cleaned[PARAM_ALIASES.get(key, key)] = value
+
+    return cleaned
+
+
+def _json_or_text(resp):
+    """
+    The decoded body of a response, or its text when it isn't JSON.
+    """
+    try:
+        return resp.json()
+    except ValueError:
+        return getattr(resp, 'text', None)
+
+
+def _int_header(headers, name):
+    """
+    Read an integer response header, or None when it is missing.
+    """
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
 class WordPress(object):
 
-    def __init__(self, url, verify_ssl=True):
+    def __init__(self, url, verify_ssl=True, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, keep_alive=True,
+                 session=None, term_cache_size=1024, term_cache_ttl=None,
+                 http_cache=None, api_url=None, discovery_cache=None,
+                 fetch_missing_fields=False, keep_raw=False, lazy=False,
+                 retry_policy=None, circuit_breaker=None, throttle=None,
+                 coalesce=True, hooks=None, tracer=None):
         """
         WordPress Library.
 
+        A client is safe to share between threads, see the Threads section of
+        the usage docs.
+
         Arguments
         ---------
 
@@ -19,8 +117,69 @@ class WordPress(object):
             The WordPress URL (ex https://example.org/).
         verify_ssl : bool
             Should we verify that the WordPress site is using a good SSL cert.
+        pool_connections : int
+            Number of per-host connection pools to keep around.
+        pool_maxsize : int
+            Maximum number of connections kept open to a single host.
+        pool_block : bool
+            Should we wait for a free connection when a host's pool is
+            exhausted instead of opening a throwaway one.
+        keep_alive : bool
+            Should connections be reused between requests.
+        session : requests.Session
+            An existing session to send requests through. The client will not
+            close a session it did not create.
+        term_cache_size : int
+            Maximum number of categories, tags and post statuses each to keep
+            in memory. Zero disables the term cache.
+        term_cache_ttl : int/dict
+            Seconds a cached term stays fresh, either for every type or keyed
+            by `category`, `tag` and `status`.
+        http_cache : str/wordpress.cache.HTTPCache
+            A directory (or cache) for storing GET responses, so unchanged
+            resources are revalidated with conditional requests instead of
+            downloaded again.
+        api_url : str
+            The WP-API root (ex https://example.org/wp-json/), if known. When
+            it isn't given it is discovered on the first request.
+        discovery_cache : str/wordpress.cache.DiscoveryCache
+            A JSON file (or cache) to keep discovered API roots in between
+            processes. Roots are always remembered for the current process.
+        fetch_missing_fields : bool
+            Should reading a field a partial model wasn't fetched with fetch
+            the complete object, instead of raising MissingFieldError.
+        keep_raw : bool
+            Should models keep the raw JSON object they were parsed from, as
+            `_json`.
+        lazy : bool
+            Should models convert their fields (dates, terms, embedded
+            objects) the first time they are read instead of when parsed.
+        retry_policy : wordpress.retry.RetryPolicy
+            When to repeat failed requests. Defaults to three retries of
+            idempotent requests with exponential backoff; pass
+            RetryPolicy(retries=0) to turn retrying off.
+        circuit_breaker : wordpress.retry.CircuitBreaker
+            Holds requests back after too many failures in a row. Defaults to
+            one per client; share one to pool the failures of several
+            clients, or pass False to turn it off.
+        throttle : wordpress.throttle.Throttle
+            Limits the requests per second and the requests running at once,
+            across every thread using the client.
+        coalesce : bool
+            Should identical GET requests made at the same time by several
+            threads be sent once, every thread getting the same decoded
+            result.
+        hooks : list
+            Callables given a wordpress.stats.RequestRecord after every call
+            to the API, ex. to feed a metrics pipeline.
+        tracer : wordpress.tracing.Tracer
+            Times discovery, every request, JSON decoding and model parsing as
+            nested spans. An OpenTelemetry tracer works too.
         """
-        self.url = self._get_wp_api_url(url)
+        self.site_url = url
+        self._url = api_url
+        self._discovery_lock = threading.Lock()
+        self.verify_ssl = verify_ssl
         self.version = 'v2'
 
         self.headers = {
@@ -31,8 +190,139 @@ class WordPress(object):
             )
         }
 
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+
+        self._owns_session = session is None
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections,
+                                  pool_maxsize=pool_maxsize,
+                                  pool_block=pool_block)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+
+        self.session = session
+        self.fetch_missing_fields = fetch_missing_fields
+        self.keep_raw = keep_raw
+        self.lazy = lazy
+
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker()
+
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker or None
+        self.throttle = throttle
+        self.single_flight = SingleFlight() if coalesce else None
+        self.hooks = list(hooks or [])
+        self._stats = Stats()
+        self.tracer = tracer if tracer is not None else NoopTracer()
+
+        # The batch size the server allows, read on the first batch.
+        self.batch_max_size = None
+
+        self.term_cache = TermCache(maxsize=term_cache_size,
+                                    ttl=term_cache_ttl)
+
+        if http_cache is not None and not isinstance(http_cache, HTTPCache):
+            http_cache = HTTPCache(http_cache)
+
+        self.http_cache = http_cache
+
+        if (discovery_cache is not None and
+                not isinstance(discovery_cache, DiscoveryCache)):
+            discovery_cache = DiscoveryCache(discovery_cache)
+
+        self.discovery_cache = discovery_cache
+
+    @property
+    def url(self):
+        """
+        The WP-API root, discovered on first use.
+        """
+        if self._url is None:
+            # Threads asking at the same time wait for one discovery.
+            with self._discovery_lock:
+                if self._url is None:
+                    self._url = self._discover()
+
+        return self._url
+
+    @url.setter
+    def url(self, value):
+        self._url = value
+
+    def close(self):
+        """
+        Close the connection pool.
+        """
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def stats(self, reset=False):
+        """
+        The totals of the calls made to the API so far, by method and
+        route, with a latency histogram each.
+
+        Arguments
+        ---------
+
+        reset : bool
+            Should the totals start over after this snapshot.
+
+        Returns
+        -------
+
+        dict
+            Keyed by method and route, ex. `GET posts/{id}`, see
+            wordpress.stats.EndpointStats.
+        """
+        snapshot = self._stats.snapshot()
+
+        if reset:
+            self._stats.reset()
+
+        return snapshot
+
     # Private Methods
 
+    def _discover(self):
+        """
+        Private function for finding the WP-API URL through the discovery
+        caches, only asking the site when no cache knows it.
+        """
+        with self.tracer.start_as_current_span(
+                'wordpress.discover',
+                attributes={'wordpress.site_url': self.site_url}) as span:
+            api_url = DISCOVERY_CACHE.get(self.site_url)
+
+            if api_url is None and self.discovery_cache is not None:
+                api_url = self.discovery_cache.get(self.site_url)
+
+            span.set_attribute('wordpress.discovery.cached',
+                               api_url is not None)
+
+            if api_url is None:
+                api_url = self._get_wp_api_url(self.site_url)
+
+                if self.discovery_cache is not None:
+                    self.discovery_cache.set(self.site_url, api_url)
+
+            DISCOVERY_CACHE.set(self.site_url, api_url)
+            span.set_attribute('wordpress.api_url', api_url)
+
+            return api_url
+
     def _get_wp_api_url(self, url):
         """
         Private function for finding the WP-API URL.
@@ -43,7 +333,12 @@ class WordPress(object):
         url : str
             WordPress instance URL.
         """
-        resp = requests.head(url)
+        with self.tracer.start_as_current_span(
+                'HTTP HEAD', attributes={'http.method': 'HEAD',
+                                         'http.url': url}) as span:
+            resp = self.session.head(url, headers=self.headers,
+                                     verify=self.verify_ssl)
+            span.set_attribute('http.status_code', resp.status_code)
 
         # Search the Links for rel="https://api.w.org/".
         wp_api_rel = resp.links.get('https://api.w.org/')
@@ -51,10 +346,234 @@ class WordPress(object):
         if wp_api_rel:
             return wp_api_rel['url']
         else:
-            # TODO: Rasie a better exception to the rel doesn't exist.
-            raise Exception
+            raise DiscoveryError(url)
+
+    def _request(self, method, endpoint, record=None, **kwargs):
+        """
+        Private function for sending a request through the connection pool.
+
+        Arguments
+        ---------
+
+        method : str
+            HTTP method.
+        endpoint : str
+            WordPress endpoint.
+        record : wordpress.stats.RequestRecord
+            Where to note the status, latency and size of the response.
+
+        Returns
+        -------
+
+        requests.Response
+        """
+        url = urljoin(self.url, 'wp', self.version, endpoint)
+        headers = self.headers
+        cache_key = entry = None
+
+        # Streamed bodies are read by the caller, they can't be cached.
+        if (method == 'GET' and self.http_cache is not None and
+                not kwargs.get('stream')):
+            cache_key = self.http_cache.key(url, kwargs.get('params'))
+            entry = self.http_cache.get(cache_key)
+
+            if entry is not None:
+                headers = dict(headers)
+                headers.update(self.http_cache.conditional_headers(entry))
 
-    def _get(self, endpoint, params={}):
+        resp = self._send(method, url, record=record, headers=headers,
+                          verify=self.verify_ssl, **kwargs)
+
+        if resp.status_code == 304 and entry is not None:
+            self.http_cache.record(hit=True)
+
+            if record is not None:
+                record.cached = True
+
+            return self.http_cache.response(entry)
+
+        if cache_key is not None and resp.status_code == 200:
+            self.http_cache.record(hit=False)
+            self.http_cache.set(cache_key, resp)
+
+        return resp
+
+    def _send(self, method, url, record=None, **kwargs):
+        """
+        Private function for sending a request, retrying it according to
+        the retry policy and going through the circuit breaker and the
+        throttle.
+
+        Returns
+        -------
+
+        requests.Response
+            A successful or 304 Not Modified response; errors are raised as
+            wordpress.exceptions.HTTPError.
+        """
+        host = urlsplit(url).netloc
+        attempt = 0
+        sent_at = time.perf_counter()
+
+        while True:
+            resp = None
+
+            if self.throttle is not None:
+                started = self.throttle.acquire()
+
+            try:
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.before(host)
+
+                with self.tracer.start_as_current_span(
+                        'HTTP {0}'.format(method),
+                        attributes={'http.method': method, 'http.url': url,
+                                    'net.peer.name': host}) as span:
+                    if attempt:
+                        span.set_attribute('http.resend_count', attempt)
+
+                    resp = self.session.request(method, url, **kwargs)
+                    span.set_attribute('http.status_code', resp.status_code)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                unhealthy = True
+            except requests.RequestException:
+                # Says nothing about the host, ex. an invalid URL, and fails
+                # the same way again: raised without a retry or a failure.
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.release(host)
+
+                raise
+            finally:
+                if self.throttle is not None:
+                    self.throttle.release(
+                        started, getattr(resp, 'status_code', None),
+                        getattr(resp, 'headers', None))
+
+            if record is not None:
+                record.attempts += 1
+                record.latency = time.perf_counter() - sent_at
+
+                if resp is not None:
+                    record.status = resp.status_code
+
+                    if not kwargs.get('stream'):
+                        record.bytes = len(resp.content)
+
+            if resp is not None:
+                if resp.status_code < 400:
+                    if self.circuit_breaker is not None:
+                        self.circuit_breaker.success(host)
+
+                    return resp
+
+                error = http_error(resp.status_code, _json_or_text(resp),
+                                   url=url, headers=resp.headers)
+                unhealthy = resp.status_code >= 500
+
+            if self.circuit_breaker is not None:
+                if unhealthy:
+                    self.circuit_breaker.failure(host)
+                else:
+                    self.circuit_breaker.success(host)
+
+            if not self.retry_policy.should_retry(method, attempt, error):
+                raise error
+
+            self.retry_policy.sleep(self.retry_policy.delay(attempt, error))
+            attempt += 1
+
+    @contextmanager
+    def _recording(self, record, finish=True):
+        """
+        Private function for handing a request record to the stats and the
+        hooks once the call it describes is over, and for tracing the call
+        as a span the stages are nested in.
+
+        Arguments
+        ---------
+
+        record : wordpress.stats.RequestRecord
+        finish : bool
+            Whether the call is over when the block ends. Streamed calls
+            finish the record themselves, unless the block fails.
+        """
+        with self.tracer.start_as_current_span(
+                '{0} {1}'.format(record.method, record.route),
+                attributes={'wordpress.endpoint': record.endpoint}) as span:
+            try:
+                yield record
+            except Exception as e:
+                record.error = e
+                finish = True
+                raise
+            finally:
+                if record.status is not None:
+                    span.set_attribute('http.status_code', record.status)
+
+                span.set_attribute('wordpress.attempts', record.attempts)
+                span.set_attribute('wordpress.cached', record.cached)
+                span.set_attribute('wordpress.coalesced', record.coalesced)
+
+                if finish:
+                    self._finish(record)
+
+    def _finish(self, record):
+        """
+        Private function for handing a request record to the stats and the
+        hooks.
+        """
+        self._stats(record)
+
+        for hook in self.hooks:
+            hook(record)
+
+    def _decode(self, resp, record):
+        """
+        Private function for decoding a JSON response, timed.
+        """
+        with self.tracer.start_as_current_span('wordpress.decode'):
+            start = time.perf_counter()
+            data = resp.json()
+            record.decode_time = time.perf_counter() - start
+
+        return data
+
+    def _parse(self, record, model, data, fields=None, many=False):
+        """
+        Private function for parsing the data of a response, timed.
+
+        Arguments
+        ---------
+
+        record : wordpress.stats.RequestRecord
+        model : wordpress.models.Model
+            The model to parse the data with, None returns it as it is.
+        data : dict/list
+        fields : list
+            The fields the data was fetched with, for partial models.
+        many : bool
+            Whether the data is a list of objects.
+        """
+        if model is None:
+            return data
+
+        with self.tracer.start_as_current_span(
+                'wordpress.parse',
+                attributes={'wordpress.model': model.__name__}) as span:
+            start = time.perf_counter()
+
+            if many:
+                result = model.parse_list(self, data, fields=fields)
+                span.set_attribute('wordpress.count', len(result))
+            else:
+                result = model.parse(self, data, fields=fields)
+
+            record.parse_time = time.perf_counter() - start
+
+        return result
+
+    def _get(self, endpoint, params={}, model=None, fields=None, many=False):
         """
         Private function for making GET requests.
 
@@ -65,25 +584,60 @@ class WordPress(object):
             WordPress endpoint.
         params : dict
             HTTP parameters when making the connection.
+        model : wordpress.models.Model
+            The model to parse the data with.
+        fields : list
+            The fields the data was fetched with, for partial models.
+        many : bool
+            Whether the endpoint returns a list of objects.
 
         Returns
         -------
 
-        dict/list
-            Returns the data from the endpoint.
+        dict/list/wordpress.models.Model
+            Returns the data from the endpoint, parsed when a model is
+            given.
         """
-        url = urljoin(self.url, 'wp', self.version, endpoint)
+        with self._recording(RequestRecord('GET', endpoint)) as record:
+            data, headers = self._get_json(endpoint, params, record)
 
-        resp = requests.get(url, params=params, headers=self.headers)
+            return self._parse(record, model, data, fields=fields, many=many)
 
-        if not resp.status_code == 200:
-            msg = ('WordPress REST API returned the status code '
-                   '{0}.'.format(resp.status_code))
-            raise Exception(msg)
+    def _get_json(self, endpoint, params, record):
+        """
+        Private function for making GET requests, sending identical requests
+        made at the same time once.
 
-        return resp.json()
+        Returns
+        -------
 
-    def _post(self, endpoint, data={}, params={}):
+        tuple
+            The decoded data and the response headers, shared between the
+            callers of a coalesced request, so don't change them.
+        """
+        params = clean_params(params)
+
+        def fetch():
+            resp = self._request('GET', endpoint, record=record,
+                                 params=params)
+            return self._decode(resp, record), resp.headers, resp.status_code
+
+        if self.single_flight is None:
+            return fetch()[:2]
+
+        start = time.perf_counter()
+        data, headers, status = self.single_flight.do(
+            request_key(endpoint, params), fetch)
+
+        if not record.attempts:
+            # Another thread's request answered this call.
+            record.coalesced = True
+            record.status = status
+            record.latency = time.perf_counter() - start
+
+        return data, headers
+
+    def _post(self, endpoint, data={}, params={}, model=None):
         """
         Private function for making POST requests.
 
@@ -96,53 +650,270 @@ class WordPress(object):
             Data to send.
         params : dict
             HTTP parameters to use when making the connection.
+        model : wordpress.models.Model
+            The model to parse the response with.
 
         Returns
         -------
 
-        dict/list
-            Returns the data from the endpoint.
+        dict/list/wordpress.models.Model
+            Returns the data from the endpoint, parsed when a model is
+            given.
         """
-        url = urljoin(self.url, 'wp', self.version, endpoint)
+        with self._recording(RequestRecord('POST', endpoint)) as record:
+            resp = self._request('POST', endpoint, record=record,
+                                 data=clean_params(data),
+                                 params=clean_params(params))
 
-        resp = requests.get(url, data=data, params=params,
-                            headers=self.headers)
+            return self._parse(record, model, self._decode(resp, record))
 
-        if not resp.status_code == 200:
-            msg = ('WordPress REST API returned the status code '
-                   '{0}.'.format(resp.status_code))
-            raise Exception(msg)
+    def _delete(self, endpoint, params={}, model=None):
+        """
+        Private function for making DELETE requests.
 
-        return resp.json()
+        Arguments
+        ---------
+
+        endpoint : str
+            WordPress endpoint.
+        params : dict
+            HTTP parameters when making the connection.
+        model : wordpress.models.Model
+            The model to parse the response with.
+
+        Returns
+        -------
 
-    def _delete(self, endpoint, params={}):
+        dict/list/wordpress.models.Model
+            Returns the data from the endpoint, parsed when a model is
+            given.
         """
-        Private function for making DELETE requests.
+        with self._recording(RequestRecord('DELETE', endpoint)) as record:
+            resp = self._request('DELETE', endpoint, record=record,
+                                 params=clean_params(params))
+
+            return self._parse(record, model, self._decode(resp, record))
+
+    def _lookup_terms(self, kind, list_method, ids):
+        """
+        Private function for resolving term ids through the term cache,
+        fetching the misses with as few `include` requests as possible.
+        """
+        terms, missing = self.term_cache.get_many(kind, ids)
+        missing = sorted(missing)
+
+        for i in range(0, len(missing), MAX_PER_PAGE):
+            chunk = missing[i:i + MAX_PER_PAGE]
+
+            for term in list_method(include=chunk, pre_page=len(chunk)):
+                terms[term.id] = self.term_cache.setdefault(kind, term.id,
+                                                            term)
+
+        return terms
+
+    def _list(self, endpoint, model, params, stream=False):
+        """
+        Private function for fetching one page of a collection.
 
         Arguments
         ---------
 
         endpoint : str
             WordPress endpoint.
+        model : wordpress.models.Model
+            The model to parse the items with.
         params : dict
             HTTP parameters when making the connection.
+        stream : bool
+            Should the items be parsed one at a time while the response
+            arrives.
 
         Returns
         -------
 
-        dict/list
-            Returns the data from the endpoint.
+        wordpress.models.ResultSet/wordpress.stream.ResultStream
+            The page, with `total` and `total_pages` read from the response
+            headers.
         """
-        url = urljoin(self.url, 'wp', self.version, endpoint)
+        if stream:
+            return self._stream(endpoint, model, params)
 
-        resp = requests.delete(url, params=params, headers=self.headers)
+        with self._recording(RequestRecord('GET', endpoint)) as record:
+            data, headers = self._get_json(endpoint, params, record)
 
-        if not resp.status_code == 200:
-            msg = ('WordPress REST API returned the status code '
-                   '{0}.'.foramt(resp.status_code))
-            raise Exception(msg)
+            results = self._parse(record, model, data,
+                                  fields=params.get('fields'), many=True)
+            results.total = _int_header(headers, 'X-WP-Total')
+            results.total_pages = _int_header(headers, 'X-WP-TotalPages')
 
-        return resp.json()
+            return results
+
+    def _stream(self, endpoint, model, params):
+        """
+        Private function for fetching one page of a collection as a
+        wordpress.stream.ResultStream. Streamed requests are neither cached
+        nor coalesced.
+        """
+        record = RequestRecord('GET', endpoint)
+
+        with self._recording(record, finish=False):
+            resp = self._request('GET', endpoint, record=record,
+                                 params=clean_params(params), stream=True)
+
+        results = ResultStream(self, resp, model, record,
+                               fields=params.get('fields'))
+        results.total = _int_header(resp.headers, 'X-WP-Total')
+        results.total_pages = _int_header(resp.headers, 'X-WP-TotalPages')
+
+        return results
+
+    def _iter_pages(self, list_method, filters):
+        """
+        Private function for walking every page of a collection.
+
+        Arguments
+        ---------
+
+        list_method : callable
+            The list_ method for the collection.
+        filters : dict
+            Arguments to pass to list_method.
+        """
+        page = filters.pop('page', 1)
+        filters.setdefault('pre_page', MAX_PER_PAGE)
+
+        while True:
+            results = list_method(page=page, **filters)
+            count = 0
+
+            for item in results:
+                count += 1
+                yield item
+
+            if results.total_pages is None:
+                # Without the pagination headers a short page is the last.
+                if count < filters['pre_page']:
+                    return
+            elif page >= results.total_pages:
+                return
+
+            page += 1
+
+    def _fetch_page(self, list_method, page, filters, retries, backoff):
+        """
+        Private function for fetching one page, retrying transient failures.
+        """
+        attempt = 0
+
+        while True:
+            try:
+                return list_method(page=page, **filters)
+            except TRANSIENT_ERRORS:
+                if attempt >= retries:
+                    raise
+
+                time.sleep(backoff * (2 ** attempt))
+                attempt += 1
+
+    def fetch_all(self, endpoint, workers=4, retries=0, backoff=0.5,
+                  **filters):
+        """
+        Fetch every page of a collection concurrently.
+
+        The first page is fetched to learn the number of pages, the rest are
+        fetched on a pool of worker threads. Give the client a `pool_maxsize`
+        of at least `workers` so every worker gets a kept-alive connection.
+
+        Arguments
+        ---------
+
+        endpoint : str
+            The collection to fetch.
+
+            One of: posts, categories, tags
+        workers : int
+            Maximum number of pages fetched at the same time.
+        retries : int
+            Number of times a page is fetched again after a server error, a
+            rate limit or a connection error, on top of the client's retry
+            policy, which already repeats each request. Other errors are
+            raised straight away.
+        backoff : float
+            Seconds to wait before the first retry, doubled on every retry.
+        filters
+            The arguments the collection's list_ method takes. `pre_page`
+            defaults to 100.
+
+        Returns
+        -------
+
+        wordpress.models.ResultSet
+            Every item in the collection, in page order. A
+            wordpress.columns.ColumnSet for posts fetched with `columnar`.
+        """
+        list_methods = {
+            'posts': self.list_posts,
+            'categories': self.list_categories,
+            'tags': self.list_tags,
+        }
+
+        if endpoint not in list_methods:
+            raise ValueError("You can't fetch all {0}.".format(endpoint))
+
+        list_method = list_methods[endpoint]
+
+        filters.pop('page', None)
+        filters.setdefault('pre_page', MAX_PER_PAGE)
+
+        first = self._fetch_page(list_method, 1, filters, retries, backoff)
+        pages = [first]
+
+        if first.total_pages and first.total_pages > 1:
+            def fetch(page):
+                return self._fetch_page(list_method, page, filters, retries,
+                                        backoff)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # map yields in submission order, whatever order pages
+                # finish.
+                pages.extend(executor.map(fetch,
+                                          range(2, first.total_pages + 1)))
+
+        if isinstance(first, ColumnSet):
+            results = ColumnSet.concat(pages)
+        else:
+            results = ResultSet()
+
+            for page in pages:
+                results.extend(page)
+
+        results.total = first.total
+        results.total_pages = first.total_pages
+
+        return results
+
+    def batch(self, max_size=None, validation='normal'):
+        """
+        Queue writes and send them through the batch endpoint.
+
+        Arguments
+        ---------
+
+        max_size : int
+            Operations per request. Defaults to the limit the server reports.
+        validation : str
+            `normal` or `require-all-valid`.
+
+        Returns
+        -------
+
+        wordpress.batch.Batch
+            Use it as a context manager to send the writes when the block
+            ends, or call its `execute`.
+        """
+        from .batch import Batch  # batch imports this module
+
+        return Batch(self, max_size=max_size, validation=validation)
 
     # Post Methods
 
@@ -151,7 +922,9 @@ class WordPress(object):
                    exclude=None, include=None, offset=None, order='desc',
                    orderby='date', slug=None, status='publish',
                    categories=None, cateogries_exclude=None, tags=None,
-                   tags_exclude=None, sticky=None):
+                   tags_exclude=None, sticky=None, fields=None, embed=False,
+                   columnar=False, modified_after=None, modified_before=None,
+                   stream=False):
         """
         Get a list of posts.
 
@@ -194,7 +967,7 @@ class WordPress(object):
         orderby : str
             Sort collection by object attribute.
             Default: date
-            One of: date, relevance, id, include, title, slug
+            One of: date, relevance, id, include, title, slug, modified
         slug : str
             Limit result set to posts with one or more specific slugs.
         status : str
@@ -218,6 +991,26 @@ class WordPress(object):
         sticky : bool
             Limit result set to items that are sticky.
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+        embed : bool
+            Embed the categories, tags, author and featured media in the
+            response instead of looking them up separately.
+        columnar : bool
+            Return the posts as a wordpress.columns.ColumnSet, built straight
+            from the response. Only the columns' fields are fetched unless
+            fields is given.
+        modified_after : datetime
+            Limit response to posts modified after a given date, in the
+            site's timezone.
+        modified_before : datetime
+            Limit response to posts modified before a given date, in the
+            site's timezone.
+        stream : bool
+            Parse the posts one at a time while the response arrives, so
+            only about one post is in memory at once. Returns a
+            wordpress.stream.ResultStream to iterate over once.
+
         Returns
         -------
 
@@ -233,18 +1026,74 @@ class WordPress(object):
         if before:
             before = before.isoformat()
 
+        if modified_after:
+            modified_after = modified_after.isoformat()
+
+        if modified_before:
+            modified_before = modified_before.isoformat()
+
         if order not in ['asc', 'desc']:
             raise ValueError("You can't order {0}.".format(order))
 
         if orderby not in ['date', 'relevance', 'id', 'include', 'title',
-                           'slug']:
+                           'slug', 'modified']:
             raise ValueError("You can't order by {0}.".format(orderby))
 
-        posts = self._get('posts', params=locals())
+        embed = 1 if embed else None
+
+        if columnar:
+            if stream:
+                raise ValueError("You can't stream columnar posts.")
+
+            fields = fields or ColumnSet.fields
 
-        return Post.parse_list(self, posts)
+        return self._list('posts', ColumnSet if columnar else Post,
+                          dict(locals(), columnar=None, stream=None),
+                          stream=stream)
 
-    def get_post(self, pk, context='view', password=None):
+    def iter_posts(self, **filters):
+        """
+        Iterate over every post, one page at a time.
+
+        Arguments
+        ---------
+
+        filters
+            The arguments list_posts takes. `pre_page` defaults to 100.
+
+        Returns
+        -------
+
+        generator
+            Yields wordpress.models.Post.
+        """
+        return self._iter_pages(self.list_posts, filters)
+
+    def sync_posts(self, state, detect_deletions=True, **filters):
+        """
+        Fetch the posts created, updated and deleted since the last sync.
+
+        Arguments
+        ---------
+
+        state : wordpress.sync.SyncState
+            Where the watermark and known post ids of each site are kept.
+        detect_deletions : bool
+            List every post id to find deleted posts.
+        filters
+            The arguments list_posts takes, other than the ordering and
+            paging ones.
+
+        Returns
+        -------
+
+        wordpress.sync.ChangeSet
+        """
+        return sync_posts(self, state, detect_deletions=detect_deletions,
+                          **filters)
+
+    def get_post(self, pk, context='view', password=None, fields=None,
+                 embed=False):
         """
         Retrieve a Post.
 
@@ -263,14 +1112,21 @@ class WordPress(object):
         password : str
             The password for the post if it is password protected.
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+        embed : bool
+            Embed the categories, tags, author and featured media in the
+            response instead of looking them up separately.
+
         Returns
         -------
 
         wordpress.models.Post
         """
-        post = self._get('posts/{0}'.format(pk), params=locals())
+        embed = 1 if embed else None
 
-        return Post.parse(self, post)
+        return self._get('posts/{0}'.format(pk), params=locals(), model=Post,
+                         fields=fields)
 
     def create_post(self, date=None, date_gmt=None, slug=None, status=None,
                     password=None, title=None, content=None, author=None,
@@ -333,9 +1189,7 @@ class WordPress(object):
         liveblog_likes : str
             The number of Liveblog Likes the post has.
         """
-        post = self._post('posts', data=locals())
-
-        return Post.parse(self, post)
+        return self._post('posts', data=locals(), model=Post)
 
     def update_post(self, pk, date=None, date_gmt=None, slug=None, status=None,
                     password=None, title=None, content=None, author=None,
@@ -400,9 +1254,7 @@ class WordPress(object):
         liveblog_likes : str
             The number of Liveblog Likes the post has.
         """
-        post = self._post('posts/{0}'.format(pk), data=locals())
-
-        return Post.parse(self, post)
+        return self._post('posts/{0}'.format(pk), data=locals(), model=Post)
 
     def delete_post(self, pk, force=False):
         """
@@ -416,16 +1268,13 @@ class WordPress(object):
         force : bool
             Whether to bypass trash and force deletion.
         """
-        resp = self._delete('posts/{0}'.format(pk), params=locals())
+        self._delete('posts/{0}'.format(pk), params=locals())
 
-        if resp.status_code == 200:
-            return True
-        else:
-            raise Exception(resp.json())
+        return True
 
     # Post Reivion Methods
 
-    def list_post_revisions(self, parent, context='view'):
+    def list_post_revisions(self, parent, context='view', fields=None):
         """
         List Post Revisions.
 
@@ -442,23 +1291,25 @@ class WordPress(object):
 
             One of: view
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+
         Returns
         -------
 
         list
             A list of wordpress.models.PostRevision.
         """
-        if type(parent) == int:
+        if isinstance(parent, int):
             parent_id = parent
-        elif type(parent) in [Page, Post]:
+        elif isinstance(parent, Page) or isinstance(parent, Post):
             parent_id = parent.id
 
-        resp = self._get('posts/{0}/revisions'.format(parent_id),
-                         params=locals())
-
-        return PostRevision.parse_list(self, resp.json())
+        return self._get('posts/{0}/revisions'.format(parent_id),
+                         params=locals(), model=PostRevision, fields=fields,
+                         many=True)
 
-    def get_post_revision(self, parent, pk, context='view'):
+    def get_post_revision(self, parent, pk, context='view', fields=None):
         """
         Get a Post Revision.
 
@@ -477,6 +1328,9 @@ class WordPress(object):
 
             One of: view
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+
         Returns
         -------
 
@@ -487,10 +1341,8 @@ class WordPress(object):
         elif isinstance(parent, Page) or isinstance(parent, Post):
             parent_id = parent.id
 
-        resp = self._get('posts/{0}/revisions/{1}'.format(parent_id, pk),
-                         params=locals())
-
-        return PostRevision.parse(self, resp.json())
+        return self._get('posts/{0}/revisions/{1}'.format(parent_id, pk),
+                         params=locals(), model=PostRevision, fields=fields)
 
     def delete_post_revision(self, parent, pk):
         """
@@ -514,16 +1366,15 @@ class WordPress(object):
         elif isinstance(parent, Page) or isinstance(parent, Post):
             parent_id = parent.id
 
-        resp = self._delete('posts/{0}/revisions/{1}'.format(parent_id, pk))
-
-        return PostRevision.parse(self, resp.json())
+        return self._delete('posts/{0}/revisions/{1}'.format(parent_id, pk),
+                            model=PostRevision)
 
     # Category Methods
 
     def list_categories(self, context='view', page=1, pre_page=10, search=None,
                         exclude=None, include=None, order='asc',
                         orderby='name', hide_empty=False, parent=None,
-                        post=None, slug=None):
+                        post=None, slug=None, fields=None, stream=False):
         """
         Get a list of categories.
 
@@ -576,6 +1427,12 @@ class WordPress(object):
         slug : str
             Limit result set to terms with a specific slug.
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+        stream : bool
+            Parse the categories one at a time while the response arrives.
+            Returns a wordpress.stream.ResultStream to iterate over once.
+
         Returns
         -------
 
@@ -593,21 +1450,28 @@ class WordPress(object):
             raise ValueError('The order by {0} is not '
                              'allowed.'.format(orderby))
 
-        if isinstance(parent, Category):
-            parent_id = Category.id
-        elif isinstance(parent, int):
-            parent_id = parent
+        return self._list('categories', Category, dict(locals(), stream=None),
+                          stream=stream)
 
-        if isinstance(post, Post):
-            post_id = Post.id
-        elif isinstance(post, int):
-            post_id = post
+    def iter_categories(self, **filters):
+        """
+        Iterate over every category, one page at a time.
 
-        category_list = self._get('categories', params=locals())
+        Arguments
+        ---------
 
-        return Category.parse_list(self, category_list)
+        filters
+            The arguments list_categories takes. `pre_page` defaults to 100.
 
-    def get_category(self, pk, context='view'):
+        Returns
+        -------
+
+        generator
+            Yields wordpress.models.Category.
+        """
+        return self._iter_pages(self.list_categories, filters)
+
+    def get_category(self, pk, context='view', fields=None):
         """
         Retrieve a Category.
 
@@ -624,6 +1488,9 @@ class WordPress(object):
 
             One of: view, embed, edit
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+
         Returns
         -------
 
@@ -632,15 +1499,44 @@ class WordPress(object):
         if context not in ['view', 'embed', 'edit']:
             raise ValueError('The context {0} is not allowed.'.format(context))
 
-        category = self._get('categories/{0}'.format(pk), params=locals())
+        if context == 'view' and fields is None:
+            category = self.term_cache.get('category', pk)
+
+            if category is not None:
+                return category
+
+        category = self._get('categories/{0}'.format(pk), params=locals(),
+                             model=Category, fields=fields)
+
+        if context == 'view' and fields is None:
+            category = self.term_cache.setdefault('category', pk, category)
+
+        return category
 
-        return Category.parse(self, category)
+    def lookup_categories(self, ids):
+        """
+        Resolve category ids, fetching the ones not cached in bulk.
+
+        Arguments
+        ---------
+
+        ids : list
+            The category ids.
+
+        Returns
+        -------
+
+        dict
+            wordpress.models.Category keyed by id.
+        """
+        return self._lookup_terms('category', self.list_categories, ids)
 
     # Tag Methods
 
     def list_tags(self, context='view', page=1, pre_page=10, search=None,
                   include=[], offset=0, order='asc', orderby='name',
-                  hide_empty=False, post=None, slug=None):
+                  hide_empty=False, post=None, slug=None, fields=None,
+                  stream=False):
         """
         Get a list of tags.
 
@@ -693,6 +1589,12 @@ class WordPress(object):
         slug : str
             Limit result set to terms with a specific slug.
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+        stream : bool
+            Parse the tags one at a time while the response arrives.
+            Returns a wordpress.stream.ResultStream to iterate over once.
+
         Returns
         -------
 
@@ -709,11 +1611,28 @@ class WordPress(object):
                            'description', 'count']:
             raise ValueError("You can't order by {0}.".format(orderby))
 
-        tag_list = self._get('tags', params=locals())
+        return self._list('tags', Tag, dict(locals(), stream=None),
+                          stream=stream)
+
+    def iter_tags(self, **filters):
+        """
+        Iterate over every tag, one page at a time.
+
+        Arguments
+        ---------
+
+        filters
+            The arguments list_tags takes. `pre_page` defaults to 100.
 
-        return Category.parse_list(self, tag_list)
+        Returns
+        -------
 
-    def get_tag(self, pk, context='view'):
+        generator
+            Yields wordpress.models.Tag.
+        """
+        return self._iter_pages(self.list_tags, filters)
+
+    def get_tag(self, pk, context='view', fields=None):
         """
         Retrieve a Tag.
 
@@ -730,6 +1649,9 @@ class WordPress(object):
 
             One of: view, embed, edit
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+
         Returns
         -------
 
@@ -738,9 +1660,37 @@ class WordPress(object):
         if context not in ['view', 'embed', 'edit']:
             raise ValueError('The context {0} is not allowed.'.format(context))
 
-        tag = self._get('tags/{0}'.format(pk), params=locals())
+        if context == 'view' and fields is None:
+            tag = self.term_cache.get('tag', pk)
+
+            if tag is not None:
+                return tag
+
+        tag = self._get('tags/{0}'.format(pk), params=locals(), model=Tag,
+                        fields=fields)
+
+        if context == 'view' and fields is None:
+            tag = self.term_cache.setdefault('tag', pk, tag)
+
+        return tag
+
+    def lookup_tags(self, ids):
+        """
+        Resolve tag ids, fetching the ones not cached in bulk.
+
+        Arguments
+        ---------
 
-        return Tag.parse(self, tag)
+        ids : list
+            The tag ids.
+
+        Returns
+        -------
+
+        dict
+            wordpress.models.Tag keyed by id.
+        """
+        return self._lookup_terms('tag', self.list_tags, ids)
 
     def create_tag(self, **kwargs):
         raise NotImplementedError
@@ -837,7 +1787,7 @@ class WordPress(object):
 
     # Post Status Methods
 
-    def list_post_statuses(self, context='view'):
+    def list_post_statuses(self, context='view', fields=None):
         """
         Get a list of post statuses.
 
@@ -852,6 +1802,9 @@ class WordPress(object):
 
             One of: view, embed, edit
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+
         Returns
         -------
 
@@ -861,11 +1814,10 @@ class WordPress(object):
         if context not in ['view', 'embed', 'edit']:
             raise ValueError('The context {0} is not allowed.'.format(context))
 
-        post_status_list = self._get('statuses', params=locals())
-
-        return PostStatus.parse_list(self, post_status_list)
+        return self._get('statuses', params=locals(), model=PostStatus,
+                         fields=fields, many=True)
 
-    def get_post_status(self, slug, context='view'):
+    def get_post_status(self, slug, context='view', fields=None):
         """
         Retrieve a Post statuses
 
@@ -882,6 +1834,9 @@ class WordPress(object):
 
             One of: view, embed, edit
 
+        fields : list
+            Only fetch these fields; the returned models are partial.
+
         Returns
         -------
 
@@ -890,7 +1845,54 @@ class WordPress(object):
         if context not in ['view', 'embed', 'edit']:
             raise ValueError('The context {0} is not allowed.'.format(context))
 
-        post_status = self._get('statuses/{0}'.format(slug), params=locals())
+        if context == 'view' and fields is None:
+            post_status = self.term_cache.get('status', slug)
+
+            if post_status is not None:
+                return post_status
+
+        post_status = self._get('statuses/{0}'.format(slug),
+                                params=locals(), model=PostStatus,
+                                fields=fields)
+
+        if context == 'view' and fields is None:
+            post_status = self.term_cache.setdefault('status', slug,
+                                                     post_status)
+
+        return post_status
+
+    def lookup_post_statuses(self, slugs):
+        """
+        Resolve post status slugs, fetching every status if any is missing.
+
+        Statuses the statuses listing does not return (ex. private statuses
+        for anonymous clients) are left out.
+
+        Arguments
+        ---------
+
+        slugs : list
+            The post status slugs.
+
+        Returns
+        -------
+
+        dict
+            wordpress.models.PostStatus keyed by slug.
+        """
+        statuses, missing = self.term_cache.get_many('status', slugs)
+
+        if missing:
+            missing = set(missing)
+
+            for post_status in self.list_post_statuses():
+                post_status = self.term_cache.setdefault(
+                    'status', post_status.slug, post_status)
+
+                if post_status.slug in missing:
+                    statuses[post_status.slug] = post_status
+
+        return statuses
 
     # Setting Methods
 
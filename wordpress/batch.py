@@ -0,0 +1,379 @@
+import inspect
+from datetime import date
+from posixpath import join as urljoin
+
+from .api import clean_params
+from .exceptions import BatchError, HTTPError, NotFound
+from .models import Post
+from .stats import RequestRecord
+
+# The batch size WordPress allows unless a plugin changes it.
+DEFAULT_MAX_SIZE = 25
+
+
+def _json_params(params):
+    """clean_params, with dates as ISO 8601 strings for a JSON body."""
+    params = clean_params(params)
+
+    for key, value in params.items():
+        if isinstance(value, date):
+            params[key] = value.isoformat()
+
+    return params
+
+
+class BatchOperation(object):
+    """
+    One write of a batch.
+
+    Attributes
+    ----------
+
+    method : str
+        HTTP method.
+    path : str
+        The route, ex. `/wp/v2/posts/1`.
+    body : dict
+        The JSON body.
+    status : int
+        The HTTP status of the operation once the batch ran.
+    error : wordpress.exceptions.BatchError
+        Set when the operation failed.
+    """
+
+    def __init__(self, method, path, body=None, model=None):
+        self.method = method
+        self.path = path
+        self.body = body
+        self.model = model
+        self.status = None
+        self.error = None
+        self._result = None
+
+    @property
+    def done(self):
+        """Whether the operation ran, successfully or not."""
+        return self.status is not None or self.error is not None
+
+    @property
+    def result(self):
+        """
+        What the single request method would have returned, ex. a
+        wordpress.models.Post. Raises the operation's error if it failed.
+        """
+        if self.error is not None:
+            raise self.error
+
+        if not self.done:
+            raise BatchError(None)
+
+        return self._result
+
+    def request(self):
+        """The operation as an item of a batch request."""
+        request = {'method': self.method, 'path': self.path}
+
+        if self.body:
+            request['body'] = self.body
+
+        return request
+
+    def __repr__(self):
+        return '{0}({1} {2})'.format(self.__class__.__name__, self.method,
+                                     self.path)
+
+
+class Batch(object):
+    """
+    Writes sent through the WP REST API batch endpoint (`/batch/v1`).
+
+    Operations are queued and sent when the batch is executed, or when the
+    `with` block ends without an error, packed into as few requests as the
+    server's batch size allows. A batch the server rejects as too large is
+    split in two and retried. Sites without the batch endpoint (WordPress
+    before 5.6) get one request per operation.
+
+    Arguments
+    ---------
+
+    api : wordpress.WordPress
+    max_size : int
+        Operations per request. Defaults to the limit the server reports.
+    validation : str
+        `normal` runs every valid operation, `require-all-valid` runs none
+        of a request's operations unless all of them are valid.
+    """
+
+    def __init__(self, api, max_size=None, validation='normal'):
+        if validation not in ['normal', 'require-all-valid']:
+            raise ValueError("You can't validate with {0}.".format(validation))
+
+        self.api = api
+        self.max_size = max_size
+        self.validation = validation
+        self.operations = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+
+    def __len__(self):
+        return len(self.operations)
+
+    def _route(self, endpoint):
+        return '/wp/{0}/{1}'.format(self.api.version, endpoint)
+
+    def add(self, method, endpoint, body=None, model=None):
+        """
+        Queue a write to any endpoint.
+
+        Arguments
+        ---------
+
+        method : str
+            POST, PUT, PATCH or DELETE.
+        endpoint : str
+            WordPress endpoint, ex. `posts/1`.
+        body : dict
+            The arguments of the write.
+        model : wordpress.models.Model
+            The model to parse the result with.
+
+        Returns
+        -------
+
+        wordpress.batch.BatchOperation
+        """
+        if method not in ['POST', 'PUT', 'PATCH', 'DELETE']:
+            raise ValueError("You can't batch {0} requests.".format(method))
+
+        operation = BatchOperation(method, self._route(endpoint),
+                                   body=_json_params(body or {}),
+                                   model=model)
+        self.operations.append(operation)
+
+        return operation
+
+    def _bind(self, name, *args, **kwargs):
+        """The arguments of a client method, checked against it."""
+        method = getattr(type(self.api), name)
+        bound = inspect.signature(method).bind(self.api, *args, **kwargs)
+        bound.apply_defaults()
+
+        return bound.arguments
+
+    def create_post(self, **kwargs):
+        """
+        Queue a post creation, takes the arguments of
+        wordpress.WordPress.create_post.
+        """
+        body = self._bind('create_post', **kwargs)
+
+        return self.add('POST', 'posts', body, model=Post)
+
+    def update_post(self, pk, **kwargs):
+        """
+        Queue a post update, takes the arguments of
+        wordpress.WordPress.update_post.
+        """
+        body = self._bind('update_post', pk, **kwargs)
+        body.pop('pk')
+
+        return self.add('POST', 'posts/{0}'.format(pk), body, model=Post)
+
+    def delete_post(self, pk, force=False):
+        """
+        Queue a post deletion.
+        """
+        operation = self.add('DELETE', 'posts/{0}'.format(pk))
+
+        if force:
+            operation.path += '?force=true'
+
+        return operation
+
+    def _discover_max_size(self):
+        """
+        The batch size the server allows, from the batch endpoint's schema.
+        Zero when the site has no batch endpoint.
+        """
+        if self.api.batch_max_size is not None:
+            return self.api.batch_max_size
+
+        try:
+            status, schema = self._request('OPTIONS', 'batch/v1')
+        except NotFound:
+            max_size = 0
+        else:
+            try:
+                args = schema['endpoints'][0]['args']
+                max_size = int(args['requests']['maxItems'])
+            except (KeyError, IndexError, TypeError, ValueError):
+                max_size = DEFAULT_MAX_SIZE
+
+        self.api.batch_max_size = max_size
+
+        return max_size
+
+    def execute(self):
+        """
+        Send the queued operations.
+
+        Failed operations don't raise, their `error` is set instead.
+
+        Returns
+        -------
+
+        list
+            The wordpress.batch.BatchOperation, in the order they were
+            queued.
+        """
+        pending = [op for op in self.operations if not op.done]
+        queue = list(pending)
+
+        if not (self.max_size or self._discover_max_size()):
+            for operation in queue:
+                self._send_one(operation)
+
+            queue = []
+
+        while queue:
+            # Read every time, a rejected batch lowers it.
+            max_size = self.max_size or self.api.batch_max_size
+            self._send(queue[:max_size])
+            queue = queue[max_size:]
+
+        self._parse([op for op in pending if op.model is not None])
+
+        return self.operations
+
+    def _request(self, method, path, **kwargs):
+        """
+        Private function for sending a request through the client, so it is
+        throttled, retried (POST never is, by default), counted in the stats
+        and traced like the client's own.
+
+        Returns
+        -------
+
+        tuple
+            The status and the decoded body, or the text when it isn't
+            JSON. Error responses are raised as
+            wordpress.exceptions.HTTPError.
+        """
+        path, _, query = path.partition('?')
+        url = urljoin(self.api.url, path)
+
+        if query:
+            url += '?' + query
+
+        with self.api._recording(RequestRecord(method, path)) as record:
+            resp = self.api._send(method, url, record=record,
+                                  headers=self.api.headers,
+                                  verify=self.api.verify_ssl, **kwargs)
+
+            try:
+                return resp.status_code, self.api._decode(resp, record)
+            except ValueError:
+                return resp.status_code, getattr(resp, 'text', None)
+
+    def _send(self, operations):
+        """
+        Private function for sending one batch request.
+        """
+        try:
+            status, data = self._request(
+                'POST', 'batch/v1',
+                json={'validation': self.validation,
+                      'requests': [op.request() for op in operations]})
+        except HTTPError as e:
+            error = e
+        else:
+            error = None
+
+        if _too_large(error) and len(operations) > 1:
+            # Remember the smaller size and split.
+            half = len(operations) // 2
+            self.api.batch_max_size = half
+
+            if self.max_size:
+                self.max_size = half
+
+            self._send(operations[:half])
+            self._send(operations[half:])
+            return
+
+        if error is not None:
+            error = BatchError(error.status, error.body)
+
+            for operation in operations:
+                operation.error = error
+
+            return
+
+        responses = data.get('responses') or []
+
+        for operation, response in zip(operations, responses):
+            if not response:
+                # Valid, but not run because another operation was invalid.
+                operation.error = BatchError(None)
+                continue
+
+            operation.status = response.get('status')
+            body = response.get('body')
+
+            if operation.status is None or operation.status >= 400:
+                operation.error = BatchError(operation.status, body)
+            else:
+                operation._result = body
+
+        for operation in operations[len(responses):]:
+            operation.error = BatchError(None)
+
+    def _send_one(self, operation):
+        """
+        Private function for sending an operation on its own.
+        """
+        try:
+            operation.status, operation._result = self._request(
+                operation.method, operation.path.lstrip('/'),
+                json=operation.body or None)
+        except HTTPError as e:
+            operation.status = e.status
+            operation.error = BatchError(e.status, e.body)
+
+    def _parse(self, operations):
+        """
+        Private function for turning successful results into models, a
+        model class at a time so their terms are looked up together.
+        """
+        by_model = {}
+
+        for operation in operations:
+            if operation.error is None and operation._result:
+                by_model.setdefault(operation.model, []).append(operation)
+
+        for model, group in by_model.items():
+            parsed = model.parse_list(self.api,
+                                      [op._result for op in group])
+
+            for operation, obj in zip(group, parsed):
+                operation._result = obj
+
+        for operation in self.operations:
+            if operation.method == 'DELETE' and operation.error is None:
+                operation._result = True
+
+
+def _too_large(error):
+    """Whether the server rejected a batch for having too many requests."""
+    if error is None or error.status != 400:
+        return False
+
+    body = error.body if isinstance(error.body, dict) else {}
+    params = (body.get('data') or {}).get('params') or {}
+
+    return body.get('code') == 'rest_invalid_param' and 'requests' in params
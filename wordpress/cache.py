@@ -0,0 +1,412 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from requests.structures import CaseInsensitiveDict
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    """
+    A bounded least recently used cache with an optional time to live.
+
+    The cache is safe to share between threads.
+
+    Arguments
+    ---------
+
+    maxsize : int
+        Maximum number of entries to keep. Zero disables the cache.
+    ttl : float
+        Seconds an entry stays fresh. None keeps entries until evicted.
+    clock : callable
+        Returns the current time in seconds.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or stale."""
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if expires is not None and expires <= self.clock():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry."""
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        """Private function for storing an entry, with the lock held."""
+        expires = None
+
+        if self.ttl is not None:
+            expires = self.clock() + self.ttl
+
+        self._data[key] = (value, expires)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def setdefault(self, key, value):
+        """
+        Store value under key unless a fresh value is already cached.
+
+        Returns
+        -------
+
+        object
+            The cached value, so threads racing to store the same key all
+            end up with the first one stored.
+        """
+        if self.maxsize <= 0:
+            return value
+
+        with self._lock:
+            cached = self._data.get(key)
+
+            if cached is not None and (cached[1] is None or
+                                       cached[1] > self.clock()):
+                self._data.move_to_end(key)
+                return cached[0]
+
+            self._store(key, value)
+
+        return value
+
+    def invalidate(self, key):
+        """Drop key from the cache."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TermCache(object):
+    """
+    An identity map of categories, tags and post statuses.
+
+    Repeated lookups of the same id resolve to the same model instance until
+    the entry expires, is evicted or is invalidated.
+
+    Arguments
+    ---------
+
+    maxsize : int
+        Maximum number of entries per type.
+    ttl : float/dict
+        Seconds an entry stays fresh, either for every type or keyed by type.
+    """
+
+    kinds = ['category', 'tag', 'status']
+
+    default_ttl = {
+        'category': 300,
+        'tag': 300,
+        'status': 3600,
+    }
+
+    def __init__(self, maxsize=1024, ttl=None):
+        if ttl is None:
+            ttl = self.default_ttl
+
+        if not isinstance(ttl, dict):
+            ttl = dict((kind, ttl) for kind in self.kinds)
+
+        self.caches = dict(
+            (kind, LRUCache(maxsize=maxsize, ttl=ttl.get(kind)))
+            for kind in self.kinds
+        )
+
+    def get(self, kind, key):
+        return self.caches[kind].get(key)
+
+    def set(self, kind, key, value):
+        self.caches[kind].set(key, value)
+
+    def setdefault(self, kind, key, value):
+        return self.caches[kind].setdefault(key, value)
+
+    def get_many(self, kind, keys):
+        """
+        Look up several keys at once.
+
+        Returns
+        -------
+
+        tuple
+            A dict of the cached values by key and a list of the missing keys.
+        """
+        found = {}
+        missing = []
+
+        for key in keys:
+            value = self.caches[kind].get(key)
+
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        return found, missing
+
+    def invalidate(self, kind=None, key=None):
+        """
+        Invalidate one entry, every entry of a type, or the whole cache.
+        """
+        if kind is None:
+            for cache in self.caches.values():
+                cache.clear()
+        elif key is None:
+            self.caches[kind].clear()
+        else:
+            self.caches[kind].invalidate(key)
+
+    def stats(self):
+        """
+        Hit and miss counters per type.
+
+        Returns
+        -------
+
+        dict
+            wordpress.cache.CacheInfo keyed by type.
+        """
+        return dict((kind, cache.info())
+                    for kind, cache in self.caches.items())
+
+
+class CachedResponse(object):
+    """
+    A response replayed from the HTTP cache after a 304 Not Modified.
+    """
+
+    status_code = 200
+
+    def __init__(self, text, headers):
+        self.text = text
+        self.headers = CaseInsensitiveDict(headers)
+        self.links = {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class HTTPCache(object):
+    """
+    An on-disk cache of GET responses and their validators.
+
+    Responses that come with an ETag or Last-Modified header are stored, so
+    the next request for the same URL and parameters can be made
+    conditional and a 304 Not Modified served from disk.
+
+    The cache is safe to share between threads: entries are written to a
+    temporary file and renamed, so readers see the old or the new entry.
+
+    Arguments
+    ---------
+
+    directory : str
+        Where to keep the cached responses. Created if missing.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, url, params=None):
+        """
+        The cache key of a GET request.
+        """
+        params = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([url, params])
+
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, '{0}.json'.format(key))
+
+    def get(self, key):
+        """
+        The stored entry for key, or None.
+
+        Returns
+        -------
+
+        dict
+            With the `text` of the body, the response `headers`, and the
+            `etag` and `last_modified` validators.
+        """
+        try:
+            with open(self._path(key), 'r') as fobj:
+                return json.loads(fobj.read())
+        except (IOError, OSError, ValueError):
+            return None
+
+    def set(self, key, resp):
+        """
+        Store a response if it carries a validator.
+        """
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': dict(resp.headers),
+            'text': resp.text,
+        }
+
+        # Write to a temporary file first so readers never see half a file.
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+
+        with os.fdopen(fd, 'w') as fobj:
+            fobj.write(json.dumps(entry))
+
+        os.replace(tmp, self._path(key))
+
+    def record(self, hit):
+        """Count a response served from the cache, or a miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def conditional_headers(self, entry):
+        """
+        The If-None-Match and If-Modified-Since headers for an entry.
+        """
+        headers = {}
+
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        return headers
+
+    def response(self, entry):
+        """
+        Replay an entry as a response.
+        """
+        return CachedResponse(entry['text'], entry['headers'])
+
+    def invalidate(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove every stored response."""
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.directory, name))
+
+
+class DiscoveryCache(object):
+    """
+    Remembers the WP-API root of each WordPress site.
+
+    Arguments
+    ---------
+
+    path : str
+        A JSON file to also keep the roots in, so they survive the process.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._roots = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """The API root of the site at url, or None."""
+        with self._lock:
+            if url not in self._roots and self.path:
+                self._roots.update(self._load())
+
+            return self._roots.get(url)
+
+    def set(self, url, api_url):
+        """Remember the API root of the site at url."""
+        with self._lock:
+            self._roots[url] = api_url
+
+            if self.path:
+                roots = self._load()
+                roots[url] = api_url
+
+                directory = os.path.dirname(os.path.abspath(self.path))
+                fd, tmp = tempfile.mkstemp(dir=directory)
+
+                with os.fdopen(fd, 'w') as fobj:
+                    fobj.write(json.dumps(roots))
+
+                os.replace(tmp, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as fobj:
+                return json.loads(fobj.read())
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def clear(self):
+        """Forget every API root, in memory only."""
+        with self._lock:
+            self._roots.clear()
+
+
+# API roots discovered by every client in this process.
+DISCOVERY_CACHE = DiscoveryCache()
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+def request_key(endpoint, params):
+    """
+    The key identical GET requests share, None when the parameters can't be
+    hashed.
+
+    Arguments
+    ---------
+
+    endpoint : str
+        WordPress endpoint.
+    params : dict
+        The WP REST API parameters, as clean_params returns them.
+    """
+    key = (endpoint, tuple(sorted(params.items())))
+
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+class SingleFlight(object):
+    """
+    Runs a call once for every thread asking for the same key at the same
+    time.
+
+    The first thread to ask runs the call, the others wait for it and get
+    the same result, or the same exception. Once the call returned, the next
+    thread to ask runs it again: results aren't cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def __len__(self):
+        """The number of calls in flight."""
+        return len(self._calls)
+
+    def do(self, key, func):
+        """
+        Run func, or wait for the call already running for key.
+
+        Arguments
+        ---------
+
+        key : hashable
+            None always runs func.
+        func : callable
+            Takes no arguments.
+        """
+        if key is None:
+            return func()
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return result
+
+
+class AsyncSingleFlight(object):
+    """
+    Runs a coroutine once for every task asking for the same key at the same
+    time, see wordpress.coalesce.SingleFlight.
+
+    The call runs in its own task, so a waiting task being cancelled, the
+    first one included, doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    def __len__(self):
+        """The number of calls in flight."""
+        return len(self._calls)
+
+    async def do(self, key, func):
+        """
+        Await func(), or the call already running for key.
+
+        Arguments
+        ---------
+
+        key : hashable
+            None always awaits func().
+        func : callable
+            Takes no arguments and returns an awaitable.
+        """
+        if key is None:
+            return await func()
+
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._run(key, func))
+            self._calls[key] = task
+
+        return await asyncio.shield(task)
+
+    async def _run(self, key, func):
+        try:
+            return await func()
+        finally:
+            # Before the result is set, so a task asking once it is ready
+            # runs the call again instead of getting the old result.
+            del self._calls[key]
@@ -0,0 +1,529 @@
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from .utils import parse_iso8601_columns
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Stored dates are microseconds since the epoch, unset dates are the
+# smallest int64, which NumPy reads as NaT.
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NOT_A_TIME = -2 ** 63
+
+INT_COLUMNS = ('id', 'author', 'featured_media')
+DATE_COLUMNS = ('date', 'date_gmt', 'modified', 'modified_gmt')
+LABEL_COLUMNS = ('status', 'type')
+TERM_COLUMNS = ('categories', 'tags')
+
+
+def _to_micros(value):
+    """A datetime as microseconds since the epoch, naive dates as UTC."""
+    if value is None:
+        return NOT_A_TIME
+
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return (value - EPOCH) // MICROSECOND
+
+
+def _from_micros(value):
+    if value == NOT_A_TIME:
+        return None
+
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def _ints(values, typecode='q'):
+    """An int64 (or int32 for 'i') array of values."""
+    if numpy is not None:
+        dtype = numpy.int64 if typecode == 'q' else numpy.int32
+        return numpy.fromiter(values, dtype=dtype)
+
+    return array(typecode, values)
+
+
+def _concat(parts, typecode='q'):
+    """Join arrays end to end."""
+    if numpy is not None and parts:
+        return numpy.concatenate(parts)
+
+    return _ints((value for part in parts for value in part), typecode)
+
+
+def _id(value):
+    """The id of a model, or the value itself."""
+    return getattr(value, 'id', value)
+
+
+class ColumnSet(object):
+    """
+    A page (or collection) of posts stored column by column.
+
+    Ids, author ids, dates, statuses and term ids are kept in typed arrays,
+    NumPy arrays when NumPy is installed and `array.array` otherwise, so
+    filtering, sorting and counting don't touch a Python object per post.
+
+    Dates are stored as microseconds since the epoch (naive dates as UTC),
+    statuses and types as codes into a list of labels, and categories and
+    tags as offsets into one array of term ids.
+
+    Attributes
+    ----------
+
+    total : int
+        Total number of posts in the collection, when known.
+    total_pages : int
+        Total number of pages in the collection, when known.
+    """
+
+    # The fields a columnar listing asks the REST API for.
+    fields = INT_COLUMNS + DATE_COLUMNS + LABEL_COLUMNS + TERM_COLUMNS
+
+    def __init__(self, length=0, data=None, labels=None):
+        self.length = length
+        self.data = data or {}
+        self.labels = labels or {}
+        self.total = None
+        self.total_pages = None
+
+    @classmethod
+    def from_json(cls, json_list):
+        """
+        Build the columns straight from a list of JSON posts.
+
+        Arguments
+        ---------
+
+        json_list : list
+        """
+        json_list = [obj for obj in json_list if obj]
+
+        columns = cls(len(json_list))
+
+        for name in INT_COLUMNS:
+            columns.data[name] = _ints(obj.get(name) or 0
+                                       for obj in json_list)
+
+        dates = parse_iso8601_columns(json_list, DATE_COLUMNS)
+        micros = {}
+
+        for name in DATE_COLUMNS:
+            values = []
+
+            for value in dates[name]:
+                try:
+                    values.append(micros[value])
+                except KeyError:
+                    values.append(micros.setdefault(value, _to_micros(value)))
+
+            columns.data[name] = _ints(values)
+
+        for name in LABEL_COLUMNS:
+            columns._encode(name, [obj.get(name) for obj in json_list])
+
+        for name in TERM_COLUMNS:
+            columns._set_terms(name, [obj.get(name) or []
+                                      for obj in json_list])
+
+        return columns
+
+    @classmethod
+    def from_models(cls, models):
+        """
+        Build the columns from a list of wordpress.models.Post.
+
+        Arguments
+        ---------
+
+        models : list
+        """
+        # Only the fields that are set: partial models aren't fetched.
+        rows = [dict(obj._items()) for obj in models]
+        columns = cls(len(rows))
+
+        for name in INT_COLUMNS:
+            columns.data[name] = _ints(_id(row.get(name)) or 0
+                                       for row in rows)
+
+        for name in DATE_COLUMNS:
+            columns.data[name] = _ints(_to_micros(row.get(name))
+                                       for row in rows)
+
+        for name in LABEL_COLUMNS:
+            columns._encode(name, [getattr(row.get(name), 'slug',
+                                           row.get(name))
+                                   for row in rows])
+
+        for name in TERM_COLUMNS:
+            columns._set_terms(name, [[_id(term) for term in
+                                       row.get(name) or []]
+                                      for row in rows])
+
+        return columns
+
+    @classmethod
+    def parse_list(cls, api, json_list, fields=None):
+        """
+        Parse a page of JSON posts, so a ColumnSet can stand in for a model.
+        """
+        return cls.from_json(json_list)
+
+    @classmethod
+    def concat(cls, column_sets):
+        """
+        Join column sets end to end.
+
+        Arguments
+        ---------
+
+        column_sets : list
+            wordpress.columns.ColumnSet to join, in order.
+        """
+        column_sets = list(column_sets)
+        columns = cls(sum(len(c) for c in column_sets))
+
+        for name in INT_COLUMNS + DATE_COLUMNS:
+            columns.data[name] = _concat([c.data[name] for c in column_sets])
+
+        for name in LABEL_COLUMNS:
+            # Each set has its own labels, recode them into one list.
+            codes = {}
+            parts = []
+
+            for c in column_sets:
+                recode = [codes.setdefault(label, len(codes))
+                          for label in c.labels[name]]
+
+                if numpy is not None:
+                    recode = numpy.asarray(recode, dtype=numpy.int32)
+                    parts.append(recode[c.data[name]])
+                else:
+                    parts.append([recode[code] for code in c.data[name]])
+
+            columns.data[name] = _concat(parts, 'i')
+            columns.labels[name] = list(codes)
+
+        for name in TERM_COLUMNS:
+            offsets = [_ints([0])]
+            terms = []
+            base = 0
+
+            for c in column_sets:
+                c_offsets, c_terms = c.data[name]
+
+                if numpy is not None:
+                    offsets.append(c_offsets[1:] + base)
+                else:
+                    offsets.append([offset + base for offset in c_offsets[1:]])
+
+                terms.append(c_terms)
+                base += len(c_terms)
+
+            columns.data[name] = (_concat(offsets), _concat(terms))
+
+        return columns
+
+    def _encode(self, name, values):
+        codes = {}
+
+        self.data[name] = _ints((codes.setdefault(value, len(codes))
+                                 for value in values), 'i')
+        self.labels[name] = list(codes)
+
+    def _set_terms(self, name, rows):
+        offsets = [0]
+        terms = []
+
+        for row in rows:
+            terms.extend(row)
+            offsets.append(len(terms))
+
+        self.data[name] = (_ints(offsets), _ints(terms))
+
+    def __len__(self):
+        return self.length
+
+    def column(self, name):
+        """
+        Export a column without copying it.
+
+        Returns
+        -------
+
+        array
+            A NumPy array (dates as datetime64[us]) or an `array.array`.
+            Status and type are their codes, see `labels`; categories and
+            tags are a tuple of offsets and term ids, the terms of row i
+            being `ids[offsets[i]:offsets[i + 1]]`.
+        """
+        if name not in self.data:
+            raise ValueError('There is no {0} column.'.format(name))
+
+        if name in DATE_COLUMNS and numpy is not None:
+            return self.data[name].view('datetime64[us]')
+
+        return self.data[name]
+
+    def values(self, name):
+        """
+        A column as a list of Python values.
+        """
+        column = self.data[name]
+
+        if name in DATE_COLUMNS:
+            return [_from_micros(value) for value in column]
+
+        if name in LABEL_COLUMNS:
+            labels = self.labels[name]
+            return [labels[code] for code in column]
+
+        if name in TERM_COLUMNS:
+            offsets, terms = column
+            return [[int(pk) for pk in terms[offsets[i]:offsets[i + 1]]]
+                    for i in range(self.length)]
+
+        return [int(value) for value in column]
+
+    def ids(self):
+        return self.values('id')
+
+    def take(self, indices):
+        """
+        The rows at indices, in that order, as a new column set.
+        """
+        if not hasattr(indices, '__len__'):
+            indices = list(indices)
+
+        if numpy is not None:
+            indices = numpy.asarray(indices, dtype=numpy.int64)
+
+        columns = ColumnSet(len(indices), labels=dict(self.labels))
+
+        for name, column in self.data.items():
+            if name in TERM_COLUMNS:
+                columns.data[name] = self._take_terms(column, indices)
+            elif numpy is not None:
+                columns.data[name] = column[indices]
+            else:
+                columns.data[name] = array(column.typecode,
+                                           (column[i] for i in indices))
+
+        return columns
+
+    def _take_terms(self, column, indices):
+        offsets, terms = column
+
+        if numpy is None:
+            rows = [terms[offsets[i]:offsets[i + 1]] for i in indices]
+            new_offsets = array('q', [0])
+
+            for row in rows:
+                new_offsets.append(new_offsets[-1] + len(row))
+
+            return new_offsets, array('q', (pk for row in rows
+                                            for pk in row))
+
+        starts = offsets[indices]
+        lengths = offsets[indices + 1] - starts
+        new_offsets = numpy.zeros(len(indices) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths, out=new_offsets[1:])
+
+        positions = (numpy.repeat(starts - new_offsets[:-1], lengths) +
+                     numpy.arange(new_offsets[-1]))
+
+        return new_offsets, terms[positions]
+
+    def filter(self, mask):
+        """
+        The rows where mask is true, as a new column set.
+
+        Arguments
+        ---------
+
+        mask : list
+            A boolean per row, ex. from `mask`.
+        """
+        if numpy is not None:
+            return self.take(numpy.flatnonzero(mask))
+
+        return self.take(i for i, keep in enumerate(mask) if keep)
+
+    def mask(self, date_field='date', after=None, before=None, **conditions):
+        """
+        A boolean per row, true for the rows matching every condition.
+
+        Arguments
+        ---------
+
+        date_field : str
+            The date column after and before compare against.
+        after : datetime
+            Only rows dated after this.
+        before : datetime
+            Only rows dated before this.
+        conditions
+            A value, or a list of values any of which matches, per column.
+            For categories and tags, rows with any of the terms match.
+        """
+        keep = self._full(True)
+
+        for name, wanted in conditions.items():
+            if name not in self.data:
+                raise ValueError("You can't filter by {0}.".format(name))
+
+            if not isinstance(wanted, (list, tuple, set)):
+                wanted = [wanted]
+
+            if name in TERM_COLUMNS:
+                matches = self._has_terms(name, [_id(v) for v in wanted])
+            elif name in LABEL_COLUMNS:
+                labels = self.labels[name]
+                wanted = [getattr(v, 'slug', v) for v in wanted]
+                codes = [labels.index(v) for v in wanted if v in labels]
+                matches = self._isin(self.data[name], codes)
+            else:
+                matches = self._isin(self.data[name],
+                                     [_id(v) for v in wanted])
+
+            keep = self._and(keep, matches)
+
+        dates = self.data[date_field] if (after or before) else None
+
+        if after is not None:
+            keep = self._and(keep, self._compare(dates, _to_micros(after),
+                                                 lambda a, b: a > b))
+
+        if before is not None:
+            keep = self._and(keep, self._compare(dates, _to_micros(before),
+                                                 lambda a, b: a < b))
+
+        return keep
+
+    def where(self, **conditions):
+        """
+        The rows matching conditions, see `mask`, as a new column set.
+        """
+        return self.filter(self.mask(**conditions))
+
+    def _full(self, value):
+        if numpy is not None:
+            return numpy.full(self.length, value, dtype=bool)
+
+        return [value] * self.length
+
+    def _and(self, a, b):
+        if numpy is not None:
+            return a & b
+
+        return [x and y for x, y in zip(a, b)]
+
+    def _isin(self, column, values):
+        if numpy is not None:
+            return numpy.isin(column, values)
+
+        values = set(values)
+        return [value in values for value in column]
+
+    def _compare(self, column, value, op):
+        if numpy is not None:
+            # Unset dates never match.
+            return op(column, value) & (column != NOT_A_TIME)
+
+        return [v != NOT_A_TIME and op(v, value) for v in column]
+
+    def _has_terms(self, name, pks):
+        offsets, terms = self.data[name]
+
+        if numpy is not None:
+            rows = numpy.repeat(numpy.arange(self.length),
+                                numpy.diff(offsets))
+            matches = self._full(False)
+            matches[rows[numpy.isin(terms, pks)]] = True
+            return matches
+
+        pks = set(pks)
+
+        return [any(pk in pks for pk in terms[offsets[i]:offsets[i + 1]])
+                for i in range(self.length)]
+
+    def sort(self, name, reverse=False):
+        """
+        The rows ordered by a column, as a new column set. Ties keep their
+        order. Statuses and types sort by label.
+        """
+        if name not in self.data or name in TERM_COLUMNS:
+            raise ValueError("You can't sort by {0}.".format(name))
+
+        column = self.data[name]
+
+        if name in LABEL_COLUMNS:
+            labels = self.labels[name]
+            ranks = dict((code, rank) for rank, code in enumerate(sorted(
+                range(len(labels)), key=lambda code: str(labels[code]))))
+            column = _ints((ranks[code] for code in column), 'i')
+
+        if numpy is None:
+            order = sorted(range(self.length), key=column.__getitem__,
+                           reverse=reverse)
+        elif reverse:
+            order = self.length - 1 - numpy.argsort(column[::-1],
+                                                    kind='stable')[::-1]
+        else:
+            order = numpy.argsort(column, kind='stable')
+
+        return self.take(order)
+
+    def count_by(self, name):
+        """
+        Count the rows per value of a column.
+
+        For categories and tags, every term of a row is counted.
+
+        Returns
+        -------
+
+        dict
+            The number of rows by value, ordered by value.
+        """
+        if name not in self.data:
+            raise ValueError("You can't group by {0}.".format(name))
+
+        column = self.data[name]
+
+        if name in TERM_COLUMNS:
+            column = column[1]
+
+        if name in LABEL_COLUMNS:
+            labels = self.labels[name]
+
+            if numpy is not None:
+                counts = numpy.bincount(column, minlength=len(labels))
+                counts = dict((code, count) for code, count
+                              in enumerate(counts.tolist()) if count)
+            else:
+                counts = Counter(column)
+
+            return dict(sorted(((labels[code], count)
+                                for code, count in counts.items()),
+                               key=lambda item: str(item[0])))
+
+        if numpy is not None:
+            values, counts = numpy.unique(column, return_counts=True)
+            counts = zip(values.tolist(), counts.tolist())
+        else:
+            counts = sorted(Counter(column).items())
+
+        if name in DATE_COLUMNS:
+            return dict((_from_micros(value), count)
+                        for value, count in counts)
+
+        return dict(counts)
+
+    def __repr__(self):
+        return '{0}(length={1})'.format(self.__class__.__name__, self.length)
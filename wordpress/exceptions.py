@@ -0,0 +1,175 @@
+class WordPressError(Exception):
+    """
+    Base class for the errors raised by the library.
+    """
+
+
+class DiscoveryError(WordPressError):
+    """
+    The WP-API root of a WordPress site could not be found.
+
+    Attributes
+    ----------
+
+    url : str
+        The WordPress site URL.
+    """
+
+    def __init__(self, url, msg=None):
+        self.url = url
+
+        if msg is None:
+            msg = ('Could not find the WP-API root of {0}, the site did not '
+                   'send a rel="https://api.w.org/" link.'.format(url))
+
+        super(DiscoveryError, self).__init__(msg)
+
+
+class MissingFieldError(WordPressError, AttributeError):
+    """
+    A field was read that a partial model was not fetched with.
+
+    Attributes
+    ----------
+
+    model : wordpress.models.Model
+        The partial model.
+    field : str
+        The field that was read.
+    """
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+
+        msg = ('{0}.{1} was not fetched, add it to `fields` or create the '
+               'client with fetch_missing_fields=True.'.format(
+                   model.__class__.__name__, field))
+
+        super(MissingFieldError, self).__init__(msg)
+
+
+class BatchError(WordPressError):
+    """
+    An operation of a batch failed.
+
+    Attributes
+    ----------
+
+    status : int
+        The HTTP status of the operation, None if it wasn't run.
+    body : dict
+        The error WordPress returned, usually with a `code` and `message`.
+    """
+
+    def __init__(self, status, body=None):
+        self.status = status
+        self.body = body
+
+        if isinstance(body, dict) and body.get('message'):
+            msg = body['message']
+        elif status is None:
+            msg = 'The operation was not run.'
+        else:
+            msg = 'The operation failed with the status code {0}.'.format(
+                status)
+
+        super(BatchError, self).__init__(msg)
+
+
+class HTTPError(WordPressError):
+    """
+    The WP REST API answered with an error status.
+
+    Attributes
+    ----------
+
+    status : int
+        The HTTP status code.
+    body : dict/str
+        The decoded error, usually with a `code` and `message`, or the raw
+        text when it isn't JSON.
+    url : str
+        The requested URL.
+    """
+
+    def __init__(self, status, body=None, url=None):
+        self.status = status
+        self.body = body
+        self.url = url
+
+        msg = 'WordPress REST API returned the status code {0}.'.format(
+            status)
+
+        if isinstance(body, dict) and body.get('message'):
+            msg = '{0} {1}'.format(msg, body['message'])
+
+        super(HTTPError, self).__init__(msg)
+
+    @property
+    def code(self):
+        """The WordPress error code, ex. `rest_post_invalid_id`."""
+        if isinstance(self.body, dict):
+            return self.body.get('code')
+
+
+class ClientError(HTTPError):
+    """A 4xx response."""
+
+
+class NotFound(ClientError):
+    """A 404 Not Found response."""
+
+
+class RateLimited(ClientError):
+    """
+    A 429 Too Many Requests response.
+
+    Attributes
+    ----------
+
+    retry_after : float
+        Seconds the server asked to wait, when it said.
+    """
+
+    def __init__(self, status, body=None, url=None, retry_after=None):
+        self.retry_after = retry_after
+        super(RateLimited, self).__init__(status, body=body, url=url)
+
+
+class ServerError(HTTPError):
+    """
+    A 5xx response.
+
+    Attributes
+    ----------
+
+    retry_after : float
+        Seconds the server asked to wait, when it said, ex. on a 503.
+    """
+
+    def __init__(self, status, body=None, url=None, retry_after=None):
+        self.retry_after = retry_after
+        super(ServerError, self).__init__(status, body=body, url=url)
+
+
+class CircuitOpenError(WordPressError):
+    """
+    Requests to a host are held back after too many failures in a row.
+
+    Attributes
+    ----------
+
+    host : str
+    retry_at : float
+        When the circuit lets a trial request through, on the breaker's
+        clock.
+    """
+
+    def __init__(self, host, retry_at=None):
+        self.host = host
+        self.retry_at = retry_at
+
+        super(CircuitOpenError, self).__init__(
+            'Too many failed requests to {0}, holding requests '
+            'back.'.format(host))
@@ -0,0 +1,537 @@
+import json
+import sqlite3
+import threading
+
+from .api import MAX_PER_PAGE, _int_header
+from .models import Category, Post, PostRevision, PostStatus, Tag
+from .stats import RequestRecord
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    author INTEGER,
+    date TEXT,
+    modified TEXT,
+    status TEXT,
+    slug TEXT,
+    title TEXT,
+    content TEXT,
+    excerpt TEXT,
+    sticky INTEGER,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_status_date ON posts (status, date);
+CREATE INDEX IF NOT EXISTS posts_author_date ON posts (author, date);
+CREATE INDEX IF NOT EXISTS posts_modified ON posts (modified);
+CREATE INDEX IF NOT EXISTS posts_slug ON posts (slug);
+
+CREATE TABLE IF NOT EXISTS post_terms (
+    taxonomy TEXT NOT NULL,
+    term_id INTEGER NOT NULL,
+    post_id INTEGER NOT NULL,
+    PRIMARY KEY (taxonomy, term_id, post_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS post_terms_post ON post_terms (post_id);
+
+CREATE TABLE IF NOT EXISTS terms (
+    taxonomy TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    json TEXT NOT NULL,
+    PRIMARY KEY (taxonomy, id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS statuses (
+    slug TEXT PRIMARY KEY,
+    json TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS revisions (
+    id INTEGER PRIMARY KEY,
+    parent INTEGER NOT NULL,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS revisions_parent ON revisions (parent);
+'''
+
+# Post taxonomies by the name of the post field holding their term ids.
+TAXONOMIES = {
+    'categories': 'category',
+    'tags': 'post_tag',
+}
+
+# Variables a statement can bind in SQLite before 3.32.
+MAX_VARIABLES = 999
+
+ORDERBY_COLUMNS = {
+    'date': 'date',
+    'modified': 'modified',
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+}
+
+
+def _rendered(value):
+    """The rendered text of a field like title or content."""
+    if isinstance(value, dict):
+        return value.get('rendered')
+
+    return value
+
+
+def _escape_like(value):
+    """Match `%`, `_` and `\\` literally in a LIKE pattern."""
+    return (value.replace('\\', '\\\\').replace('%', '\\%')
+            .replace('_', '\\_'))
+
+
+def _ids(value):
+    """A list of ids from an id, a model, a list or a comma separated str."""
+    if value is None:
+        return []
+
+    if isinstance(value, str):
+        return [int(pk) for pk in value.split(',') if pk.strip()]
+
+    if not isinstance(value, (list, tuple, set)):
+        value = [value]
+
+    return [int(getattr(pk, 'id', pk)) for pk in value]
+
+
+class Mirror(object):
+    """
+    A local SQLite copy of a site's posts, revisions, terms and statuses.
+
+    Queries are answered from indexed tables and return the same models as
+    the client, without a request.
+
+    Arguments
+    ---------
+
+    api : wordpress.WordPress
+        The client the mirror is filled from.
+    path : str
+        The SQLite database. Defaults to one in memory.
+    """
+
+    def __init__(self, api, path=':memory:'):
+        self.api = api
+        self.path = path
+        self._lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # Filling the mirror
+
+    def _pages(self, endpoint, **params):
+        """
+        Private function for walking the raw JSON pages of a collection.
+        """
+        page = 1
+        params.setdefault('pre_page', MAX_PER_PAGE)
+
+        while True:
+            with self.api._recording(RequestRecord('GET', endpoint)) as record:
+                json_list, headers = self.api._get_json(
+                    endpoint, dict(params, page=page), record)
+
+            yield json_list
+
+            total_pages = _int_header(headers, 'X-WP-TotalPages')
+
+            if total_pages is None:
+                if len(json_list) < params['pre_page']:
+                    return
+            elif page >= total_pages:
+                return
+
+            page += 1
+
+    def load(self, revisions=False, **filters):
+        """
+        Copy the site's categories, tags, statuses and posts.
+
+        Arguments
+        ---------
+
+        revisions : bool
+            Also copy the revisions of every post, one request per post.
+        filters
+            WP REST API parameters for the posts, ex. `status`.
+        """
+        for json_list in self._pages('categories'):
+            self.save_terms('category', json_list)
+
+        for json_list in self._pages('tags'):
+            self.save_terms('post_tag', json_list)
+
+        statuses = self.api._get('statuses')
+
+        if isinstance(statuses, dict):
+            statuses = list(statuses.values())
+
+        self.save_statuses(statuses)
+
+        for json_list in self._pages('posts', **filters):
+            self.save_posts(json_list)
+
+            if revisions:
+                for obj in json_list:
+                    self.save_revisions(self.api._get(
+                        'posts/{0}/revisions'.format(obj['id'])))
+
+        self.optimize()
+
+    def optimize(self):
+        """
+        Refresh the statistics SQLite plans queries with. Done after `load`
+        and `sync`; without them term filters scan every post.
+        """
+        with self._lock:
+            self.db.execute('ANALYZE')
+
+    def sync(self, state, **filters):
+        """
+        Bring the posts up to date with WordPress.sync_posts.
+
+        The client must be created with `keep_raw`, so the synced posts
+        still have their JSON object. Categories, tags and statuses used by
+        the synced posts that aren't in the mirror yet are copied too.
+
+        Returns
+        -------
+
+        wordpress.sync.ChangeSet
+        """
+        if not getattr(self.api, 'keep_raw', False):
+            raise ValueError('The mirror needs a client created with '
+                             'keep_raw to sync.')
+
+        changes = self.api.sync_posts(state, **filters)
+        json_list = [post._json for posts in (changes.created,
+                                              changes.updated)
+                     for post in posts]
+
+        self.save_posts(json_list)
+        self.delete_posts(changes.deleted)
+        self._save_missing_terms(json_list)
+        self.optimize()
+
+        return changes
+
+    def _save_missing_terms(self, json_list):
+        """
+        Private function for copying the terms and statuses used by posts
+        that aren't in the mirror yet. They are resolved through the
+        client's term cache, filled while the posts were parsed.
+        """
+        for field, taxonomy in TAXONOMIES.items():
+            ids = set()
+
+            for obj in json_list:
+                ids.update(obj.get(field) or [])
+
+            missing = ids - set(self._terms(taxonomy, ids))
+
+            if missing:
+                lookup = getattr(self.api, 'lookup_' + field)
+                self.save_terms(taxonomy, [
+                    term._json for term in lookup(missing).values()
+                    if term._json is not None])
+
+        slugs = set(obj['status'] for obj in json_list if 'status' in obj)
+        missing = slugs - set(slug for slug, in self._query(
+            'SELECT slug FROM statuses'))
+
+        if missing:
+            self.save_statuses([
+                status._json for status in
+                self.api.lookup_post_statuses(missing).values()
+                if status._json is not None])
+
+    def save_posts(self, json_list):
+        """Insert or replace posts from their JSON objects."""
+        rows = []
+        terms = []
+
+        for obj in json_list:
+            rows.append((obj['id'], obj.get('author'), obj.get('date'),
+                         obj.get('modified'), obj.get('status'),
+                         obj.get('slug'), _rendered(obj.get('title')),
+                         _rendered(obj.get('content')),
+                         _rendered(obj.get('excerpt')),
+                         int(bool(obj.get('sticky'))), json.dumps(obj)))
+
+            for field, taxonomy in TAXONOMIES.items():
+                terms.extend((taxonomy, pk, obj['id'])
+                             for pk in obj.get(field) or [])
+
+        with self._lock, self.db:
+            self.db.executemany('DELETE FROM post_terms WHERE post_id = ?',
+                                [(row[0],) for row in rows])
+            self.db.executemany('INSERT OR REPLACE INTO posts VALUES '
+                                '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self.db.executemany('INSERT OR IGNORE INTO post_terms VALUES '
+                                '(?, ?, ?)', terms)
+
+    def delete_posts(self, ids):
+        """Remove posts and their revisions."""
+        ids = [(pk,) for pk in _ids(ids)]
+
+        with self._lock, self.db:
+            self.db.executemany('DELETE FROM posts WHERE id = ?', ids)
+            self.db.executemany('DELETE FROM post_terms WHERE post_id = ?',
+                                ids)
+            self.db.executemany('DELETE FROM revisions WHERE parent = ?',
+                                ids)
+
+    def save_terms(self, taxonomy, json_list):
+        """Insert or replace categories (`category`) or tags (`post_tag`)."""
+        with self._lock, self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO terms VALUES (?, ?, ?)',
+                [(taxonomy, obj['id'], json.dumps(obj)) for obj in json_list])
+
+    def save_statuses(self, json_list):
+        """Insert or replace post statuses."""
+        with self._lock, self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO statuses VALUES (?, ?)',
+                [(obj['slug'], json.dumps(obj)) for obj in json_list])
+
+    def save_revisions(self, json_list):
+        """Insert or replace post revisions."""
+        with self._lock, self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO revisions VALUES (?, ?, ?)',
+                [(obj['id'], obj['parent'], json.dumps(obj))
+                 for obj in json_list])
+
+    # Queries
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def _terms(self, taxonomy, ids):
+        """The stored terms of a taxonomy, as JSON objects keyed by id."""
+        ids = list(ids)
+        terms = {}
+        # One variable is the taxonomy.
+        size = MAX_VARIABLES - 1
+
+        for i in range(0, len(ids), size):
+            chunk = ids[i:i + size]
+            rows = self._query(
+                'SELECT id, json FROM terms WHERE taxonomy = ? AND id IN '
+                '({0})'.format(','.join('?' * len(chunk))), [taxonomy] + chunk)
+            terms.update((pk, json.loads(raw)) for pk, raw in rows)
+
+        return terms
+
+    def _parse_posts(self, json_list):
+        category_ids, tag_ids, status_slugs = Post.term_ids(json_list)
+
+        categories = dict(
+            (pk, Category.parse(self, obj))
+            for pk, obj in self._terms('category', category_ids).items())
+        tags = dict(
+            (pk, Tag.parse(self, obj))
+            for pk, obj in self._terms('post_tag', tag_ids).items())
+        statuses = dict((slug, self.get_post_status(slug))
+                        for slug in status_slugs)
+
+        return Post.parse_list(self, json_list, categories=categories,
+                               tags=tags, statuses=statuses)
+
+    def list_posts(self, page=1, pre_page=10, search=None, after=None,
+                   author=None, author_exclude=None, before=None,
+                   exclude=None, include=None, offset=None, order='desc',
+                   orderby='date', slug=None, status='publish',
+                   categories=None, categories_exclude=None, tags=None,
+                   tags_exclude=None, sticky=None, cateogries_exclude=None):
+        """
+        Query the mirrored posts.
+
+        Takes the filters of wordpress.WordPress.list_posts, with the same
+        meaning; `categories_exclude` can also be spelt `cateogries_exclude`
+        like the client's argument. `search` matches the title, excerpt and
+        content, and ordering by relevance orders by date.
+
+        Returns
+        -------
+
+        wordpress.models.ResultSet
+            A page of wordpress.models.Post, with `total` and `total_pages`.
+        """
+        if order not in ['asc', 'desc']:
+            raise ValueError("You can't order {0}.".format(order))
+
+        if orderby not in ['date', 'relevance', 'id', 'include', 'title',
+                           'slug', 'modified']:
+            raise ValueError("You can't order by {0}.".format(orderby))
+
+        if categories_exclude is None:
+            categories_exclude = cateogries_exclude
+
+        where = []
+        params = []
+
+        def column_in(column, values, negate=False):
+            where.append('{0} {1}IN ({2})'.format(
+                column, 'NOT ' if negate else '', ','.join('?' * len(values))))
+            params.extend(values)
+
+        if author is not None:
+            column_in('author', _ids(author))
+
+        if author_exclude is not None:
+            column_in('author', _ids(author_exclude), negate=True)
+
+        if include is not None:
+            column_in('id', _ids(include))
+
+        if exclude is not None:
+            column_in('id', _ids(exclude), negate=True)
+
+        if slug is not None:
+            column_in('slug', slug.split(',') if isinstance(slug, str)
+                      else list(slug))
+
+        if status is not None:
+            column_in('status', status.split(',') if isinstance(status, str)
+                      else list(status))
+
+        if after is not None:
+            where.append('date > ?')
+            params.append(after.isoformat())
+
+        if before is not None:
+            where.append('date < ?')
+            params.append(before.isoformat())
+
+        if sticky is not None:
+            where.append('sticky = ?')
+            params.append(int(bool(sticky)))
+
+        if search:
+            where.append("(title LIKE ? ESCAPE '\\' OR excerpt LIKE ? "
+                         "ESCAPE '\\' OR content LIKE ? ESCAPE '\\')")
+            params.extend(['%{0}%'.format(_escape_like(search))] * 3)
+
+        for values, taxonomy, negate in [
+            (categories, 'category', False),
+            (categories_exclude, 'category', True),
+            (tags, 'post_tag', False),
+            (tags_exclude, 'post_tag', True),
+        ]:
+            if values is None:
+                continue
+
+            values = _ids(values)
+            where.append(
+                'id {0}IN (SELECT post_id FROM post_terms WHERE taxonomy = ? '
+                'AND term_id IN ({1}))'.format(
+                    'NOT ' if negate else '', ','.join('?' * len(values))))
+            params.extend([taxonomy] + values)
+
+        sql = ' FROM posts'
+
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+
+        total = self._query('SELECT COUNT(*)' + sql, params)[0][0]
+
+        if orderby == 'include' and include is not None:
+            ids = _ids(include)
+            sql += ' ORDER BY CASE id {0} END'.format(
+                ' '.join('WHEN {0:d} THEN {1:d}'.format(pk, i)
+                         for i, pk in enumerate(ids)))
+        else:
+            column = ORDERBY_COLUMNS.get(orderby, 'date')
+            sql += ' ORDER BY {0} {1}, id {1}'.format(column, order.upper())
+
+        sql += ' LIMIT ? OFFSET ?'
+        start = offset if offset is not None else (page - 1) * pre_page
+
+        rows = self._query('SELECT json' + sql, params + [pre_page, start])
+
+        results = self._parse_posts([json.loads(raw) for raw, in rows])
+        results.total = total
+        results.total_pages = -(-total // pre_page) if pre_page else None
+
+        return results
+
+    def get_post(self, pk, **kwargs):
+        """
+        A mirrored post, or None.
+        """
+        rows = self._query('SELECT json FROM posts WHERE id = ?', (pk,))
+
+        if not rows:
+            return None
+
+        return self._parse_posts([json.loads(rows[0][0])])[0]
+
+    def list_post_revisions(self, parent, **kwargs):
+        """
+        The mirrored revisions of a post, newest first.
+        """
+        parent = getattr(parent, 'id', parent)
+        rows = self._query('SELECT json FROM revisions WHERE parent = ? '
+                           'ORDER BY id DESC', (parent,))
+
+        return PostRevision.parse_list(self, [json.loads(raw)
+                                              for raw, in rows])
+
+    def _term(self, taxonomy, model, pk):
+        obj = self._terms(taxonomy, [pk]).get(pk)
+
+        # Terms that weren't mirrored are partial models with only an id.
+        if obj is None:
+            return model.parse(self, {'id': pk}, fields=['id'])
+
+        return model.parse(self, obj)
+
+    def get_category(self, pk, **kwargs):
+        return self._term('category', Category, pk)
+
+    def get_tag(self, pk, **kwargs):
+        return self._term('post_tag', Tag, pk)
+
+    def list_categories(self, **kwargs):
+        rows = self._query("SELECT json FROM terms WHERE taxonomy = "
+                           "'category' ORDER BY id")
+
+        return Category.parse_list(self, [json.loads(raw) for raw, in rows])
+
+    def list_tags(self, **kwargs):
+        rows = self._query("SELECT json FROM terms WHERE taxonomy = "
+                           "'post_tag' ORDER BY id")
+
+        return Tag.parse_list(self, [json.loads(raw) for raw, in rows])
+
+    def get_post_status(self, slug, **kwargs):
+        rows = self._query('SELECT json FROM statuses WHERE slug = ?',
+                           (slug,))
+
+        if not rows:
+            return PostStatus.parse(self, {'slug': slug}, fields=['slug'])
+
+        return PostStatus.parse(self, json.loads(rows[0][0]))
+
+    def list_post_statuses(self, **kwargs):
+        rows = self._query('SELECT json FROM statuses ORDER BY slug')
+
+        return PostStatus.parse_list(self, [json.loads(raw)
+                                            for raw, in rows])
@@ -1,45 +1,219 @@
 """
 Copyright 2009-2010 Joshua Roesslein
 """
+import threading
 
-from .utils import parse_iso8601
+from .columns import ColumnSet
+from .exceptions import MissingFieldError
+from .utils import DATE_FIELDS, parse_iso8601
+
+
+def partial_fields(fields):
+    """
+    The top level fields a `_fields` projection keeps, or None for all.
+
+    Arguments
+    ---------
+
+    fields : list/str
+        Field names, either a list or comma separated. Nested fields like
+        `title.rendered` keep their top level field.
+    """
+    if not fields:
+        return None
+
+    if isinstance(fields, str):
+        fields = fields.split(',')
+
+    return frozenset(field.strip().split('.')[0] for field in fields)
+
+
+def embedded_terms(json):
+    """
+    The terms embedded in a JSON object fetched with `_embed`.
+
+    Embedded terms only have the fields of the embed context.
+    """
+    embedded = json.get('_embedded') or {}
+
+    for group in embedded.get('wp:term') or []:
+        for term in group:
+            if 'id' in term:
+                yield term
 
 
 class ResultSet(list):
     """
     A list of like object that holds results from the WordPress API query.
+
+    Attributes
+    ----------
+
+    total : int
+        Total number of items in the collection, when known.
+    total_pages : int
+        Total number of pages in the collection, when known.
     """
 
-    def __init__(self):
-        super(ResultSet, self).__init__()
+    def __init__(self, items=()):
+        super(ResultSet, self).__init__(items)
+        self.total = None
+        self.total_pages = None
 
     def ids(self):
         return [item.id for item in self if hasattr(item, 'id')]
 
+    def to_columns(self):
+        """
+        The posts as a wordpress.columns.ColumnSet.
+        """
+        return ColumnSet.from_models(self)
+
 
 class Model(object):
+    """
+    Base class of the WordPress objects.
+
+    Models keep their fields in `__slots__`, one per field named in the
+    subclass' `__slots__`. Fields the schema doesn't know about (ex. ones
+    added by plugins) are kept in a dict that is only created when needed.
+    The raw JSON object is only kept, as `_json`, when the API was created
+    with `keep_raw`.
 
-    def __init__(self, api=None):
+    When the API was created with `lazy`, parsing only keeps the raw JSON
+    object and each field is converted the first time it is read.
+    """
+
+    __slots__ = ('_api', '_fields', '_json', '_extra')
+
+    # The fields `_fetch` looks the object up by.
+    _key_fields = ('id',)
+
+    def __init__(self, api=None, fields=None):
         self._api = api
+        self._fields = partial_fields(fields)
+        self._json = None
+        self._extra = None
+
+    @classmethod
+    def _schema(cls):
+        """The names of the fields with a slot, in declaration order."""
+        names = []
+
+        for klass in reversed(cls.__mro__):
+            for name in getattr(klass, '__slots__', ()):
+                if not name.startswith('_'):
+                    names.append(name)
+
+        return names
+
+    def _set(self, name, value):
+        """Set a field, falling back to the extra fields."""
+        try:
+            setattr(self, name, value)
+        except AttributeError:
+            if self._extra is None:
+                self._extra = {}
+
+            self._extra[name] = value
+
+    def _set_raw(self, json):
+        """Keep the raw JSON object if the API asks for it."""
+        if getattr(self._api, 'keep_raw', False):
+            self._json = json
+
+    def _items(self):
+        """
+        The fields that are set, as (name, value) pairs. Never fetches the
+        fields a partial model is missing.
+        """
+        if self._json is not None:
+            self._hydrate_all()
+
+        fields = self._fields
+
+        for name in self._schema():
+            if fields is not None and name not in fields:
+                continue
+
+            try:
+                yield name, object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+
+        if self._extra:
+            for item in self._extra.items():
+                yield item
 
     def __getstate__(self):
         # pickle
-        pickle = dict(self.__dict__)
+        pickle = dict(self._items())
 
-        try:
-            del pickle['_api']  # do not pickle the API reference
-        except KeyError:
-            pass
+        pickle['_fields'] = self._fields
+        pickle['_json'] = self._json
 
         return pickle
 
+    def __setstate__(self, state):
+        self._api = None  # the API reference isn't pickled
+        self._fields = None
+        self._json = None
+        self._extra = None
+
+        for name, value in state.items():
+            self._set(name, value)
+
     @classmethod
-    def parse(cls, api, json):
-        """Parse a JSON object into a model instance."""
-        raise NotImplementedError
+    def parse(cls, api, json, fields=None):
+        """
+        Parse a JSON object into a model instance.
+
+        Arguments
+        ---------
+
+        api : wordpress.WordPress
+        json : dict
+        fields : list
+            The fields the object was fetched with, for partial models.
+        """
+        obj = cls(api, fields=fields)
+
+        if getattr(api, 'lazy', False):
+            obj._json = json
+            return obj
+
+        obj._set_raw(json)
+
+        for name in json:
+            if name != '_embedded':
+                obj._set(name, obj._hydrate(json, name))
+
+        return obj
+
+    def _hydrate(self, json, name):
+        """Convert the field name of the JSON object to its Python value."""
+        return json[name]
+
+    def _hydrate_all(self):
+        """Convert the fields of a lazy model that haven't been read yet."""
+        json = self._json
+
+        for name in json:
+            if name == '_embedded':
+                continue
+
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                if not (self._extra and name in self._extra):
+                    self._set(name, self._hydrate(json, name))
+
+        # Every field is converted, the raw JSON isn't needed anymore.
+        if not getattr(self._api, 'keep_raw', False):
+            self._json = None
 
     @classmethod
-    def parse_list(cls, api, json_list):
+    def parse_list(cls, api, json_list, fields=None):
         """
         Prase a list of JSON objects into a result set of model instances.
         """
@@ -47,15 +221,180 @@ class Model(object):
 
         for obj in json_list:
             if obj:
-                results.append(cls.parse(api, obj))
+                results.append(cls.parse(api, obj, fields=fields))
 
         return results
 
+    @property
+    def is_partial(self):
+        """Whether the model was fetched with only some of its fields."""
+        return self._fields is not None
+
+    def _fetch(self):
+        """Fetch the complete object from the API."""
+        raise NotImplementedError
+
+    def _has_key(self):
+        """Whether the fields `_fetch` needs are set, without fetching."""
+        json = object.__getattribute__(self, '_json')
+
+        for name in self._key_fields:
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                if json is None or name not in json:
+                    return False
+
+        return True
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set: private attributes,
+        # fields the schema doesn't know about, and fields a partial model
+        # wasn't fetched with.
+        try:
+            extra = object.__getattribute__(self, '_extra')
+            fields = object.__getattribute__(self, '_fields')
+            json = object.__getattribute__(self, '_json')
+        except AttributeError:
+            raise AttributeError(name)
+
+        if extra and name in extra:
+            return extra[name]
+
+        if json is not None and name in json and name != '_embedded':
+            value = self._hydrate(json, name)
+            self._set(name, value)
+            return value
+
+        if name.startswith('_') or fields is None:
+            raise AttributeError(name)
+
+        # A model without its key can't be fetched, reading the key would
+        # fetch it again.
+        if (not getattr(self._api, 'fetch_missing_fields', False) or
+                not self._has_key()):
+            raise MissingFieldError(self, name)
+
+        for k, v in self._fetch()._items():
+            self._set(k, v)
+
+        self._fields = None
+
+        return getattr(self, name)
+
     def __repr__(self):
-        state = ['%s=%s' % (k, repr(v)) for (k, v) in vars(self).items()]
+        state = ['%s=%s' % (k, repr(v)) for (k, v) in self._items()]
         return '%s(%s)' % (self.__class__.__name__, ', '.join(state))
 
 
+class TermLookups(object):
+    """
+    Resolves the categories, tags and statuses of a page of posts.
+
+    Terms embedded in the posts are used as they are; the rest are looked up
+    through the API's term cache, with one bulk request per taxonomy for the
+    misses. Terms still missing after that are fetched one by one. Threads
+    reading the lazy posts of a page at the same time wait for one bulk
+    lookup.
+
+    Arguments
+    ---------
+
+    api : wordpress.WordPress
+    json_list : list
+        The JSON posts of the page.
+    categories : dict
+        Already resolved categories keyed by id.
+    tags : dict
+        Already resolved tags keyed by id.
+    statuses : dict
+        Already resolved post statuses keyed by slug.
+    bulk : bool
+        Whether to bulk resolve the terms of the page or only fetch them one
+        by one as needed.
+    """
+
+    def __init__(self, api, json_list, categories=None, tags=None,
+                 statuses=None, bulk=True):
+        self.api = api
+        self.json_list = json_list
+        self.categories = dict(categories or {})
+        self.tags = dict(tags or {})
+        self.statuses = dict(statuses or {})
+        self.bulk = bulk
+        self._resolved = categories is not None and tags is not None and \
+            statuses is not None
+        self._embedded = False
+        self._lock = threading.Lock()
+
+    def _add_embedded(self):
+        if self._embedded:
+            return
+
+        self._embedded = True
+
+        for obj in self.json_list:
+            for term in embedded_terms(obj):
+                if term.get('taxonomy') == 'category':
+                    terms, model = self.categories, Category
+                elif term.get('taxonomy') == 'post_tag':
+                    terms, model = self.tags, Tag
+                else:
+                    continue
+
+                if term['id'] not in terms:
+                    terms[term['id']] = model.parse(self.api, term,
+                                                    fields=list(term))
+
+    def resolve(self):
+        """Resolve every term of the page. Only done once."""
+        if self._resolved and self._embedded:
+            return
+
+        with self._lock:
+            self._add_embedded()
+
+            if not self._resolved:
+                if self.bulk:
+                    self._lookup()
+
+                self._resolved = True
+
+    def _lookup(self):
+        """
+        Private function for bulk resolving the terms of the page.
+        """
+        category_ids, tag_ids, status_slugs = Post.term_ids(self.json_list)
+
+        for ids, terms, lookup in [
+            (category_ids, self.categories, self.api.lookup_categories),
+            (tag_ids, self.tags, self.api.lookup_tags),
+            (status_slugs, self.statuses, self.api.lookup_post_statuses),
+        ]:
+            missing = [key for key in ids if key not in terms]
+
+            if missing:
+                terms.update(lookup(missing))
+
+    def _get(self, terms, key, get):
+        if key not in terms:
+            self.resolve()
+
+        if key not in terms:
+            terms[key] = get(key)
+
+        return terms[key]
+
+    def category(self, pk):
+        return self._get(self.categories, pk, self.api.get_category)
+
+    def tag(self, pk):
+        return self._get(self.tags, pk, self.api.get_tag)
+
+    def status(self, slug):
+        return self._get(self.statuses, slug, self.api.get_post_status)
+
+
 class Post(Model):
     """
     A WordPress post object.
@@ -89,12 +428,14 @@ class Post(Model):
         The title for the object.
     content : dict
         The content for the object.
-    author : int
-        The ID for the author of the object.
+    author : int/wordpress.models.User
+        The ID for the author of the object, or the author when the post was
+        fetched with `embed`.
     excerpt : dict
         The excerpt for the object.
-    featured_media : int
-        The ID of the featured media for the object.
+    featured_media : int/wordpress.models.Media
+        The ID of the featured media for the object, or the media when the
+        post was fetched with `embed`.
     comment_status : str
         Whether or not comments are open on the object.
     ping_status : str
@@ -115,39 +456,162 @@ class Post(Model):
         The number of Liveblog Likes the post has.
     """
 
+    __slots__ = ('date', 'date_gmt', 'guid', 'id', 'link', 'modified',
+                 'modified_gmt', 'slug', 'status', 'type', 'password', 'title',
+                 'content', 'author', 'excerpt', 'featured_media',
+                 'comment_status', 'ping_status', 'format', 'meta', 'sticky',
+                 'template', 'categories', 'tags', 'liveblog_likes',
+                 '_terms')
+
     @classmethod
-    def parse(cls, api, json):
-        """Parse a JSON object into a model instance."""
-        post = cls(api)
-        setattr(post, '_json', json)
+    def parse(cls, api, json, categories=None, tags=None, statuses=None,
+              fields=None, lookups=None):
+        """
+        Parse a JSON object into a model instance.
+
+        Arguments
+        ---------
+
+        api : wordpress.WordPress
+        json : dict
+        fields : list
+            The fields the object was fetched with, for partial models.
+        categories : dict
+            Already resolved categories keyed by id.
+        tags : dict
+            Already resolved tags keyed by id.
+        statuses : dict
+            Already resolved post statuses keyed by slug.
+        lookups : wordpress.models.TermLookups
+            Resolves the categories, tags and statuses, shared by the posts
+            of a page.
+        """
+        if lookups is None:
+            lookups = TermLookups(api, [json], categories=categories,
+                                  tags=tags, statuses=statuses, bulk=False)
 
-        for k, v in json.items():
-            if k in ['date', 'date_gmt', 'modified', 'modified_gmt']:
-                setattr(post, k, parse_iso8601(v))
+        post = cls(api, fields=fields)
+        post._terms = lookups
 
-            elif k == 'categories':
-                category_list = ResultSet()
+        if getattr(api, 'lazy', False):
+            post._json = json
+            return post
 
-                for category in v:
-                    category_list.append(api.get_category(category))
+        post._set_raw(json)
 
-                setattr(post, k, category_list)
+        for name in json:
+            if name != '_embedded':
+                post._set(name, post._hydrate(json, name))
 
-            elif k == 'tags':
-                tag_list = ResultSet()
+        post._terms = None
 
-                for tag in v:
-                    tag_list.append(api.get_tag(tag))
+        return post
 
-                setattr(post, k, tag_list)
+    def _hydrate_all(self):
+        super(Post, self)._hydrate_all()
+        self._terms = None
 
-            elif k == 'status':
-                setattr(post, k, api.get_post_status(v))
+    def _hydrate(self, json, name):
+        value = json[name]
 
-            else:
-                setattr(post, k, v)
+        if name in DATE_FIELDS:
+            return parse_iso8601(value)
 
-        return post
+        elif name == 'categories':
+            return ResultSet(self._terms.category(pk) for pk in value)
+
+        elif name == 'tags':
+            return ResultSet(self._terms.tag(pk) for pk in value)
+
+        elif name == 'status':
+            return self._terms.status(value)
+
+        elif name in EMBEDDED_RELATIONS:
+            model, rel = EMBEDDED_RELATIONS[name]
+            objs = (json.get('_embedded') or {}).get(rel) or []
+
+            # Embeds the client can't see come back as error objects.
+            if objs and 'id' in objs[0]:
+                return model.parse(self._api, objs[0], fields=list(objs[0]))
+
+        return value
+
+    @classmethod
+    def parse_list(cls, api, json_list, categories=None, tags=None,
+                   statuses=None, fields=None):
+        """
+        Prase a list of JSON objects into a result set of model instances.
+
+        The categories, tags and statuses used on the page that aren't
+        passed in are resolved through the API's term cache, with one bulk
+        request per taxonomy for the misses, and shared between posts. Lazy
+        posts resolve them when the first one is read.
+
+        Arguments
+        ---------
+
+        api : wordpress.WordPress
+        json_list : list
+        fields : list
+            The fields the objects were fetched with, for partial models.
+        categories : dict
+            Already resolved categories keyed by id.
+        tags : dict
+            Already resolved tags keyed by id.
+        statuses : dict
+            Already resolved post statuses keyed by slug.
+        """
+        json_list = [obj for obj in json_list if obj]
+
+        lookups = TermLookups(api, json_list, categories=categories,
+                              tags=tags, statuses=statuses)
+
+        # Lazy posts resolve the page's terms when one is first read.
+        if not getattr(api, 'lazy', False):
+            lookups.resolve()
+
+        results = ResultSet()
+
+        for obj in json_list:
+            results.append(cls.parse(api, obj, fields=fields,
+                                     lookups=lookups))
+
+        return results
+
+    @classmethod
+    def term_ids(cls, json_list):
+        """
+        Collect the distinct terms used by a list of JSON posts.
+
+        Returns
+        -------
+
+        tuple
+            The sets of category ids, tag ids and status slugs.
+        """
+        category_ids = set()
+        tag_ids = set()
+        status_slugs = set()
+
+        for obj in json_list:
+            if not obj:
+                continue
+
+            # Embedded terms come with the post and don't need resolving.
+            embedded = set(term['id'] for term in embedded_terms(obj))
+
+            category_ids.update(pk for pk in obj.get('categories', [])
+                                if pk not in embedded)
+            tag_ids.update(pk for pk in obj.get('tags', [])
+                           if pk not in embedded)
+
+            if 'status' in obj:
+                status_slugs.add(obj['status'])
+
+        return category_ids, tag_ids, status_slugs
+
+    def _fetch(self):
+        return self._api.get_post(self.id)
 
     def update(self, **kwargs):
         """Update the post."""
@@ -230,18 +694,20 @@ class PostRevision(Model):
         Context: view
     """
 
-    @classmethod
-    def parse(cls, api, json):
-        post_revision = cls(api)
-        setattr(post_revision, '_json', json)
+    __slots__ = ('author', 'date', 'date_gmt', 'guid', 'id', 'modified',
+                 'modified_gmt', 'parent', 'slug', 'title', 'content',
+                 'excerpt')
 
-        for k, v in json.items():
-            if k in ['date', 'date_gmt', 'modified', 'modified_gmt']:
-                setattr(post_revision, k, parse_iso8601(v))
-            else:
-                setattr(post_revision, k, v)
+    def _hydrate(self, json, name):
+        if name in DATE_FIELDS:
+            return parse_iso8601(json[name])
 
-        return post_revision
+        return json[name]
+
+    _key_fields = ('parent', 'id')
+
+    def _fetch(self):
+        return self._api.get_post_revision(self.parent, self.id)
 
     def destroy(self, **kwargs):
         return self._api.delete_post_revision(self.id)
@@ -302,15 +768,11 @@ class Category(Model):
         Context: view, edit
     """
 
-    @classmethod
-    def parse(cls, api, json):
-        category = cls(api)
-        setattr(category, '_json', json)
+    __slots__ = ('id', 'count', 'description', 'link', 'name', 'slug',
+                 'taxonomy', 'parent', 'meta')
 
-        for k, v in json.items():
-            setattr(category, k, v)
-
-        return category
+    def _fetch(self):
+        return self._api.get_category(self.id)
 
     def update(self, **kwargs):
         return self._api.update_category(self.id)
@@ -369,15 +831,11 @@ class Tag(Model):
         Context: view, edit
     """
 
-    @classmethod
-    def parse(cls, api, json):
-        tag = cls(api)
-        setattr(tag, '_json', json)
-
-        for k, v in json.items():
-            setattr(tag, k, v)
+    __slots__ = ('id', 'count', 'description', 'link', 'name', 'slug',
+                 'taxonomy', 'meta')
 
-        return tag
+    def _fetch(self):
+        return self._api.get_tag(self.id)
 
     def update(self, **kwargs):
         return self._api.update_tag(self.id)
@@ -406,11 +864,77 @@ class Taxonomy(Model):
 
 
 class Media(Model):
-    pass
+    """
+    A WordPress media item.
+
+    Arguments
+    ---------
+
+    id : int
+        Unique identifier for the object.
+    media_type : str
+        Type of media item.
+
+        One of: image, file
+    mime_type : str
+        The MIME type of the media item.
+    source_url : str
+        URL to the original media file.
+    media_details : dict
+        Details about the media file, specific to its type.
+    """
+
+    __slots__ = ('id', 'date', 'date_gmt', 'guid', 'link', 'modified',
+                 'modified_gmt', 'slug', 'status', 'type', 'title', 'author',
+                 'alt_text', 'caption', 'description', 'media_type',
+                 'mime_type', 'media_details', 'post', 'source_url')
+
+    def _fetch(self):
+        return self._api.get_media(self.id)
+
+    def __eq__(self, compare):
+        """Compare two Media."""
+        if isinstance(compare, Media):
+            return self.id == compare.id
+
+        raise NotImplementedError
 
 
 class User(Model):
-    pass
+    """
+    A WordPress user.
+
+    Arguments
+    ---------
+
+    id : int
+        Unique identifier for the user.
+    name : str
+        Display name for the user.
+    url : str
+        URL of the user.
+    description : str
+        Description of the user.
+    link : str
+        Author URL of the user.
+    slug : str
+        An alphanumeric identifier for the user.
+    avatar_urls : dict
+        Avatar URLs for the user.
+    """
+
+    __slots__ = ('id', 'name', 'url', 'description', 'link', 'slug',
+                 'avatar_urls', 'meta')
+
+    def _fetch(self):
+        return self._api.get_user(self.id)
+
+    def __eq__(self, compare):
+        """Compare two Users."""
+        if isinstance(compare, User):
+            return self.id == compare.id
+
+        raise NotImplementedError
 
 
 class PostType(Model):
@@ -454,23 +978,42 @@ class PostStatus(Model):
 
         Context: embed, view, edit
     """
+
+    __slots__ = ('name', 'private', 'protected', 'public', 'queryable',
+                 'show_in_list', 'slug')
+
     @classmethod
-    def parse(cls, api, json):
-        post_status = cls(api)
-        setattr(post_status, '_json', json)
+    def parse_list(cls, api, json_list, fields=None):
+        """
+        Prase a list of JSON objects into a result set of model instances.
 
-        for k, v in json.items():
-            setattr(post_status, k, v)
+        Also takes the object keyed by slug the statuses endpoint returns.
+        """
+        if isinstance(json_list, dict):
+            json_list = list(json_list.values())
 
-        return post_status
+        return super(PostStatus, cls).parse_list(api, json_list,
+                                                 fields=fields)
+
+    _key_fields = ('slug',)
+
+    def _fetch(self):
+        return self._api.get_post_status(self.slug)
 
     def __eq__(self, compare):
         """Compare two Posts."""
         if isinstance(compare, PostStatus):
-            return self.id == compare.id
+            return self.slug == compare.slug
 
         raise NotImplementedError
 
 
 class Setting(Model):
     pass
+
+
+# Post fields replaced by their `_embedded` object: (model, relation).
+EMBEDDED_RELATIONS = {
+    'author': (User, 'author'),
+    'featured_media': (Media, 'wp:featuredmedia'),
+}
@@ -0,0 +1,266 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from .exceptions import (CircuitOpenError, ClientError, HTTPError, NotFound,
+                         RateLimited, ServerError)
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+# Methods that can be repeated without changing the outcome.
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+# Statuses worth trying again.
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+# Failures to get a response worth trying again; others, ex. an invalid URL
+# or too many redirects, fail the same way every time.
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+if aiohttp is not None:
+    RETRY_ERRORS += (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+def parse_retry_after(value, now=None):
+    """
+    The seconds a Retry-After header asks to wait.
+
+    Arguments
+    ---------
+
+    value : str
+        Either seconds or an HTTP date.
+
+    Returns
+    -------
+
+    float
+        None when the header is missing or can't be read.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if now is None:
+        now = time.time()
+
+    return max(0.0, when.timestamp() - now)
+
+
+def http_error(status, body=None, url=None, headers=None):
+    """
+    The typed exception for an error response.
+    """
+    retry_after = None
+
+    # Rate limits and maintenance or overload responses say when to retry.
+    if status in (429, 503):
+        retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+
+    if status == 429:
+        return RateLimited(status, body=body, url=url,
+                           retry_after=retry_after)
+
+    if status == 404:
+        return NotFound(status, body=body, url=url)
+
+    if 400 <= status < 500:
+        return ClientError(status, body=body, url=url)
+
+    if status >= 500:
+        return ServerError(status, body=body, url=url,
+                           retry_after=retry_after)
+
+    return HTTPError(status, body=body, url=url)
+
+
+class RetryPolicy(object):
+    """
+    When and how long to wait before repeating a failed request.
+
+    Waits grow exponentially with full jitter: attempt n waits a random time
+    between zero and `backoff * 2 ** n`, capped at `max_backoff`, which keeps
+    clients that failed together from retrying together. A Retry-After
+    header is waited out instead, up to `max_retry_after`.
+
+    Arguments
+    ---------
+
+    retries : int
+        Times a request is repeated. Zero turns retrying off.
+    backoff : float
+        Seconds the first retry waits at most.
+    max_backoff : float
+        Seconds a retry waits at most.
+    statuses : list
+        Response statuses that are retried.
+    methods : list
+        Methods that are retried. POST isn't, by default, since it can
+        create twice.
+    errors : tuple
+        Exceptions raised before a response came back that are retried.
+    max_retry_after : float
+        A Retry-After longer than this isn't waited for, the error is
+        raised instead.
+    sleep : callable
+        Waits a number of seconds.
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30,
+                 statuses=RETRY_STATUSES, methods=IDEMPOTENT_METHODS,
+                 errors=RETRY_ERRORS, max_retry_after=120, sleep=time.sleep,
+                 random=random.random):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.methods = methods
+        self.errors = errors
+        self.max_retry_after = max_retry_after
+        self.sleep = sleep
+        self.random = random
+
+    def should_retry(self, method, attempt, error):
+        """
+        Whether attempt (counted from 0) should be followed by another.
+
+        Arguments
+        ---------
+
+        method : str
+        attempt : int
+        error : Exception
+            The HTTPError of the response, or the connection error.
+        """
+        if attempt >= self.retries or method.upper() not in self.methods:
+            return False
+
+        if isinstance(error, HTTPError):
+            if error.status not in self.statuses:
+                return False
+
+            retry_after = getattr(error, 'retry_after', None)
+
+            if retry_after is not None and retry_after > self.max_retry_after:
+                return False
+        elif not isinstance(error, self.errors):
+            return False
+
+        return True
+
+    def delay(self, attempt, error=None):
+        """
+        Seconds to wait before repeating after attempt.
+        """
+        retry_after = getattr(error, 'retry_after', None)
+
+        if retry_after is not None:
+            return retry_after
+
+        cap = min(self.max_backoff, self.backoff * (2 ** attempt))
+
+        return cap * self.random()
+
+
+class CircuitBreaker(object):
+    """
+    Holds requests to a host back after it failed too many times in a row.
+
+    After `threshold` consecutive failures the circuit opens and requests
+    fail fast with CircuitOpenError. Once `reset_timeout` seconds have
+    passed a single trial request goes through: if it succeeds the circuit
+    closes, if it fails it opens again.
+
+    The breaker is safe to share between threads and clients.
+
+    Arguments
+    ---------
+
+    threshold : int
+        Consecutive failures that open the circuit.
+    reset_timeout : float
+        Seconds the circuit stays open.
+    clock : callable
+        Returns the current time in seconds.
+    """
+
+    def __init__(self, threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._failures = {}
+        self._opened = {}
+        self._trial = set()
+        self._lock = threading.Lock()
+
+    def before(self, host):
+        """
+        Let a request to host through, or raise CircuitOpenError.
+        """
+        with self._lock:
+            opened = self._opened.get(host)
+
+            if opened is None:
+                return
+
+            retry_at = opened + self.reset_timeout
+
+            if self.clock() < retry_at or host in self._trial:
+                raise CircuitOpenError(host, retry_at)
+
+            self._trial.add(host)
+
+    def success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened.pop(host, None)
+            self._trial.discard(host)
+
+    def failure(self, host):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            self._trial.discard(host)
+
+            if failures >= self.threshold:
+                self._opened[host] = self.clock()
+
+    def release(self, host):
+        """
+        Let another trial request through after one that failed before
+        telling anything about the host, ex. with an invalid URL.
+        """
+        with self._lock:
+            self._trial.discard(host)
+
+    def is_open(self, host):
+        with self._lock:
+            return host in self._opened
+
+    def reset(self, host=None):
+        """Close the circuit of one host, or of every host."""
+        with self._lock:
+            if host is None:
+                self._failures.clear()
+                self._opened.clear()
+                self._trial.clear()
+            else:
+                self._failures.pop(host, None)
+                self._opened.pop(host, None)
+                self._trial.discard(host)
@@ -0,0 +1,238 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_ID_SEGMENT = re.compile(r'(?<=/)\d+(?=/|$)')
+
+
+def route(endpoint):
+    """
+    The endpoint with its ids replaced, so requests for different objects
+    are counted together, ex. `posts/{id}/revisions` for
+    `posts/448/revisions`.
+    """
+    return _ID_SEGMENT.sub('{id}', endpoint)
+
+
+class RequestRecord(object):
+    """
+    What one call to the API cost.
+
+    Attributes
+    ----------
+
+    method : str
+        HTTP method.
+    endpoint : str
+        WordPress endpoint, ex. `posts/448`.
+    route : str
+        The endpoint with its ids replaced, ex. `posts/{id}`.
+    status : int
+        The response status, None when no response came back.
+    latency : float
+        Seconds from sending the request to the response, retries and
+        their waits included.
+    bytes : int
+        Size of the response body.
+    decode_time : float
+        Seconds spent decoding the JSON body.
+    parse_time : float
+        Seconds spent turning the JSON into models, nested term lookups
+        included.
+    attempts : int
+        Requests sent, more than one when retried.
+    cached : bool
+        Whether the body was replayed from the HTTP cache after a 304.
+    coalesced : bool
+        Whether the call waited for an identical request made by another
+        thread instead of sending its own.
+    error : Exception
+        Set when the call failed.
+    """
+
+    __slots__ = ['method', 'endpoint', 'route', 'status', 'latency', 'bytes',
+                 'decode_time', 'parse_time', 'attempts', 'cached',
+                 'coalesced', 'error']
+
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint
+        self.route = route(endpoint)
+        self.status = None
+        self.latency = 0.0
+        self.bytes = 0
+        self.decode_time = 0.0
+        self.parse_time = 0.0
+        self.attempts = 0
+        self.cached = False
+        self.coalesced = False
+        self.error = None
+
+    def to_dict(self):
+        record = dict((name, getattr(self, name)) for name in self.__slots__)
+        record['error'] = repr(self.error) if self.error else None
+
+        return record
+
+    def __repr__(self):
+        return '{0}({1} {2} {3} {4:.1f}ms)'.format(
+            self.__class__.__name__, self.method, self.endpoint, self.status,
+            self.latency * 1e3)
+
+
+class Histogram(object):
+    """
+    Counts of values by bucket.
+
+    Arguments
+    ---------
+
+    buckets : tuple
+        Sorted upper bounds. Values above the last one are counted in an
+        extra, unbounded bucket.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q):
+        """
+        The upper bound of the bucket holding the q quantile, or the
+        largest value when it is in the unbounded bucket.
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+
+            if seen >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'],
+                                self.counts)),
+        }
+
+
+class EndpointStats(object):
+    """
+    The totals of the requests to one route.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.requests = 0
+        self.errors = 0
+        self.statuses = Counter()
+        self.bytes = 0
+        self.decode_time = 0.0
+        self.parse_time = 0.0
+        self.retries = 0
+        self.cached = 0
+        self.coalesced = 0
+        self.latency = Histogram(buckets)
+
+    def add(self, record):
+        self.requests += 1
+        self.errors += record.error is not None
+        self.statuses[record.status] += 1
+        self.bytes += record.bytes
+        self.decode_time += record.decode_time
+        self.parse_time += record.parse_time
+        self.retries += max(0, record.attempts - 1)
+        self.cached += record.cached
+        self.coalesced += record.coalesced
+        self.latency.observe(record.latency)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'statuses': dict(self.statuses),
+            'bytes': self.bytes,
+            'decode_time': self.decode_time,
+            'parse_time': self.parse_time,
+            'retries': self.retries,
+            'cached': self.cached,
+            'coalesced': self.coalesced,
+            'latency': self.latency.to_dict(),
+        }
+
+
+class Stats(object):
+    """
+    Aggregates request records by method and route.
+
+    Safe to share between threads.
+
+    Arguments
+    ---------
+
+    buckets : tuple
+        Upper bounds, in seconds, of the latency histogram buckets.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        """Add a record, so the stats can be used as a hook."""
+        key = '{0} {1}'.format(record.method, record.route)
+
+        with self._lock:
+            stats = self._endpoints.get(key)
+
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats(self.buckets)
+
+            stats.add(record)
+
+    def snapshot(self):
+        """
+        The totals so far.
+
+        Returns
+        -------
+
+        dict
+            Keyed by method and route, ex. `GET posts/{id}`.
+        """
+        with self._lock:
+            return dict((key, stats.to_dict())
+                        for key, stats in self._endpoints.items())
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,250 @@
+import codecs
+import json
+import re
+import time
+
+# Bytes read from the connection at a time while streaming a response.
+CHUNK_SIZE = 16384
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JSONArrayDecoder(object):
+    """
+    Decodes a JSON array fed a piece at a time, returning each item as soon
+    as it is complete, so only the item being read is kept in memory.
+
+    Arguments
+    ---------
+
+    encoding : str
+        The encoding of the bytes fed to the decoder.
+    """
+
+    def __init__(self, encoding='utf-8'):
+        self._text = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._state = 'start'
+        # Length the buffer has to reach before trying to decode again, so
+        # a large item isn't decoded over and over while it arrives.
+        self._wait = 0
+
+    def feed(self, data):
+        """
+        Add the next piece of the array.
+
+        Arguments
+        ---------
+
+        data : bytes/str
+
+        Returns
+        -------
+
+        list
+            The items completed by this piece.
+        """
+        if isinstance(data, bytes):
+            data = self._text.decode(data)
+
+        self._buffer += data
+
+        if len(self._buffer) < self._wait:
+            return []
+
+        return self._decode()
+
+    def close(self):
+        """
+        Signal the end of the array.
+
+        Returns
+        -------
+
+        list
+            The items completed by the end of the input.
+        """
+        self._buffer += self._text.decode(b'', final=True)
+        self._wait = 0
+        items = self._decode(final=True)
+
+        if self._state != 'end':
+            raise ValueError('The JSON array is incomplete.')
+
+        return items
+
+    def _decode(self, final=False):
+        """
+        Private function for decoding the complete items in the buffer.
+        """
+        buffer = self._buffer
+        pos = 0
+        items = []
+        self._wait = 0
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+
+            if self._state == 'start':
+                if char != '[':
+                    raise ValueError('Expected a JSON array.')
+
+                self._state = 'first'
+                pos += 1
+            elif self._state == 'end':
+                raise ValueError('Extra data after the JSON array.')
+            elif char == ']' and self._state in ('first', 'separator'):
+                self._state = 'end'
+                pos += 1
+            elif self._state == 'separator':
+                if char != ',':
+                    raise ValueError(
+                        "Expected ',' or ']' at {0}.".format(pos))
+
+                self._state = 'item'
+                pos += 1
+            else:
+                try:
+                    item, end = self._json.raw_decode(buffer, pos)
+                except ValueError:
+                    if final:
+                        raise
+
+                    # The item isn't complete yet.
+                    self._wait = 2 * (len(buffer) - pos)
+                    break
+
+                # A number at the end of the buffer may go on in the next
+                # piece.
+                if end == len(buffer) and not final:
+                    break
+
+                items.append(item)
+                self._state = 'separator'
+                pos = end
+
+        self._buffer = buffer[pos:]
+
+        return items
+
+
+def iter_json_array(chunks, encoding='utf-8'):
+    """
+    Decode a JSON array from an iterable of pieces, ex. the chunks of a
+    streamed response, yielding its items one at a time.
+    """
+    decoder = JSONArrayDecoder(encoding=encoding)
+
+    for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+
+    for item in decoder.close():
+        yield item
+
+
+class ResultStream(object):
+    """
+    One page of a collection, parsed an item at a time while the response
+    body arrives instead of all at once.
+
+    Iterate over it once; the connection is released when every item has
+    been read, or on `close`. Use it as a context manager to release the
+    connection when stopping early.
+
+    Attributes
+    ----------
+
+    total : int
+        Total number of items in the collection, when known.
+    total_pages : int
+        Total number of pages in the collection, when known.
+    """
+
+    def __init__(self, api, resp, model, record, fields=None,
+                 chunk_size=CHUNK_SIZE):
+        self.api = api
+        self.model = model
+        self.fields = fields
+        self.total = None
+        self.total_pages = None
+        self._resp = resp
+        self._record = record
+        self._chunk_size = chunk_size
+        self._items = self._iter_items()
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._items)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Release the connection and hand the request record to the client's
+        stats and hooks.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._items.close()
+        self._resp.close()
+        self.api._finish(self._record)
+
+    def _iter_json(self):
+        """
+        Private function for decoding the items of the body as it arrives.
+        """
+        record = self._record
+        decoder = JSONArrayDecoder(encoding=self._resp.encoding or 'utf-8')
+
+        for chunk in self._resp.iter_content(self._chunk_size):
+            record.bytes += len(chunk)
+            start = time.perf_counter()
+            items = decoder.feed(chunk)
+            record.decode_time += time.perf_counter() - start
+
+            for item in items:
+                yield item
+
+        for item in decoder.close():
+            yield item
+
+    def _iter_items(self):
+        record = self._record
+
+        try:
+            for data in self._iter_json():
+                if not data:
+                    continue
+
+                start = time.perf_counter()
+                # Parsed as a page of one, so a post's terms are looked up
+                # in bulk through the term cache.
+                item, = self.model.parse_list(self.api, [data],
+                                              fields=self.fields)
+                record.parse_time += time.perf_counter() - start
+
+                yield item
+        except Exception as e:
+            record.error = e
+            raise
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._resp.close()
+                self.api._finish(record)
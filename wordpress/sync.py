@@ -0,0 +1,216 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+
+from .models import ResultSet
+from .utils import parse_iso8601
+
+# The fields sync needs whatever fields are asked for.
+SYNC_FIELDS = ('id', 'modified', 'modified_gmt')
+
+# modified_after is exclusive and to the second, so the cursor is moved back
+# a second and posts already seen are skipped.
+OVERLAP = timedelta(seconds=1)
+
+
+class ChangeSet(object):
+    """
+    The changes to a site's posts since the last sync.
+
+    Attributes
+    ----------
+
+    created : wordpress.models.ResultSet
+        Posts that weren't seen before.
+    updated : wordpress.models.ResultSet
+        Posts seen before and modified since.
+    deleted : list
+        Ids of posts seen before that are gone (deleted, or no longer
+        matching the filters, ex. unpublished).
+    watermark : datetime
+        The highest `modified_gmt` seen, in UTC.
+    """
+
+    def __init__(self, watermark=None):
+        self.created = ResultSet()
+        self.updated = ResultSet()
+        self.deleted = []
+        self.watermark = watermark
+
+    def __bool__(self):
+        return bool(self.created or self.updated or self.deleted)
+
+    def __repr__(self):
+        return '{0}(created={1}, updated={2}, deleted={3})'.format(
+            self.__class__.__name__, len(self.created), len(self.updated),
+            len(self.deleted))
+
+
+class SyncState(object):
+    """
+    The watermark and known post ids of each synced site.
+
+    Arguments
+    ---------
+
+    path : str
+        A JSON file to keep the state in, so syncs pick up where the last
+        process left off.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._sites = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._sites is None:
+            self._sites = {}
+
+            if self.path:
+                try:
+                    with open(self.path, 'r') as fobj:
+                        self._sites = json.loads(fobj.read())
+                except (IOError, OSError, ValueError):
+                    pass
+
+        return self._sites
+
+    def get(self, site):
+        """
+        The state of a site.
+
+        Returns
+        -------
+
+        tuple
+            The watermark (`modified_gmt`), the cursor (`modified` of the same
+            post, in the site's timezone), both datetimes or None, and the set
+            of known post ids.
+        """
+        with self._lock:
+            state = self._load().get(site) or {}
+
+        return (parse_iso8601(state.get('watermark')),
+                parse_iso8601(state.get('cursor')),
+                set(state.get('ids') or []))
+
+    def set(self, site, watermark, cursor, ids):
+        """Remember the state of a site, and save it if there is a path."""
+        with self._lock:
+            sites = self._load()
+            sites[site] = {
+                'watermark': watermark.isoformat() if watermark else None,
+                'cursor': cursor.isoformat() if cursor else None,
+                'ids': sorted(ids),
+            }
+
+            if self.path:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                fd, tmp = tempfile.mkstemp(dir=directory)
+
+                with os.fdopen(fd, 'w') as fobj:
+                    fobj.write(json.dumps(sites))
+
+                os.replace(tmp, self.path)
+
+    def clear(self, site=None):
+        """Forget one site, or every site, in memory only."""
+        with self._lock:
+            if site is None:
+                self._sites = {}
+            else:
+                self._load().pop(site, None)
+
+
+def sync_posts(api, state, detect_deletions=True, pre_page=100, **filters):
+    """
+    Fetch the posts modified since the last sync.
+
+    Posts are listed by `modified`, oldest first, starting from the stored
+    cursor, and sorted into created and updated by the stored post ids. The
+    cursor moves forward as pages come in, so posts modified during the sync
+    aren't skipped. Deletions are found by listing every post id.
+
+    Arguments
+    ---------
+
+    api : wordpress.WordPress
+    state : wordpress.sync.SyncState
+    detect_deletions : bool
+        List every post id to find deleted posts. Cheap, only ids are
+        fetched, but one request per `pre_page` posts.
+    pre_page : int
+        Posts per request.
+    filters
+        Other arguments for list_posts, ex. `status` or `fields`.
+
+    Returns
+    -------
+
+    wordpress.sync.ChangeSet
+    """
+    for name in ['page', 'orderby', 'order', 'modified_after', 'columnar']:
+        if name in filters:
+            raise ValueError("You can't sync with {0}.".format(name))
+
+    if filters.get('fields'):
+        filters['fields'] = list(filters['fields']) + [
+            field for field in SYNC_FIELDS if field not in filters['fields']]
+
+    watermark, cursor, known = state.get(api.site_url)
+    previously_known = set(known)
+    changed = {}
+    page = 1
+
+    while True:
+        posts = api.list_posts(
+            page=page, pre_page=pre_page, orderby='modified', order='asc',
+            modified_after=cursor - OVERLAP if cursor else None, **filters)
+
+        advanced = False
+
+        for post in posts:
+            modified_gmt = post.modified_gmt
+
+            if post.id in known and watermark and modified_gmt <= watermark:
+                continue  # seen in the overlap
+
+            # A post modified again during the sync is only kept once.
+            changed.pop(post.id, None)
+            changed[post.id] = post
+            known.add(post.id)
+
+            if watermark is None or modified_gmt > watermark:
+                watermark, cursor = modified_gmt, post.modified
+                advanced = True
+
+        if len(posts) < pre_page:
+            break
+
+        # Restart from the new cursor; when a whole page shares the cursor's
+        # second, move on to the next page instead.
+        page = 1 if advanced else page + 1
+
+    changes = ChangeSet(watermark)
+
+    for pk, post in changed.items():
+        if pk in previously_known:
+            changes.updated.append(post)
+        else:
+            changes.created.append(post)
+
+    if detect_deletions:
+        id_filters = dict((k, v) for k, v in filters.items()
+                          if k not in ['fields', 'embed', 'context'])
+        ids = set(api.fetch_all('posts', columnar=True, fields=['id'],
+                                pre_page=pre_page, **id_filters).ids())
+
+        changes.deleted = sorted(known - ids)
+        known = ids
+
+    state.set(api.site_url, watermark, cursor, known)
+
+    return changes
@@ -0,0 +1,220 @@
+import threading
+import time
+
+from .retry import parse_retry_after
+
+# Responses telling the client to slow down.
+CONGESTION_STATUSES = (429, 503)
+
+
+class Throttle(object):
+    """
+    Limits how fast, and how many at once, requests are sent to a host.
+
+    Requests take a token from a bucket refilled at `rate` tokens per
+    second, holding at most `burst`, and at most `max_in_flight` of them run
+    at once. Tokens are reserved in the order requests ask for them, so
+    waiting requests go out evenly spaced instead of together.
+
+    When adaptive, the rate is halved on a 429 or 503 response, or on a
+    response slower than `target_latency`, and grows back a little with
+    every good response (additive increase, multiplicative decrease). A
+    Retry-After header holds every request back until it is over. Only one
+    slowdown is applied for the requests that were already running when it
+    happened, so a burst of 429s halves the rate once.
+
+    A throttle is safe to share between threads, and between clients.
+
+    Arguments
+    ---------
+
+    rate : float
+        Requests per second. None doesn't limit the rate.
+    burst : int
+        Requests that can go out at once after a quiet period.
+    max_in_flight : int
+        Requests running at once. None doesn't limit them.
+    adaptive : bool
+        Should the rate slow down when the host struggles.
+    min_rate : float
+        Requests per second the rate isn't slowed below. Defaults to a tenth
+        of `rate`.
+    increase : float
+        Fraction of `rate` regained with each good response.
+    target_latency : float
+        Seconds above which a response counts as the host struggling. None
+        only slows down on 429 and 503 responses.
+    clock : callable
+        Returns the current time in seconds.
+    sleep : callable
+        Waits a number of seconds.
+    """
+
+    def __init__(self, rate=None, burst=1, max_in_flight=None, adaptive=True,
+                 min_rate=None, increase=0.05, target_latency=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        if rate is not None and rate <= 0:
+            raise ValueError("You can't send {0} requests per second."
+                             .format(rate))
+
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("You can't run {0} requests at once."
+                             .format(max_in_flight))
+
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_in_flight = max_in_flight
+        self.adaptive = adaptive
+        self.min_rate = min_rate if min_rate is not None else (
+            rate / 10 if rate is not None else None)
+        self.increase = increase
+        self.target_latency = target_latency
+        self.clock = clock
+        self.sleep = sleep
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = None
+        self._slowed_at = None
+
+        if max_in_flight is not None:
+            self._slots = threading.BoundedSemaphore(max_in_flight)
+        else:
+            self._slots = None
+
+    def reserve(self):
+        """
+        Take a token.
+
+        Returns
+        -------
+
+        float
+            Seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = self.clock()
+            wait = 0.0
+
+            if self.rate is not None:
+                elapsed = now - self._updated
+                self._tokens = min(self.burst,
+                                   self._tokens + elapsed * self.rate)
+                self._tokens -= 1
+
+                if self._tokens < 0:
+                    wait = -self._tokens / self.rate
+
+            self._updated = now
+
+            if self._paused_until is not None:
+                wait = max(wait, self._paused_until - now)
+
+            return wait
+
+    def acquire(self):
+        """
+        Wait for a free slot and a token.
+
+        Returns
+        -------
+
+        float
+            The time the request starts, to pass to release.
+        """
+        if self._slots is not None:
+            self._slots.acquire()
+
+        try:
+            wait = self.reserve()
+
+            if wait > 0:
+                self.sleep(wait)
+        except BaseException:
+            if self._slots is not None:
+                self._slots.release()
+
+            raise
+
+        return self.clock()
+
+    def release(self, started, status=None, headers=None):
+        """
+        Free the slot a request took with acquire.
+
+        Arguments
+        ---------
+
+        started : float
+            What acquire returned.
+        status : int
+            The response status, None when the request failed.
+        headers : dict
+            The response headers.
+        """
+        if self._slots is not None:
+            self._slots.release()
+
+        self.observe(started, status, headers)
+
+    def observe(self, started, status=None, headers=None):
+        """
+        Adapt the rate to how a request went.
+
+        Arguments
+        ---------
+
+        started : float
+            The time the request started.
+        status : int
+            The response status, None when the request failed.
+        headers : dict
+            The response headers.
+        """
+        now = self.clock()
+
+        with self._lock:
+            if status in CONGESTION_STATUSES:
+                retry_after = parse_retry_after((headers or {})
+                                                .get('Retry-After'))
+
+                if retry_after is not None:
+                    self._paused_until = max(self._paused_until or now,
+                                             now + retry_after)
+
+                self._slow_down(started, now)
+            elif (self.target_latency is not None and
+                    now - started > self.target_latency):
+                self._slow_down(started, now)
+            elif status is not None and status < 400:
+                self._speed_up()
+
+    def _slow_down(self, started, now):
+        """
+        Private function for halving the rate, once for the requests that
+        were running when it was last halved.
+        """
+        if not self.adaptive or self.rate is None:
+            return
+
+        if self._slowed_at is not None and started < self._slowed_at:
+            return
+
+        self._slowed_at = now
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def _speed_up(self):
+        if not self.adaptive or self.rate is None:
+            return
+
+        self.rate = min(self.max_rate,
+                        self.rate + self.max_rate * self.increase)
+
+    def reset(self):
+        """Go back to the configured rate."""
+        with self._lock:
+            self.rate = self.max_rate
+            self._paused_until = None
+            self._slowed_at = None
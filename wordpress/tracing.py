@@ -0,0 +1,275 @@
+import random
+import threading
+import time
+from collections import deque
+
+_local = threading.local()
+
+
+def _now():
+    """Nanoseconds since the epoch."""
+    return int(time.time() * 1e9)
+
+
+def get_current_span():
+    """
+    The span started last by a wordpress.tracing.Tracer in this thread and
+    not ended yet, or None.
+    """
+    return getattr(_local, 'span', None)
+
+
+class Span(object):
+    """
+    One timed stage of a call, shaped like an OpenTelemetry span.
+
+    Attributes
+    ----------
+
+    name : str
+    trace_id : int
+        Shared by every span of a trace.
+    span_id : int
+    parent_id : int
+        The span_id of the parent, None for the root of a trace.
+    start_time : int
+        Nanoseconds since the epoch.
+    end_time : int
+        Nanoseconds since the epoch, None while the span is running.
+    attributes : dict
+    events : list
+        (name, time, attributes) tuples, ex. the exceptions raised.
+    status : str
+        One of UNSET, OK and ERROR.
+    """
+
+    __slots__ = ['name', 'trace_id', 'span_id', 'parent_id', 'start_time',
+                 'end_time', 'attributes', 'events', 'status',
+                 'status_description']
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = (parent.trace_id if parent is not None
+                         else random.getrandbits(128))
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_time = _now()
+        self.end_time = None
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.status = 'UNSET'
+        self.status_description = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def add_event(self, name, attributes=None):
+        self.events.append((name, _now(), dict(attributes or {})))
+
+    def record_exception(self, exception):
+        self.add_event('exception', {
+            'exception.type': type(exception).__name__,
+            'exception.message': str(exception),
+        })
+
+    def set_status(self, status, description=None):
+        self.status = status
+        self.status_description = description
+
+    def end(self):
+        if self.end_time is None:
+            self.end_time = _now()
+
+    @property
+    def duration(self):
+        """Seconds the span ran, None while it is running."""
+        if self.end_time is None:
+            return None
+
+        return (self.end_time - self.start_time) / 1e9
+
+    def to_dict(self):
+        """
+        The span in the layout of the OpenTelemetry SDK's JSON export.
+        """
+        return {
+            'name': self.name,
+            'context': {
+                'trace_id': '0x{0:032x}'.format(self.trace_id),
+                'span_id': '0x{0:016x}'.format(self.span_id),
+            },
+            'parent_id': (None if self.parent_id is None
+                          else '0x{0:016x}'.format(self.parent_id)),
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'status': {
+                'status_code': self.status,
+                'description': self.status_description,
+            },
+            'attributes': dict(self.attributes),
+            'events': [{'name': name, 'timestamp': timestamp,
+                        'attributes': attributes}
+                       for name, timestamp, attributes in self.events],
+        }
+
+    def __repr__(self):
+        duration = self.duration
+        return '{0}({1} {2})'.format(
+            self.__class__.__name__, self.name,
+            'running' if duration is None
+            else '{0:.1f}ms'.format(duration * 1e3))
+
+
+class _SpanContext(object):
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.parent = get_current_span()
+        self.span = Span(self.name, parent=self.parent,
+                         attributes=self.attributes)
+        _local.span = self.span
+
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        span = self.span
+
+        if exc_value is not None:
+            span.record_exception(exc_value)
+            span.set_status('ERROR', '{0}: {1}'.format(exc_type.__name__,
+                                                       exc_value))
+
+        span.end()
+        _local.span = self.parent
+        self.tracer._export(span)
+
+
+class Tracer(object):
+    """
+    Times the stages of the calls made by a client as nested spans.
+
+    The client only calls `start_as_current_span` and `set_attribute`, so an
+    OpenTelemetry tracer, ex. `opentelemetry.trace.get_tracer('wordpress')`,
+    can be given to it instead.
+
+    Arguments
+    ---------
+
+    exporters : list
+        Callables given each span once it ends, ex. a SpanRecorder.
+    """
+
+    def __init__(self, exporters=None):
+        self.exporters = list(exporters or [])
+
+    def start_as_current_span(self, name, attributes=None):
+        """
+        Start a span, child of the current span of the thread, as a context
+        manager. Exceptions raised in it are recorded on the span.
+        """
+        return _SpanContext(self, name, attributes)
+
+    def _export(self, span):
+        for exporter in self.exporters:
+            exporter(span)
+
+
+class _NoopSpan(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopTracer(object):
+    """
+    The tracer of clients that aren't traced.
+    """
+
+    def start_as_current_span(self, name, attributes=None):
+        return _NOOP_SPAN
+
+
+class SpanRecorder(object):
+    """
+    Keeps the spans it is given, to be used as an exporter.
+
+    Safe to share between threads.
+
+    Arguments
+    ---------
+
+    maxlen : int
+        Number of spans to keep, the oldest are dropped first. None keeps
+        every span.
+    """
+
+    def __init__(self, maxlen=None):
+        self.maxlen = maxlen
+        self._spans = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self):
+        """The spans kept, in the order they ended."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def format(self):
+        """
+        The spans kept as indented trees, ex::
+
+            GET posts 182.4ms
+              HTTP GET 96.1ms
+              wordpress.decode 3.2ms
+              wordpress.parse 82.7ms
+                GET categories/{id} 40.2ms
+                  HTTP GET 39.8ms
+        """
+        spans = sorted(self.spans, key=lambda span: span.start_time)
+        ids = set(span.span_id for span in spans)
+        children = {}
+
+        for span in spans:
+            parent = span.parent_id if span.parent_id in ids else None
+            children.setdefault(parent, []).append(span)
+
+        lines = []
+
+        def add(span, depth):
+            lines.append('{0}{1} {2:.1f}ms'.format(
+                '  ' * depth, span.name, (span.duration or 0) * 1e3))
+
+            for child in children.get(span.span_id, []):
+                add(child, depth + 1)
+
+        for root in children.get(None, []):
+            add(root, 0)
+
+        return '\n'.join(lines)
@@ -1,5 +1,130 @@
-from datetime import datetime
+import re
+from datetime import datetime, timedelta, timezone
+
+# The date fields of posts and revisions.
+DATE_FIELDS = ('date', 'date_gmt', 'modified', 'modified_gmt')
+
+# Parsed dates by string. Cleared when full; a dict lookup is cheap enough
+# that anything smarter costs more than it saves.
+ISO8601_CACHE_SIZE = 4096
+_iso8601_cache = {}
+
+# datetime.fromisoformat only exists from Python 3.7.
+_fromisoformat = getattr(datetime, 'fromisoformat', None)
+
+ISO8601_RE = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?'
+    r'\s*(Z|[+-]\d{2}(?::?\d{2})?)?)?$'
+)
+
+
+def _parse_iso8601_re(string):
+    """
+    Parse the ISO 8601 variants datetime.fromisoformat doesn't understand.
+    """
+    match = ISO8601_RE.match(string.strip())
+
+    if not match:
+        raise ValueError('Invalid ISO 8601 date {0!r}.'.format(string))
+
+    (year, month, day, hour, minute, second, fraction,
+     offset) = match.groups()
+
+    # Only microseconds fit in a datetime, extra digits are dropped.
+    microsecond = int((fraction or '0')[:6].ljust(6, '0'))
+
+    tzinfo = None
+
+    if offset == 'Z':
+        tzinfo = timezone.utc
+    elif offset:
+        sign = -1 if offset[0] == '-' else 1
+        offset = offset[1:].replace(':', '')
+        delta = timedelta(hours=int(offset[:2]), minutes=int(offset[2:] or 0))
+        tzinfo = timezone(sign * delta)
+
+    return datetime(int(year), int(month), int(day), int(hour or 0),
+                    int(minute or 0), int(second or 0), microsecond, tzinfo)
+
+
+def _parse_iso8601(string):
+    if _fromisoformat is not None:
+        try:
+            return _fromisoformat(string)
+        except ValueError:
+            pass
+
+    return _parse_iso8601_re(string)
 
 
 def parse_iso8601(string):
-    return datetime.strptime(string, '%Y-%m-%dT%H:%M:%S')
+    """
+    Parse a WordPress ISO 8601 date.
+
+    Handles the plain `2016-07-15T19:37:41` WordPress sends as well as
+    fractional seconds, `Z` and UTC offsets. Results are memoized, so posts
+    sharing a timestamp share the datetime.
+
+    Arguments
+    ---------
+
+    string : str
+        The date, or None for dates WordPress left unset.
+
+    Returns
+    -------
+
+    datetime
+        Naive unless the date has an offset.
+    """
+    if string is None:
+        return None
+
+    value = _iso8601_cache.get(string)
+
+    if value is None:
+        value = _parse_iso8601(string)
+
+        if len(_iso8601_cache) >= ISO8601_CACHE_SIZE:
+            _iso8601_cache.clear()
+
+        _iso8601_cache[string] = value
+
+    return value
+
+
+def parse_iso8601_columns(json_list, fields=DATE_FIELDS):
+    """
+    Parse the date fields of a page of JSON objects in one pass.
+
+    Arguments
+    ---------
+
+    json_list : list
+        The JSON objects.
+    fields : list
+        The date fields to parse.
+
+    Returns
+    -------
+
+    dict
+        A list of datetimes per field, in the order of json_list. Missing or
+        unset dates are None.
+    """
+    parsed = {}
+    columns = dict((field, []) for field in fields)
+
+    for obj in json_list:
+        for field in fields:
+            string = obj.get(field)
+
+            try:
+                value = parsed[string]
+            except KeyError:
+                value = parsed[string] = parse_iso8601(string)
+
+            columns[field].append(value)
+
+    return columns